@@ -7,6 +7,9 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "Kaufman-CAD-2025-Certified-Full-Roll-Download-updated-with-Supp-5"
 CONFIG_DIR = BASE_DIR / "config"
+QUARANTINE_DIR = BASE_DIR / "quarantine"  # Records rejected by integrity checks
+REPORTS_DIR = BASE_DIR / "reports"  # Generated analysis reports
+SQL_DIR = BASE_DIR / "sql"
 
 # Database settings
 DATABASE_CONFIG = {
@@ -16,6 +19,9 @@ DATABASE_CONFIG = {
     "user": os.getenv("DB_USER", "cad_user"),
     "password": os.getenv("DB_PASSWORD", "cad_password"),
     "schema": os.getenv("DB_SCHEMA", "cad"),
+    # "postgres" or "sqlite" (embedded, no server needed)
+    "backend": os.getenv("DB_BACKEND", "postgres"),
+    "sqlite_path": os.getenv("SQLITE_PATH", str(BASE_DIR / "data" / "kaufman_cad.db")),
 }
 
 # File settings
@@ -23,5 +29,35 @@ FILE_ENCODING = "utf-8"
 FILE_PREFIX = "2025-10-27_002174_APPRAISAL_"
 
 # Processing settings
-BATCH_SIZE = 1000  # Records per batch for database inserts
+BATCH_SIZE = 1000  # Records per batch when adaptive batching is off
+ADAPTIVE_BATCHING = os.getenv("ADAPTIVE_BATCHING", "1") != "0"
+# Adaptive batch sizes are the in-memory size of the pending rows (about 4x their text)
+BATCH_TARGET_BYTES = 1024 * 1024  # Starting batch size for adaptive batching
+BATCH_MIN_BYTES = 64 * 1024
+BATCH_MAX_BYTES = 32 * 1024 * 1024  # Upper bound on memory held by a pending batch
+CHECKPOINT_EVERY_BATCHES = 10  # Batches per commit/checkpoint in resumable loads
+CLUSTER_SORT_MEMORY_MB = 256  # Memory per sorted run when clustering an unsorted file
+SAMPLE_MIN_PER_STRATUM = 1  # Fewest properties of each stratum in a stratified sample
+OFFSET_INDEX_EVERY = 64  # Lines per entry of sparse prop_id offset indexes
+ROLLUP_MEMORY_MB = 256  # Hash aggregation budget of file rollups before spilling to disk
+QUERY_CHUNK_ROWS = 50_000  # Rows per DataFrame chunk (and server-side cursor fetch) of query frames
+BRIN_PAGES_PER_RANGE = 32  # Heap pages summarized by each BRIN index entry
+DEDUP_WINDOW_KEYS = 2_000_000  # Primary key hashes remembered by in-stream dedup
+SQLITE_BATCH_SIZE = 20000  # SQLite has no round trips; larger transactions are cheaper
+SQLITE_BATCH_TARGET_BYTES = 16 * 1024 * 1024
+SQLITE_CACHE_KB = 262144  # SQLite page cache size (256 MB)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Drop-folder ingest settings
+INGEST_POLL_SECONDS = 30  # Seconds between scans of the drop folder
+INGEST_SETTLE_SECONDS = 60  # A drop's files must be unchanged this long before it loads
+
+# Query benchmark settings
+QUERY_BENCH_HISTORY = REPORTS_DIR / "query_bench_history.jsonl"  # One JSON run per line
+QUERY_BENCH_THRESHOLD = 0.25  # Slowdown vs. the baseline flagged as a regression (25%)
+QUERY_BENCH_MIN_MS = 5.0  # Smaller absolute slowdowns are treated as noise
+
+# Lookup service settings
+LOOKUP_HOST = os.getenv("LOOKUP_HOST", "127.0.0.1")
+LOOKUP_PORT = int(os.getenv("LOOKUP_PORT", 8765))
+LOOKUP_CACHE_SIZE = 10000  # Serialized responses kept in the LRU cache
@@ -1,7 +1,7 @@
 """Data models for file layout configuration."""
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import json
 from pathlib import Path
 
@@ -36,6 +36,13 @@ class FileConfig:
     description: str
     columns: List[ColumnConfig]
     primaryKey: Optional[List[str]] = None
+    clusterKey: Optional[List[str]] = None
+    references: Optional[Dict[str, str]] = None
+    totals: Optional[Dict[str, Any]] = None
+    pivot: Optional[Dict[str, Any]] = None
+    _spans: Optional[Tuple[Tuple[ColumnConfig, int, int], ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     @property
     def total_width(self) -> int:
@@ -46,6 +53,49 @@ class FileConfig:
     def active_columns(self) -> List[ColumnConfig]:
         """Get columns that should be loaded (not skipped)."""
         return [col for col in self.columns if not col.skip]
+    
+    @property
+    def column_names(self) -> List[str]:
+        """Get active column names in record tuple order."""
+        return [col.name for col in self.active_columns]
+    
+    def column_index(self, name: str) -> int:
+        """
+        Get the position of an active column within a record tuple.
+        
+        Args:
+            name: Column name
+            
+        Returns:
+            Zero-based index into tuple records
+            
+        Raises:
+            KeyError: If the column is not an active column
+        """
+        for i, col in enumerate(self.active_columns):
+            if col.name == name:
+                return i
+        raise KeyError(f"No active column '{name}' in {self.fileName}")
+    
+    @property
+    def column_spans(self) -> Tuple[Tuple[ColumnConfig, int, int], ...]:
+        """
+        Resolve 0-based (start, end) slice bounds for each active column.
+        
+        Explicit 1-based ``start`` positions take precedence; other columns
+        follow sequentially after the previous column. The result is cached
+        because it is used for every parsed line.
+        """
+        if self._spans is None:
+            spans = []
+            position = 0
+            for col in self.columns:
+                start = col.start - 1 if col.start is not None else position
+                position = start + col.length
+                if not col.skip:
+                    spans.append((col, start, position))
+            self._spans = tuple(spans)
+        return self._spans
 
 
 @dataclass
@@ -79,6 +129,43 @@ class LayoutConfig:
     def file_names(self) -> List[str]:
         """Get list of all file type names."""
         return [f.fileName for f in self.files]
+    
+    @property
+    def derived_files(self) -> List[FileConfig]:
+        """
+        Get configurations of tables built from other files at load time.
+        
+        Each file with a ``pivot`` spec defines one table keyed by
+        (prop_id, tax_year) whose remaining columns are the spec's columns.
+        These tables have no data file of their own.
+        """
+        derived = []
+        for file_config in self.files:
+            spec = file_config.pivot
+            if not spec:
+                continue
+            columns = [
+                ColumnConfig(0, "prop_id", "Property ID", "BIGINT", 12, nullable=False),
+                ColumnConfig(1, "tax_year", "Tax year", "INTEGER", 4, nullable=False),
+            ]
+            for i, col_data in enumerate(spec["columns"], len(columns)):
+                columns.append(ColumnConfig(
+                    index=i,
+                    name=col_data["name"],
+                    description=col_data["description"],
+                    dataType=col_data["dataType"],
+                    length=col_data["length"],
+                    precision=col_data.get("precision")
+                ))
+            derived.append(FileConfig(
+                fileName=spec["fileName"],
+                tableName=spec["tableName"],
+                description=spec["description"],
+                columns=columns,
+                primaryKey=["prop_id", "tax_year"],
+                clusterKey=["prop_id", "tax_year"]
+            ))
+        return derived
 
 
 def load_layout_config(config_path: Path) -> LayoutConfig:
@@ -110,7 +197,11 @@ def load_layout_config(config_path: Path) -> LayoutConfig:
             tableName=file_data['tableName'],
             description=file_data['description'],
             columns=columns,
-            primaryKey=file_data.get('primaryKey')
+            primaryKey=file_data.get('primaryKey'),
+            clusterKey=file_data.get('clusterKey'),
+            references=file_data.get('references'),
+            totals=file_data.get('totals'),
+            pivot=file_data.get('pivot')
         )
         files.append(file_config)
     
@@ -0,0 +1,160 @@
+"""Adaptive batch sizing for database writes."""
+
+from typing import Any, Dict, Sequence
+import sys
+
+
+# Rows sampled from each batch to estimate the average row size
+_SAMPLE_ROWS = 32
+# Throughput changes smaller than this are treated as noise
+_TOLERANCE = 0.05
+# Pointer to a row in the pending batch list
+_LIST_SLOT = 8
+
+
+def estimate_row_bytes(row: Sequence[Any]) -> int:
+    """
+    Estimate the memory held by a row in a pending batch.
+
+    Args:
+        row: Insert parameters
+
+    Returns:
+        Approximate bytes: the row object and each value (``sys.getsizeof``)
+        plus its slot in the batch list; None is shared and costs nothing
+    """
+    size = sys.getsizeof(row) + _LIST_SLOT
+    for value in row:
+        if value is not None:
+            size += sys.getsizeof(value)
+    return size
+
+
+class AdaptiveBatcher:
+    """
+    Chooses batch sizes in bytes and tunes them from measured throughput.
+
+    The target starts at ``initial_bytes`` and is hill-climbed: after each
+    batch, its write time plus the average commit cost per batch gives a
+    throughput in bytes per second. While throughput improves the target keeps moving
+    in the same direction by ``step``; when it drops the direction reverses.
+    Small batches are dominated by round-trip latency, so the target grows
+    until per-batch cost (memory, lock and WAL pressure) stops paying off.
+    The target always stays within ``[min_bytes, max_bytes]``; rows are
+    measured by the memory they hold (``estimate_row_bytes``), so
+    ``max_bytes`` bounds the memory of a pending batch.
+    """
+
+    def __init__(
+        self,
+        initial_bytes: int,
+        min_bytes: int,
+        max_bytes: int,
+        step: float = 1.5
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            initial_bytes: Starting batch size in bytes
+            min_bytes: Smallest batch size in bytes
+            max_bytes: Largest batch size in bytes (memory limit)
+            step: Multiplicative change applied per adjustment
+        """
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.target_bytes = min(max(initial_bytes, min_bytes), max_bytes)
+        self.step = step
+        self.direction = 1
+        self.row_bytes = 0.0
+        self.last_throughput = 0.0
+        self.commit_seconds = 0.0
+
+        self.batches = 0
+        self.total_rows = 0
+        self.total_bytes = 0
+        self.total_seconds = 0.0
+        self.min_rows = 0
+        self.max_rows = 0
+
+    def next_batch_rows(self) -> int:
+        """Get the number of rows for the next batch."""
+        if not self.row_bytes:
+            # No rows measured yet: start small to learn the row size
+            return 100
+        return max(1, int(self.target_bytes / self.row_bytes))
+
+    def record_commit(self, seconds: float, batches: int) -> None:
+        """
+        Record the cost of a commit covering several batches.
+
+        Args:
+            seconds: Time spent in the commit
+            batches: Batches written in the committed transaction
+        """
+        per_batch = seconds / max(batches, 1)
+        self.commit_seconds = per_batch if not self.commit_seconds else (
+            0.8 * self.commit_seconds + 0.2 * per_batch
+        )
+
+    def record(self, batch: Sequence[Sequence[Any]], seconds: float) -> None:
+        """
+        Record a written batch and adjust the target size.
+
+        Args:
+            batch: Rows that were written
+            seconds: Time spent sending the batch (commit excluded)
+        """
+        if not batch:
+            return
+        stride = max(1, len(batch) // _SAMPLE_ROWS)
+        sample = batch[::stride]
+        sample_bytes = sum(estimate_row_bytes(row) for row in sample) / len(sample)
+        # Exponential moving average keeps the estimate stable across batches
+        self.row_bytes = sample_bytes if not self.row_bytes else (
+            0.8 * self.row_bytes + 0.2 * sample_bytes
+        )
+
+        nbytes = int(sample_bytes * len(batch))
+        self.batches += 1
+        self.total_rows += len(batch)
+        self.total_bytes += nbytes
+        self.total_seconds += seconds
+        self.min_rows = min(self.min_rows, len(batch)) if self.min_rows else len(batch)
+        self.max_rows = max(self.max_rows, len(batch))
+
+        seconds += self.commit_seconds
+        if seconds <= 0:
+            return
+        throughput = nbytes / seconds
+        previous = self.last_throughput
+        self.last_throughput = throughput
+        if previous:
+            if throughput < previous * (1 - _TOLERANCE):
+                self.direction = -self.direction
+            elif throughput <= previous * (1 + _TOLERANCE):
+                # Plateau: hold the current size
+                return
+
+        factor = self.step if self.direction > 0 else 1 / self.step
+        self.target_bytes = int(min(max(self.target_bytes * factor, self.min_bytes), self.max_bytes))
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Summarize the batch sizes chosen during a load.
+
+        Returns:
+            Dict with batch counts, sizes and throughput
+        """
+        return {
+            "batches": self.batches,
+            "final_target_bytes": self.target_bytes,
+            "final_batch_rows": self.next_batch_rows(),
+            "avg_row_bytes": round(self.row_bytes, 1),
+            "min_batch_rows": self.min_rows,
+            "max_batch_rows": self.max_rows,
+            "avg_batch_rows": round(self.total_rows / self.batches, 1) if self.batches else 0,
+            "write_seconds": round(self.total_seconds, 3),
+            "commit_seconds_per_batch": round(self.commit_seconds, 4),
+            "bytes_per_second": int(self.total_bytes / self.total_seconds) if self.total_seconds else 0,
+        }
@@ -0,0 +1,180 @@
+"""Physical ordering of fixed-width files by a cluster key (e.g. prop_id, tax_year)."""
+
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+import heapq
+import logging
+import tempfile
+
+from app.models.layout import FileConfig
+
+
+logger = logging.getLogger("cad_loader")
+
+ClusterKey = Tuple[int, ...]
+
+# Keys that do not parse as integers sort first, like NULLs in the loaded table
+_UNPARSED = -1
+
+
+def cluster_key_func(file_config: FileConfig) -> Callable[[bytes], ClusterKey]:
+    """
+    Build a function extracting the cluster key from a raw line.
+
+    Only the key columns are sliced and converted, which is much cheaper
+    than parsing the whole record.
+
+    Args:
+        file_config: File configuration with a ``clusterKey``
+
+    Returns:
+        Function mapping a raw (bytes) line to a tuple of ints
+
+    Raises:
+        ValueError: If the file type has no cluster key
+    """
+    if not file_config.clusterKey:
+        raise ValueError(f"{file_config.fileName} has no clusterKey")
+
+    spans = {col.name: (start, end) for col, start, end in file_config.column_spans}
+    bounds = [spans[name] for name in file_config.clusterKey]
+
+    def key(line: bytes) -> ClusterKey:
+        values = []
+        for start, end in bounds:
+            try:
+                values.append(int(line[start:end]))
+            except ValueError:
+                values.append(_UNPARSED)
+        return tuple(values)
+
+    return key
+
+
+def _data_lines(f: BinaryIO) -> Iterator[bytes]:
+    """Yield non-blank lines, each terminated by a newline."""
+    for line in f:
+        if not line.strip():
+            continue
+        yield line if line.endswith(b"\n") else line + b"\n"
+
+
+def find_unsorted_line(file_path: Path, file_config: FileConfig) -> Optional[int]:
+    """
+    Check whether a file is already ordered by its cluster key.
+
+    Args:
+        file_path: Path to the data file
+        file_config: File configuration with a ``clusterKey``
+
+    Returns:
+        1-based line number of the first out-of-order line, or None if sorted
+    """
+    key = cluster_key_func(file_config)
+    previous = None
+    with open(file_path, "rb") as f:
+        for line_num, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            current = key(line)
+            if previous is not None and current < previous:
+                return line_num
+            previous = current
+    return None
+
+
+def _write_run(lines: List[bytes], key: Callable[[bytes], ClusterKey], work_dir: Path) -> Path:
+    """Sort a run of lines in memory and spill it to a temporary file."""
+    lines.sort(key=key)
+    with tempfile.NamedTemporaryFile("wb", dir=work_dir, suffix=".run", delete=False) as f:
+        f.writelines(lines)
+        return Path(f.name)
+
+
+def external_sort(
+    file_path: Path,
+    file_config: FileConfig,
+    output_path: Path,
+    memory_bytes: int
+) -> int:
+    """
+    Sort a fixed-width file by its cluster key with bounded memory.
+
+    Lines are read into runs of at most ``memory_bytes``, each run is sorted
+    and spilled to disk, and the runs are k-way merged into ``output_path``.
+    Sorting is stable, so the output is identical every time it is rebuilt
+    from the same input (resume checkpoints rely on this). Blank lines are
+    dropped.
+
+    Args:
+        file_path: Path to the data file
+        file_config: File configuration with a ``clusterKey``
+        output_path: Where to write the sorted file
+        memory_bytes: Maximum bytes of line data held in memory per run
+
+    Returns:
+        Number of runs that were merged
+    """
+    key = cluster_key_func(file_config)
+    work_dir = output_path.parent
+    runs: List[Path] = []
+
+    try:
+        with open(file_path, "rb") as f:
+            lines: List[bytes] = []
+            size = 0
+            for line in _data_lines(f):
+                lines.append(line)
+                size += len(line)
+                if size >= memory_bytes:
+                    runs.append(_write_run(lines, key, work_dir))
+                    lines = []
+                    size = 0
+            if lines or not runs:
+                runs.append(_write_run(lines, key, work_dir))
+
+        if len(runs) == 1:
+            runs[0].replace(output_path)
+            runs = []
+            return 1
+
+        run_files = [open(run, "rb") for run in runs]
+        try:
+            with open(output_path, "wb") as out:
+                # heapq.merge prefers earlier runs on ties, keeping the sort stable
+                out.writelines(heapq.merge(*run_files, key=key))
+        finally:
+            for run_file in run_files:
+                run_file.close()
+        logger.info(f"Merged {len(runs)} sorted runs of {file_path.name}")
+        return len(runs)
+    finally:
+        for run in runs:
+            run.unlink(missing_ok=True)
+
+
+def ensure_sorted(
+    file_path: Path,
+    file_config: FileConfig,
+    work_dir: Path,
+    memory_bytes: int
+) -> Path:
+    """
+    Get a copy of a file ordered by its cluster key, sorting only if needed.
+
+    Args:
+        file_path: Path to the data file
+        file_config: File configuration with a ``clusterKey``
+        work_dir: Directory for the sorted copy
+        memory_bytes: Maximum bytes of line data held in memory per run
+
+    Returns:
+        ``file_path`` if it is already sorted, otherwise the sorted copy
+    """
+    unsorted_line = find_unsorted_line(file_path, file_config)
+    if unsorted_line is None:
+        return file_path
+    logger.info(f"{file_path.name} is unsorted at line {unsorted_line:,}; sorting")
+    output_path = work_dir / file_path.name
+    external_sort(file_path, file_config, output_path, memory_bytes)
+    return output_path
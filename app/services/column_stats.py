@@ -0,0 +1,256 @@
+"""Streaming column statistics collected while a file is parsed."""
+
+import math
+from typing import Any, Dict, List, Sequence
+
+from app.models.layout import ColumnConfig, FileConfig
+
+
+_MASK64 = (1 << 64) - 1
+_NUMERIC_TYPES = ("INTEGER", "INT", "BIGINT", "DECIMAL")
+_CODE_SUFFIXES = ("_cd", "_flag", "_state", "_type")
+
+# Drift thresholds
+PARSE_FAILURE_RATE = 0.01
+VALUE_SANITY_LIMIT = 1_000_000_000
+VALUE_SANITY_RATE = 0.01
+YEAR_RANGE = (1800, 2100)
+
+
+def _mix64(x: int) -> int:
+    """SplitMix64 finalizer: spreads Python hashes across all 64 bits."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class HyperLogLog:
+    """Distinct count estimator with fixed memory (2**precision bytes)."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize the estimator.
+
+        Args:
+            precision: Register index bits; standard error is ~1.04/sqrt(2**p)
+        """
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Add a hashable value."""
+        h = _mix64(hash(value) & _MASK64)
+        index = h >> (64 - self.precision)
+        rest = (h << self.precision) & _MASK64
+        rank = 65 - rest.bit_length() if rest else 65 - self.precision
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class TopK:
+    """Space-Saving heavy hitters: approximate top-k with bounded counters."""
+
+    __slots__ = ("capacity", "counts")
+
+    def __init__(self, capacity: int = 50):
+        """
+        Initialize the counter set.
+
+        Args:
+            capacity: Maximum number of tracked values
+        """
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+
+    def add(self, value: Any) -> None:
+        """Count one occurrence of a value."""
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+        else:
+            # Evict the smallest counter; the newcomer inherits its count
+            victim = min(counts, key=counts.get)
+            counts[value] = counts.pop(victim) + 1
+
+    def top(self, k: int = 10) -> List[List[Any]]:
+        """Get the k most frequent values as [value, count] pairs."""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return [[value, count] for value, count in ranked[:k]]
+
+
+def _is_code_column(column: ColumnConfig) -> bool:
+    """Check whether a text column holds codes worth a top-k summary."""
+    return bool(column.codeMappings) or column.name.endswith(_CODE_SUFFIXES)
+
+
+class ColumnStats:
+    """Running statistics for a single column."""
+
+    __slots__ = (
+        "column", "numeric", "nulls", "parse_failures", "min_value",
+        "max_value", "out_of_range", "distinct", "top_values", "lengths"
+    )
+
+    def __init__(self, column: ColumnConfig):
+        """
+        Initialize statistics for a column.
+
+        Args:
+            column: Column configuration
+        """
+        self.column = column
+        self.numeric = column.dataType.upper() in _NUMERIC_TYPES
+        self.nulls = 0
+        self.parse_failures = 0
+        self.min_value = None
+        self.max_value = None
+        self.out_of_range = 0
+        self.distinct = HyperLogLog()
+        self.top_values = TopK() if not self.numeric and _is_code_column(column) else None
+        self.lengths = [0] * (column.length + 1)
+
+    def observe(self, raw: str, value: Any) -> None:
+        """
+        Add one field.
+
+        Args:
+            raw: Raw field text from the line
+            value: Parsed value
+        """
+        stripped = raw.strip()
+        length = len(stripped)
+        self.lengths[min(length, self.column.length)] += 1
+
+        if value is None:
+            if length:
+                self.parse_failures += 1
+            else:
+                self.nulls += 1
+            return
+
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+        if self.numeric and abs(value) > VALUE_SANITY_LIMIT:
+            self.out_of_range += 1
+
+        self.distinct.add(value)
+        if self.top_values is not None:
+            self.top_values.add(value)
+
+    def drift_flags(self, row_count: int) -> List[str]:
+        """
+        Flag signs that the layout offsets no longer match the file.
+
+        Args:
+            row_count: Records observed for the file
+
+        Returns:
+            List of flag descriptions
+        """
+        flags = []
+        if not row_count:
+            return flags
+        column = self.column
+        populated = row_count - self.nulls - self.parse_failures
+
+        if self.parse_failures / row_count > PARSE_FAILURE_RATE:
+            flags.append(
+                f"{self.parse_failures / row_count:.1%} of values failed to parse as {column.dataType}"
+            )
+        if not column.nullable and self.nulls:
+            flags.append(f"{self.nulls} nulls in non-nullable column")
+        if populated == 0:
+            flags.append("column is empty in every record")
+        if self.numeric and populated and self.out_of_range / populated > VALUE_SANITY_RATE:
+            flags.append(
+                f"{self.out_of_range / populated:.1%} of values exceed {VALUE_SANITY_LIMIT:,}"
+            )
+        if (
+            self.numeric and populated and ("year" in column.name or column.name.endswith("_yr"))
+            and self.max_value and not (YEAR_RANGE[0] <= self.max_value <= YEAR_RANGE[1])
+        ):
+            flags.append(f"year values up to {self.max_value} outside {YEAR_RANGE}")
+        return flags
+
+    def to_dict(self, row_count: int) -> Dict[str, Any]:
+        """
+        Summarize the column as a JSON-serializable dict.
+
+        Args:
+            row_count: Records observed for the file
+
+        Returns:
+            Statistics dict
+        """
+        return {
+            "column_name": self.column.name,
+            "row_count": row_count,
+            "null_count": self.nulls,
+            "parse_failures": self.parse_failures,
+            "min_value": None if self.min_value is None else str(self.min_value),
+            "max_value": None if self.max_value is None else str(self.max_value),
+            "distinct_estimate": self.distinct.estimate(),
+            "top_values": self.top_values.top() if self.top_values else None,
+            "length_histogram": {
+                str(length): count for length, count in enumerate(self.lengths) if count
+            },
+            "drift_flags": self.drift_flags(row_count),
+        }
+
+
+class FileStats:
+    """Streaming statistics for every active column of a file."""
+
+    def __init__(self, file_config: FileConfig):
+        """
+        Initialize statistics for a file.
+
+        Args:
+            file_config: File configuration
+        """
+        self.file_config = file_config
+        self.row_count = 0
+        self.columns = [ColumnStats(col) for col in file_config.active_columns]
+
+    def observe(self, line: str, record: Sequence[Any]) -> None:
+        """
+        Add one parsed record.
+
+        Args:
+            line: Raw line the record was parsed from
+            record: Tuple record in active column order
+        """
+        self.row_count += 1
+        for stats, (_, start, end), value in zip(
+            self.columns, self.file_config.column_spans, record
+        ):
+            stats.observe(line[start:end], value)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Get per-column statistics dicts."""
+        return [stats.to_dict(self.row_count) for stats in self.columns]
+
+    def drift_warnings(self) -> List[str]:
+        """Get drift flags for all columns as 'column: flag' strings."""
+        return [
+            f"{stats.column.name}: {flag}"
+            for stats in self.columns
+            for flag in stats.drift_flags(self.row_count)
+        ]
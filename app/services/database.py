@@ -1,22 +1,24 @@
 """Database connection and operations service."""
 
-from typing import Dict, Any, List, Optional, Generator
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 from contextlib import contextmanager
 import logging
 
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values, Json
 from psycopg2 import sql
 
-from app.config import DATABASE_CONFIG, BATCH_SIZE
-from app.models.layout import FileConfig
+from app.config import BATCH_SIZE, BRIN_PAGES_PER_RANGE
+from app.models.layout import FileConfig, LayoutConfig
+from app.services.schema import generate_schema_ddl
+from app.services.storage import StorageBackend, _record_values
 
 
 logger = logging.getLogger("cad_loader")
 
 
-class DatabaseService:
-    """Service for database operations."""
+class DatabaseService(StorageBackend):
+    """Service for PostgreSQL database operations."""
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
@@ -25,8 +27,10 @@ class DatabaseService:
         Args:
             config: Database configuration dict. Uses default if None.
         """
-        self.config = config or DATABASE_CONFIG
+        super().__init__(config)
         self._connection = None
+        # execute_values form (statement, row template) of INSERTs that may run as one statement
+        self._values_sql: Dict[str, Tuple[str, str]] = {}
     
     @contextmanager
     def get_connection(self):
@@ -92,6 +96,65 @@ class DatabaseService:
             logger.error(f"Error executing SQL file: {e}")
             return False
     
+    def create_tables(self, layout_config: LayoutConfig, schema: str = "cad") -> None:
+        """
+        Create the layout tables from generated DDL if they do not exist.
+        
+        Load-tracking tables come from sql/002_indexes_and_logging.sql,
+        which the database container runs at initialization.
+        
+        Args:
+            layout_config: Layout configuration
+            schema: Database schema
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(generate_schema_ddl(layout_config, schema))
+            conn.commit()
+        logger.info(f"Created layout tables in schema {schema}")
+    
+    def finalize_load(
+        self,
+        file_config: FileConfig,
+        schema: str = "cad",
+        clustered: bool = False
+    ) -> None:
+        """
+        Build a BRIN index on the cluster key after a clustered load.
+        
+        A BRIN index stores only the min/max key of each block range, so it
+        is a tiny fraction of a B-tree's size, but it can only skip pages
+        when the heap is physically ordered by the key.
+        
+        Args:
+            file_config: File configuration of the table
+            schema: Database schema
+            clustered: Rows were inserted in ``clusterKey`` order
+        """
+        if not clustered or not file_config.clusterKey:
+            return
+        
+        table = file_config.tableName
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql.SQL(
+                        "CREATE INDEX IF NOT EXISTS {} ON {}.{} USING brin ({}) "
+                        "WITH (pages_per_range = {})"
+                    ).format(
+                        sql.Identifier(f"idx_{table}_cluster_brin"),
+                        sql.Identifier(schema),
+                        sql.Identifier(table),
+                        sql.SQL(", ").join(map(sql.Identifier, file_config.clusterKey)),
+                        sql.Literal(BRIN_PAGES_PER_RANGE)
+                    )
+                )
+                cur.execute(sql.SQL("ANALYZE {}.{}").format(
+                    sql.Identifier(schema), sql.Identifier(table)
+                ))
+            conn.commit()
+        logger.info(f"Built BRIN index on {table}({', '.join(file_config.clusterKey)})")
+    
     def truncate_table(self, table_name: str, schema: str = "cad") -> bool:
         """
         Truncate a table.
@@ -121,7 +184,7 @@ class DatabaseService:
     
     def insert_records(
         self,
-        records: List[Dict[str, Any]],
+        records: Sequence[Union[Dict[str, Any], Tuple[Any, ...]]],
         file_config: FileConfig,
         schema: str = "cad",
         batch_size: int = BATCH_SIZE
@@ -130,7 +193,7 @@ class DatabaseService:
         Insert records into database table.
         
         Args:
-            records: List of record dictionaries
+            records: List of record dicts or column-ordered tuples
             file_config: File configuration with table info
             schema: Database schema
             batch_size: Records per batch
@@ -162,7 +225,7 @@ class DatabaseService:
                     for i in range(0, len(records), batch_size):
                         batch = records[i:i + batch_size]
                         values = [
-                            tuple(record.get(col) for col in columns)
+                            _record_values(record, columns)
                             for record in batch
                         ]
                         execute_batch(cur, insert_sql.as_string(conn), values)
@@ -180,97 +243,63 @@ class DatabaseService:
             logger.error(f"Error inserting records: {e}")
             raise
     
-    def insert_records_streaming(
+    def _insert_sql(
         self,
-        records_generator: Generator[Dict[str, Any], None, None],
+        conn,
         file_config: FileConfig,
-        schema: str = "cad",
-        batch_size: int = BATCH_SIZE
-    ) -> int:
-        """
-        Insert records from a generator (memory efficient).
-        
-        Args:
-            records_generator: Generator yielding record dicts
-            file_config: File configuration
-            schema: Database schema
-            batch_size: Records per batch
-            
-        Returns:
-            Number of records inserted
-        """
+        schema: str,
+        on_conflict: Optional[str] = None
+    ) -> str:
+        """Build the parameterized INSERT statement for a file's table."""
         columns = [col.name for col in file_config.active_columns]
-        table_name = file_config.tableName
-        
-        insert_sql = sql.SQL("INSERT INTO {}.{} ({}) VALUES ({})").format(
+        insert = sql.SQL("INSERT INTO {}.{} ({})").format(
             sql.Identifier(schema),
-            sql.Identifier(table_name),
-            sql.SQL(", ").join(map(sql.Identifier, columns)),
-            sql.SQL(", ").join(sql.Placeholder() * len(columns))
+            sql.Identifier(file_config.tableName),
+            sql.SQL(", ").join(map(sql.Identifier, columns))
         )
+        values = sql.SQL("({})").format(sql.SQL(", ").join(sql.Placeholder() * len(columns)))
+        conflict = sql.SQL("")
+        upsert = False
         
-        inserted = 0
-        skipped = 0
-        batch = []
-        
-        with self.get_connection() as conn:
-            sql_str = insert_sql.as_string(conn)
-            
-            for record in records_generator:
-                batch.append(
-                    tuple(record.get(col) for col in columns)
-                )
-                
-                if len(batch) >= batch_size:
-                    try:
-                        with conn.cursor() as cur:
-                            execute_batch(cur, sql_str, batch)
-                        conn.commit()
-                        inserted += len(batch)
-                    except Exception as e:
-                        conn.rollback()
-                        # Try inserting one by one to skip bad records
-                        for row in batch:
-                            try:
-                                with conn.cursor() as cur:
-                                    cur.execute(sql_str, row)
-                                conn.commit()
-                                inserted += 1
-                            except Exception as e:
-                                conn.rollback()
-                                skipped += 1
-                                if skipped <= 5:
-                                    logger.error(f"Error inserting record: {e}")
-                    batch = []
-                    
-                    if inserted % 10000 == 0:
-                        logger.info(f"Inserted {inserted} records into {table_name}")
-            
-            # Insert remaining records
-            if batch:
-                try:
-                    with conn.cursor() as cur:
-                        execute_batch(cur, sql_str, batch)
-                    conn.commit()
-                    inserted += len(batch)
-                except Exception:
-                    conn.rollback()
-                    for row in batch:
-                        try:
-                            with conn.cursor() as cur:
-                                cur.execute(sql_str, row)
-                            conn.commit()
-                            inserted += 1
-                        except Exception as e:
-                            conn.rollback()
-                            skipped += 1
-                            if skipped <= 5:
-                                logger.error(f"Error inserting record (final batch): {e}")
+        if on_conflict:
+            key = file_config.primaryKey
+            updates = [col for col in columns if col not in key]
+            upsert = on_conflict == "last" and bool(updates)
+            if upsert:
+                action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+                    sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col))
+                    for col in updates
+                ))
+            else:
+                action = sql.SQL("DO NOTHING")
+            conflict = sql.SQL(" ON CONFLICT ({}) {}").format(
+                sql.SQL(", ").join(map(sql.Identifier, key)), action
+            )
         
-        if skipped > 0:
-            logger.warning(f"Skipped {skipped} bad records")
-        logger.info(f"Completed inserting {inserted} records into {schema}.{table_name}")
-        return inserted
+        sql_str = sql.SQL("{} VALUES {}{}").format(insert, values, conflict).as_string(conn)
+        if not upsert:
+            # An upsert may not touch the same key twice in one statement
+            self._values_sql[sql_str] = (
+                sql.SQL("{} VALUES %s{}").format(insert, conflict).as_string(conn),
+                values.as_string(conn)
+            )
+        return sql_str
+    
+    def _execute_batch(self, cur, sql_str: str, rows: List[Tuple[Any, ...]]) -> int:
+        """Execute an INSERT for many rows and return how many rows it wrote."""
+        if sql_str in self._values_sql:
+            # One multi-row statement, so rowcount covers the whole batch and
+            # leaves out rows skipped by ON CONFLICT DO NOTHING
+            statement, template = self._values_sql[sql_str]
+            execute_values(cur, statement, rows, template=template, page_size=len(rows))
+            return cur.rowcount
+        # Upserts insert or update every row
+        execute_batch(cur, sql_str, rows)
+        return len(rows)
+    
+    def _stream_cursor(self, conn):
+        """Named (server-side) cursor, so large results are fetched in chunks."""
+        return conn.cursor(name="cad_stream")
     
     def get_table_count(self, table_name: str, schema: str = "cad") -> int:
         """
@@ -297,6 +326,78 @@ class DatabaseService:
             logger.error(f"Error getting table count: {e}")
             return -1
     
+    def get_table_columns(
+        self,
+        table_name: str,
+        schema: str = "cad"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get catalog column definitions for a table.
+        
+        Args:
+            table_name: Table name
+            schema: Schema name
+            
+        Returns:
+            Column info dicts keyed by column name (empty if no table)
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT column_name, data_type, character_maximum_length,
+                           numeric_precision, numeric_scale
+                    FROM information_schema.columns
+                    WHERE table_schema = %s AND table_name = %s
+                    """,
+                    (schema, table_name)
+                )
+                return {
+                    row[0]: {
+                        "data_type": row[1],
+                        "character_maximum_length": row[2],
+                        "numeric_precision": row[3],
+                        "numeric_scale": row[4],
+                    }
+                    for row in cur.fetchall()
+                }
+    
+    def start_data_load(
+        self,
+        file_name: str,
+        table_name: str,
+        schema: str = "cad"
+    ) -> Optional[int]:
+        """
+        Open a load log entry with status RUNNING.
+        
+        Args:
+            file_name: Source file name
+            table_name: Target table
+            schema: Database schema
+            
+        Returns:
+            Load log id, or None if logging failed
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        sql.SQL("""
+                            INSERT INTO {}.data_load_log
+                            (file_name, table_name, records_loaded, status, load_start)
+                            VALUES (%s, %s, 0, 'RUNNING', CURRENT_TIMESTAMP)
+                            RETURNING id
+                        """).format(sql.Identifier(schema)),
+                        (file_name, table_name)
+                    )
+                    load_id = cur.fetchone()[0]
+                conn.commit()
+            return load_id
+        except Exception as e:
+            logger.warning(f"Could not start load log: {e}")
+            return None
+    
     def log_data_load(
         self,
         file_name: str,
@@ -304,8 +405,9 @@ class DatabaseService:
         records_loaded: int,
         status: str,
         error_message: Optional[str] = None,
-        schema: str = "cad"
-    ) -> None:
+        schema: str = "cad",
+        load_id: Optional[int] = None
+    ) -> Optional[int]:
         """
         Log a data load operation.
         
@@ -316,18 +418,214 @@ class DatabaseService:
             status: Load status (SUCCESS, FAILED, etc.)
             error_message: Error message if failed
             schema: Database schema
+            load_id: Entry from start_data_load to complete (None inserts
+                a new entry)
+            
+        Returns:
+            Load log id, or None if logging failed
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    if load_id is not None:
+                        cur.execute(
+                            sql.SQL("""
+                                UPDATE {}.data_load_log
+                                SET records_loaded = %s, status = %s, error_message = %s,
+                                    load_end = CURRENT_TIMESTAMP
+                                WHERE id = %s
+                                RETURNING id
+                            """).format(sql.Identifier(schema)),
+                            (records_loaded, status, error_message, load_id)
+                        )
+                    else:
+                        cur.execute(
+                            sql.SQL("""
+                                INSERT INTO {}.data_load_log 
+                                (file_name, table_name, records_loaded, status, error_message, load_end)
+                                VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                                RETURNING id
+                            """).format(sql.Identifier(schema)),
+                            (file_name, table_name, records_loaded, status, error_message)
+                        )
+                    row = cur.fetchone()
+                conn.commit()
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"Could not log data load: {e}")
+            return None
+    
+    def get_last_load_status(
+        self,
+        table_name: str,
+        schema: str = "cad",
+        file_name: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get the status of the most recent load of a table.
+        
+        Args:
+            table_name: Target table
+            schema: Database schema
+            file_name: Only consider loads of this source file
+            
+        Returns:
+            Status string, or None if the table was never loaded
         """
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute(
                         sql.SQL("""
-                            INSERT INTO {}.data_load_log 
-                            (file_name, table_name, records_loaded, status, error_message, load_end)
-                            VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                            SELECT status FROM {}.data_load_log
+                            WHERE table_name = %s AND (%s IS NULL OR file_name = %s)
+                            ORDER BY id DESC LIMIT 1
                         """).format(sql.Identifier(schema)),
-                        (file_name, table_name, records_loaded, status, error_message)
+                        (table_name, file_name, file_name)
+                    )
+                    row = cur.fetchone()
+                    return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"Could not read load log: {e}")
+            return None
+    
+    def get_checkpoint(self, table_name: str, schema: str = "cad") -> Optional[Dict[str, Any]]:
+        """
+        Get the last committed checkpoint of an unfinished load.
+        
+        Args:
+            table_name: Target table
+            schema: Database schema
+            
+        Returns:
+            Checkpoint dict, or None if there is none
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql.SQL("""
+                        SELECT load_id, file_name, file_size, byte_offset,
+                               line_num, records_loaded
+                        FROM {}.data_load_checkpoint
+                        WHERE table_name = %s
+                    """).format(sql.Identifier(schema)),
+                    (table_name,)
+                )
+                row = cur.fetchone()
+        if not row:
+            return None
+        return {
+            "load_id": row[0],
+            "file_name": row[1],
+            "file_size": row[2],
+            "byte_offset": row[3],
+            "line_num": row[4],
+            "records_loaded": row[5],
+        }
+    
+    def write_checkpoint(
+        self,
+        cur,
+        table_name: str,
+        checkpoint: Dict[str, Any],
+        schema: str = "cad"
+    ) -> None:
+        """
+        Record load progress using the caller's cursor.
+        
+        Runs in the caller's transaction so the checkpoint is committed
+        atomically with the rows it describes.
+        
+        Args:
+            cur: Cursor of the loading transaction
+            table_name: Target table
+            checkpoint: Dict with load_id, file_name, file_size,
+                byte_offset, line_num and records_loaded
+            schema: Database schema
+        """
+        cur.execute(
+            sql.SQL("""
+                INSERT INTO {}.data_load_checkpoint
+                (table_name, load_id, file_name, file_size, byte_offset,
+                 line_num, records_loaded, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    load_id = EXCLUDED.load_id,
+                    file_name = EXCLUDED.file_name,
+                    file_size = EXCLUDED.file_size,
+                    byte_offset = EXCLUDED.byte_offset,
+                    line_num = EXCLUDED.line_num,
+                    records_loaded = EXCLUDED.records_loaded,
+                    updated_at = CURRENT_TIMESTAMP
+            """).format(sql.Identifier(schema)),
+            (
+                table_name, checkpoint["load_id"], checkpoint["file_name"],
+                checkpoint["file_size"], checkpoint["byte_offset"],
+                checkpoint["line_num"], checkpoint["records_loaded"]
+            )
+        )
+    
+    def clear_checkpoint(self, table_name: str, schema: str = "cad") -> None:
+        """
+        Remove the checkpoint of a table after its load completes.
+        
+        Args:
+            table_name: Target table
+            schema: Database schema
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        sql.SQL("DELETE FROM {}.data_load_checkpoint WHERE table_name = %s").format(
+                            sql.Identifier(schema)
+                        ),
+                        (table_name,)
                     )
                 conn.commit()
         except Exception as e:
-            logger.warning(f"Could not log data load: {e}")
+            logger.warning(f"Could not clear checkpoint: {e}")
+    
+    def save_column_stats(
+        self,
+        load_id: int,
+        table_name: str,
+        column_stats: List[Dict[str, Any]],
+        schema: str = "cad"
+    ) -> None:
+        """
+        Persist per-column statistics collected during a load.
+        
+        Args:
+            load_id: data_load_log id of the load
+            table_name: Target table
+            column_stats: Dicts from FileStats.summary()
+            schema: Database schema
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_batch(
+                        cur,
+                        sql.SQL("""
+                            INSERT INTO {}.data_load_column_stats
+                            (load_id, table_name, column_name, row_count, null_count,
+                             parse_failures, min_value, max_value, distinct_estimate,
+                             top_values, length_histogram, drift_flags)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        """).format(sql.Identifier(schema)).as_string(conn),
+                        [
+                            (
+                                load_id, table_name, stats["column_name"],
+                                stats["row_count"], stats["null_count"],
+                                stats["parse_failures"], stats["min_value"],
+                                stats["max_value"], stats["distinct_estimate"],
+                                Json(stats["top_values"]), Json(stats["length_histogram"]),
+                                Json(stats["drift_flags"])
+                            )
+                            for stats in column_stats
+                        ]
+                    )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Could not save column stats: {e}")
@@ -0,0 +1,70 @@
+"""In-stream primary key deduplication for upsert loads."""
+
+from typing import Any, List, Tuple
+import logging
+
+from app.models.layout import FileConfig
+
+
+logger = logging.getLogger("cad_loader")
+
+DEDUP_POLICIES = ("first", "last")
+
+# Duplicate keys kept for reporting
+_SAMPLE_SIZE = 10
+
+
+class KeyDeduplicator:
+    """
+    Record check that detects repeated primary keys within a window.
+
+    Keys are remembered as 64-bit hashes in two generations: when the
+    current generation fills half the window it becomes the previous one
+    and the oldest generation is dropped. Memory stays bounded by
+    ``window`` keys, and since exports are written in prop_id order,
+    repeats almost always fall inside the window. Repeats that do not are
+    still resolved by the database's ON CONFLICT clause.
+
+    With the ``first`` policy repeated records are dropped here. With
+    ``last`` they are passed through so the upsert overwrites the earlier
+    row.
+    """
+
+    def __init__(self, file_config: FileConfig, policy: str, window: int):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            file_config: File configuration with a ``primaryKey``
+            policy: 'first' (keep first occurrence) or 'last' (keep last)
+            window: Maximum number of keys remembered
+
+        Raises:
+            ValueError: If the policy is unknown or the file has no primary key
+        """
+        if policy not in DEDUP_POLICIES:
+            raise ValueError(f"Unknown dedup policy: {policy}")
+        if not file_config.primaryKey:
+            raise ValueError(f"{file_config.fileName} has no primaryKey")
+        self.policy = policy
+        self.positions = [file_config.column_index(name) for name in file_config.primaryKey]
+        self.generation_size = max(window // 2, 1)
+        self.current = set()
+        self.previous = set()
+        self.duplicates = 0
+        self.samples: List[Tuple[Any, ...]] = []
+
+    def __call__(self, line: str, record: Tuple[Any, ...]) -> bool:
+        key = tuple(record[i] for i in self.positions)
+        key_hash = hash(key)
+        if key_hash in self.current or key_hash in self.previous:
+            self.duplicates += 1
+            if len(self.samples) < _SAMPLE_SIZE:
+                self.samples.append(key)
+            return self.policy == "last"
+
+        if len(self.current) >= self.generation_size:
+            self.previous = self.current
+            self.current = set()
+        self.current.add(key_hash)
+        return True
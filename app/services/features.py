@@ -0,0 +1,245 @@
+"""Streaming pivot of improvement attributes into one feature row per property."""
+
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from app.models.layout import ColumnConfig, FileConfig, LayoutConfig
+from app.services.clustering import ensure_sorted
+from app.services.file_reader import read_fixed_width_file
+from app.services.merge import group_by_key, merge_groups
+from app.services.sampling import PropertySample
+
+
+logger = logging.getLogger("cad_loader")
+
+PropertyKey = Tuple[int, int]
+
+# Keys that do not parse sort first and are left out of the table
+_UNPARSED = -1
+
+# Distinct unmapped attribute codes remembered for the report
+_MAX_UNMAPPED_CODES = 1000
+
+
+def _normalize_code(code: Optional[str]) -> str:
+    """Normalize an attribute code for matching against the pivot spec."""
+    return " ".join((code or "").upper().split())
+
+
+def _property_key(file_config: FileConfig) -> Callable[[Tuple[Any, ...]], PropertyKey]:
+    """Build a function extracting (prop_id, tax_year) from a tuple record."""
+    prop_id = file_config.column_index("prop_id")
+    tax_year = file_config.column_index("tax_year")
+
+    def key(record: Tuple[Any, ...]) -> PropertyKey:
+        return (
+            record[prop_id] if isinstance(record[prop_id], int) else _UNPARSED,
+            record[tax_year] if isinstance(record[tax_year], int) else _UNPARSED,
+        )
+
+    return key
+
+
+def convert_feature(value: Any, column: ColumnConfig) -> Any:
+    """
+    Convert an attribute value to a feature column's type.
+
+    Args:
+        value: Raw attribute value (or an already parsed number)
+        column: Feature column configuration
+
+    Returns:
+        Converted value, or None if it is empty
+
+    Raises:
+        ValueError: If the value does not fit the column type
+    """
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if not value:
+            return None
+    if value is None:
+        return None
+
+    data_type = column.dataType.upper()
+    if data_type not in ("INTEGER", "INT", "BIGINT", "DECIMAL"):
+        return str(value)[:column.length]
+
+    number = float(str(value).replace(",", ""))
+    if data_type == "DECIMAL":
+        number = round(number, column.precision or 0)
+    else:
+        if not number.is_integer():
+            raise ValueError(f"{value!r} is not a whole number")
+        number = int(number)
+    if not _fits(number, column):
+        raise ValueError(f"{value!r} does not fit {column.name}")
+    return number
+
+
+def _fits(number: Any, column: ColumnConfig) -> bool:
+    """Check that a number has no more integer digits than its column allows."""
+    return abs(number) < 10 ** (column.length - (column.precision or 0))
+
+
+def _aggregate(values: List[Any], how: str) -> Any:
+    """Combine the non-null values of one feature for one property."""
+    if not values:
+        return None
+    if how == "sum":
+        return sum(values)
+    if how == "min":
+        return min(values)
+    if how == "max":
+        return max(values)
+    return values[0]
+
+
+class FeaturePivot:
+    """
+    Pivot of a file's ``pivot`` spec into a wide per-property table.
+
+    The attribute file (EAV rows of code/value) and the source files named
+    by ``source`` columns are read in (prop_id, tax_year) order and
+    merge-joined, so only one property's rows are in memory at a time.
+    Every spec column collects the values of its attribute codes (or its
+    source column) and combines them with its ``aggregate``: sum, min, max
+    or first, skipping values equal to its ``nullIf``. Values that do not
+    convert are counted in ``unparsed``; attribute codes no column asks
+    for are counted in ``unmapped`` so the spec can be extended.
+    """
+
+    def __init__(self, layout_config: LayoutConfig, file_type: str = "IMPROVEMENT_DETAIL_ATTR"):
+        """
+        Initialize the pivot.
+
+        Args:
+            layout_config: Layout configuration
+            file_type: Attribute file type with a ``pivot`` spec
+
+        Raises:
+            ValueError: If the file type has no pivot spec
+        """
+        self.layout_config = layout_config
+        self.attr_config = layout_config.get_file_config(file_type)
+        if self.attr_config is None or not self.attr_config.pivot:
+            raise ValueError(f"{file_type} has no pivot spec")
+        self.spec = self.attr_config.pivot
+        self.file_config = next(
+            fc for fc in layout_config.derived_files if fc.fileName == self.spec["fileName"]
+        )
+
+        by_name = {column.name: column for column in self.file_config.active_columns}
+        self.columns = [(by_name[item["name"]], item) for item in self.spec["columns"]]
+        self.codes: Dict[str, int] = {}
+        for i, (_, item) in enumerate(self.columns):
+            for code in item.get("attr", []):
+                self.codes[_normalize_code(code)] = i
+        self.source_types = sorted({
+            item["source"].split(".", 1)[0] for _, item in self.columns if "source" in item
+        })
+
+        self.properties = 0
+        self.unparsed: Counter = Counter()
+        self.unmapped: Counter = Counter()
+
+    def rows(
+        self,
+        paths: Dict[str, Path],
+        work_dir: Path,
+        memory_bytes: int,
+        sample: Optional[PropertySample] = None
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream feature rows ordered by (prop_id, tax_year).
+
+        Args:
+            paths: Data file paths keyed by file type; source files that
+                are missing leave their columns NULL
+            work_dir: Directory for sorted copies of unsorted files
+            memory_bytes: Memory budget of an external sort
+            sample: Only read the rows of sampled properties
+
+        Yields:
+            Tuples ordered like the derived table's active columns
+        """
+        file_types = [self.attr_config.fileName] + [
+            file_type for file_type in self.source_types if file_type in paths
+        ]
+        for file_type in self.source_types:
+            if file_type not in paths:
+                logger.warning(f"{file_type} not found; its feature columns are left NULL")
+
+        streams = []
+        for file_type in file_types:
+            file_config = self.layout_config.get_file_config(file_type)
+            path = paths[file_type]
+            sorted_path = ensure_sorted(path, file_config, work_dir, memory_bytes)
+            streams.append(group_by_key(
+                read_fixed_width_file(
+                    sorted_path, file_config, self.layout_config.encoding, record_format="tuple",
+                    line_filter=sample.line_filter(file_config) if sample else None
+                ),
+                _property_key(file_config),
+                path.name
+            ))
+
+        # Source columns as (feature index, stream index, record position)
+        sources = []
+        for i, (_, item) in enumerate(self.columns):
+            if "source" not in item:
+                continue
+            file_type, column = item["source"].split(".", 1)
+            if file_type in file_types:
+                position = self.layout_config.get_file_config(file_type).column_index(column)
+                sources.append((i, file_types.index(file_type), position))
+
+        code_position = self.attr_config.column_index("attr_cd")
+        value_position = self.attr_config.column_index("attr_val")
+
+        for key, groups in merge_groups(*streams):
+            if _UNPARSED in key:
+                continue
+            values: List[List[Any]] = [[] for _ in self.columns]
+            for record in groups[0] or ():
+                code = _normalize_code(record[code_position])
+                i = self.codes.get(code)
+                if i is None:
+                    if code and (code in self.unmapped or len(self.unmapped) < _MAX_UNMAPPED_CODES):
+                        self.unmapped[code] += 1
+                    continue
+                self._collect(values[i], record[value_position], *self.columns[i])
+            for i, stream, position in sources:
+                for record in groups[stream] or ():
+                    self._collect(values[i], record[position], *self.columns[i])
+
+            features = []
+            for column_values, (column, item) in zip(values, self.columns):
+                value = _aggregate(column_values, item.get("aggregate", "first"))
+                if isinstance(value, (int, float)) and not _fits(value, column):
+                    # A sum can outgrow the column even when every value fits
+                    self.unparsed[column.name] += 1
+                    value = None
+                features.append(value)
+            if all(value is None for value in features):
+                continue
+            self.properties += 1
+            yield key + tuple(features)
+
+    def _collect(
+        self,
+        values: List[Any],
+        raw: Any,
+        column: ColumnConfig,
+        item: Dict[str, Any]
+    ) -> None:
+        """Convert a raw value and add it to a feature's values."""
+        try:
+            value = convert_feature(raw, column)
+        except ValueError:
+            self.unparsed[column.name] += 1
+            return
+        if value is not None and value != item.get("nullIf"):
+            values.append(value)
@@ -1,15 +1,39 @@
 """Generic fixed-width file reader service."""
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Generator, Dict, Any, List, Optional
+from typing import Generator, Dict, Any, List, Optional, Tuple, Sequence, Callable, Union
 import logging
 
 from app.models.layout import FileConfig, ColumnConfig, LayoutConfig
+from app.services.column_stats import FileStats
 
 
 logger = logging.getLogger("cad_loader")
 
 
+def decode_assessed_val(raw):
+    """
+    Decode an assessed_val as stored in the raw file.
+    
+    The raw file stores values incorrectly encoded, need to decode:
+    Formula: (last_2_digits * 10000) + (remaining_digits / 100)
+    Example: 991200000000036 -> (36 * 10000) + (991200 / 100) = 369912
+    
+    Only integer operators are used, so ``raw`` may be a positive int or
+    a pandas integer Series.
+    
+    Args:
+        raw: Encoded value
+        
+    Returns:
+        Decoded value
+    """
+    last_2 = raw % 100
+    remaining = (raw - last_2) // 1000000000
+    return (last_2 * 10000) + (remaining // 100)
+
+
 def parse_value(value: str, column: ColumnConfig) -> Any:
     """
     Parse a string value based on column data type.
@@ -41,14 +65,8 @@ def parse_value(value: str, column: ColumnConfig) -> Any:
             parsed_int = int(value)
             
             # Apply correction formula for assessed_val field
-            # The raw file stores values incorrectly encoded, need to decode:
-            # Formula: (last_2_digits * 10000) + (remaining_digits / 100)
-            # Example: 991200000000036 -> (36 * 10000) + (991200 / 100) = 369912
             if column.name == 'assessed_val' and parsed_int > 0:
-                last_2 = parsed_int % 100
-                remaining = (parsed_int - last_2) // 1000000000
-                corrected_value = (last_2 * 10000) + (remaining // 100)
-                return corrected_value
+                return decode_assessed_val(parsed_int)
             
             return parsed_int
         elif data_type == 'DECIMAL':
@@ -77,40 +95,63 @@ def parse_line(line: str, file_config: FileConfig) -> Dict[str, Any]:
     Returns:
         Dictionary mapping column names to parsed values
     """
-    record = {}
-    position = 0
-    
-    for column in file_config.columns:
-        # Determine start and end positions
-        if column.start is not None:
-            # Use explicit start position (convert 1-based to 0-based)
-            start_position = column.start - 1
-            end_position = start_position + column.length
-            # Update current position pointer for subsequent sequential columns if mixed
-            position = end_position
-        else:
-            # Use sequential positioning
-            start_position = position
-            end_position = position + column.length
-            position = end_position
-
-        # Extract the field value
-        # Handle case where line is shorter than expected
-        if len(line) >= end_position:
-            raw_value = line[start_position:end_position]
-        elif len(line) > start_position:
-            raw_value = line[start_position:]
-        else:
-            raw_value = ""
+    return {
+        column.name: parse_value(line[start:end], column)
+        for column, start, end in file_config.column_spans
+    }
+
+
+def parse_line_tuple(line: str, file_config: FileConfig) -> Tuple[Any, ...]:
+    """
+    Parse a single line into a tuple ordered like ``active_columns``.
+    
+    Avoids building a dict per record; the database layer consumes these
+    tuples directly as insert parameters.
+    
+    Args:
+        line: Raw line from the file
+        file_config: File configuration with column definitions
         
-        # Skip columns marked as skip
-        if column.skip:
-            continue
+    Returns:
+        Tuple of parsed values in active column order
+    """
+    return tuple([
+        parse_value(line[start:end], column)
+        for column, start, end in file_config.column_spans
+    ])
+
+
+def record_to_dict(record: Sequence[Any], file_config: FileConfig) -> Dict[str, Any]:
+    """
+    Build a dict view of a tuple record.
+    
+    Args:
+        record: Tuple record from parse_line_tuple
+        file_config: File configuration the record was parsed with
         
-        # Parse and store the value
-        record[column.name] = parse_value(raw_value, column)
+    Returns:
+        Dictionary mapping column names to values
+    """
+    return dict(zip(file_config.column_names, record))
+
+
+@dataclass
+class ReadProgress:
+    """
+    Position reached in a source file.
     
-    return record
+    Updated by read_fixed_width_file before each record is yielded, so it
+    always points just past the line of the last record handed out.
+    """
+    
+    byte_offset: int = 0
+    line_num: int = 0
+
+
+RECORD_PARSERS: Dict[str, Callable[[str, FileConfig], Any]] = {
+    "dict": parse_line,
+    "tuple": parse_line_tuple,
+}
 
 
 def read_fixed_width_file(
@@ -118,8 +159,13 @@ def read_fixed_width_file(
     file_config: FileConfig,
     encoding: str = "utf-8",
     skip_header: bool = False,
-    max_records: Optional[int] = None
-) -> Generator[Dict[str, Any], None, None]:
+    max_records: Optional[int] = None,
+    record_format: str = "dict",
+    stats: Optional[FileStats] = None,
+    progress: Optional[ReadProgress] = None,
+    record_check: Optional[Callable[[str, Tuple[Any, ...]], bool]] = None,
+    line_filter: Optional[Callable[[str], bool]] = None
+) -> Generator[Union[Dict[str, Any], Tuple[Any, ...]], None, None]:
     """
     Read a fixed-width file and yield parsed records.
     
@@ -129,16 +175,45 @@ def read_fixed_width_file(
         encoding: File encoding
         skip_header: Whether to skip the first line
         max_records: Maximum number of records to read (None for all)
+        record_format: 'dict' for column-name dicts, 'tuple' for compact
+            tuples ordered like ``file_config.active_columns``
+        stats: Optional collector updated with every parsed record
+        progress: Optional position tracker; reading starts at its
+            byte_offset/line_num (e.g. a resume checkpoint) and it is
+            advanced as lines are consumed
+        record_check: Optional callback(line, record tuple) run before a
+            record is yielded; records it returns False for are dropped
+        line_filter: Optional check of the raw line run before parsing;
+            lines it returns False for are skipped (and not counted)
         
     Yields:
-        Parsed record dictionaries
+        Parsed records
     """
+    if record_format not in RECORD_PARSERS:
+        raise ValueError(f"Unknown record format: {record_format}")
+    parse = RECORD_PARSERS[record_format]
+    
     logger.info(f"Reading file: {file_path.name}")
     
     record_count = 0
+    if progress is None:
+        progress = ReadProgress()
     
-    with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-        for line_num, line in enumerate(f, start=1):
+    # Binary mode so byte offsets stay exact; lines are decoded one by one
+    with open(file_path, 'rb') as f:
+        if progress.byte_offset:
+            f.seek(progress.byte_offset)
+            logger.info(
+                f"Resuming {file_path.name} at byte {progress.byte_offset:,} "
+                f"(line {progress.line_num:,})"
+            )
+        
+        for raw_line in f:
+            progress.byte_offset += len(raw_line)
+            progress.line_num += 1
+            line_num = progress.line_num
+            line = raw_line.decode(encoding, errors='replace')
+            
             # Skip header if requested
             if skip_header and line_num == 1:
                 continue
@@ -147,8 +222,16 @@ def read_fixed_width_file(
             if not line.strip():
                 continue
             
+            if line_filter is not None and not line_filter(line):
+                continue
+            
             try:
-                record = parse_line(line, file_config)
+                record = parse(line, file_config)
+                values = record if isinstance(record, tuple) else tuple(record.values())
+                if record_check is not None and not record_check(line, values):
+                    continue
+                if stats is not None:
+                    stats.observe(line, values)
                 record_count += 1
                 yield record
                 
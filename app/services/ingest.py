@@ -0,0 +1,333 @@
+"""Drop-folder ingest: detect complete new exports and load them automatically."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+import os
+import time
+
+from app.models.layout import LayoutConfig
+from app.services.loader import DataLoader, load_in_order
+from app.services.storage import StorageBackend, create_storage
+
+
+logger = logging.getLogger("cad_loader")
+
+# data_load_log.table_name of the one summary entry written per drop
+DROP_LOG_TABLE = "(drop)"
+
+# Drop statuses that mean "done, do not load again"
+_DONE = ("SUCCESS", "SKIPPED")
+
+# (file name, size, mtime_ns) of every file of a drop
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class Drop:
+    """The files of one export: a directory and the prefix its file names share."""
+
+    directory: Path
+    prefix: str
+    files: Dict[str, Path] = field(default_factory=dict)
+    fingerprint: Fingerprint = ()
+
+    @property
+    def name(self) -> str:
+        """Name of the drop in data_load_log (the prefix identifies the export)."""
+        return f"{self.prefix}*"
+
+
+def split_file_name(name: str, file_types: Sequence[str]) -> Optional[Tuple[str, str]]:
+    """
+    Split a data file name into its export prefix and file type.
+
+    The longest matching file type wins, so ``..._ENTITY_INFO.TXT`` is
+    ENTITY_INFO rather than INFO.
+
+    Args:
+        name: File name, e.g. ``2025-10-27_002174_APPRAISAL_INFO.TXT``
+        file_types: Known file types, longest first
+
+    Returns:
+        Tuple of (prefix, file type), or None if the name is not a data file
+    """
+    if not name.endswith(".TXT"):
+        return None
+    stem = name[:-len(".TXT")]
+    for file_type in file_types:
+        if stem.endswith(file_type) and len(stem) > len(file_type):
+            return stem[:-len(file_type)], file_type
+    return None
+
+
+def scan_drops(watch_dir: Path, layout_config: LayoutConfig) -> Dict[Tuple[Path, str], Drop]:
+    """
+    Find the exports in a drop folder and its immediate subdirectories.
+
+    Only directory listings and file stats are read. Unlike
+    ``discover_data_files``, which lists the files of a known prefix, this
+    has to find the prefixes, so names are split against the layout's
+    file types; the files of a ready drop are then discovered with
+    ``discover_data_files`` as usual.
+
+    Args:
+        watch_dir: Drop folder
+        layout_config: Layout configuration (file types)
+
+    Returns:
+        Drops keyed by (directory, prefix)
+    """
+    file_types = sorted(layout_config.file_names, key=len, reverse=True)
+    directories = [watch_dir]
+    with os.scandir(watch_dir) as entries:
+        directories += sorted(Path(e.path) for e in entries if e.is_dir())
+
+    drops: Dict[Tuple[Path, str], Drop] = {}
+    for directory in directories:
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda e: e.name):
+            parts = split_file_name(entry.name, file_types)
+            if parts is None or not entry.is_file():
+                continue
+            prefix, file_type = parts
+            drop = drops.setdefault((directory, prefix), Drop(directory, prefix))
+            stat = entry.stat()
+            drop.files[file_type] = Path(entry.path)
+            drop.fingerprint += ((entry.name, stat.st_size, stat.st_mtime_ns),)
+    return drops
+
+
+class DropIngester:
+    """
+    Watches a drop folder and loads each complete new export.
+
+    A drop is complete once it contains every ``required`` file type and
+    none of its files has changed size or modification time (and no file
+    was added) for ``settle_seconds``. Drops are loaded one at a time, as
+    each replaces the tables' contents; within a drop the tables of each
+    ``LOADING_ORDER`` group load in up to ``workers`` processes. When
+    several drops are ready, only the newest (by prefix, which starts with
+    the export date) is loaded; the others, and drops older than one
+    already loaded, are recorded as SKIPPED so stale data never
+    overwrites newer data.
+
+    Every drop gets one ``(drop)`` entry in data_load_log next to the
+    entries of its files, which is also how drops loaded before a restart
+    are recognized. A failed or partial drop is retried once its files
+    change.
+    """
+
+    def __init__(
+        self,
+        watch_dir: Path,
+        db_config: Dict[str, Any],
+        layout_config: LayoutConfig,
+        required: Sequence[str] = ("INFO",),
+        settle_seconds: float = 60.0,
+        workers: int = 1,
+        load_options: Optional[Dict[str, Any]] = None,
+        features: bool = False,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the ingester.
+
+        Args:
+            watch_dir: Drop folder
+            db_config: Database configuration for the loaders
+            layout_config: Layout configuration
+            required: File types a drop must contain to be loaded
+            settle_seconds: How long files must stay unchanged
+            workers: Tables of a group loaded in parallel processes
+            load_options: Keyword arguments of ``DataLoader.load_file``
+            features: Build property_features after each drop
+            clock: Time source (seconds)
+        """
+        self.watch_dir = watch_dir
+        self.db_config = db_config
+        self.db_service: StorageBackend = create_storage(db_config)
+        self.layout_config = layout_config
+        self.required = list(required)
+        self.settle_seconds = settle_seconds
+        self.workers = workers
+        self.load_options = load_options or {}
+        self.features = features
+        self.clock = clock
+        # (directory, prefix) -> (fingerprint, when it was first seen)
+        self._seen: Dict[Tuple[Path, str], Tuple[Fingerprint, float]] = {}
+        # Drops that need no (further) attempt, with the fingerprint decided on
+        self._done: Dict[Tuple[Path, str], Fingerprint] = {}
+        # Prefix of the newest drop known to be loaded
+        self.latest: Optional[str] = None
+
+    def ready_drops(self) -> List[Drop]:
+        """
+        Scan the folder and get the complete drops not loaded yet.
+
+        Returns:
+            Ready drops, oldest first
+        """
+        now = self.clock()
+        drops = scan_drops(self.watch_dir, self.layout_config)
+        self._seen = {
+            key: seen for key, seen in self._seen.items() if key in drops
+        }
+        ready = []
+        for key, drop in drops.items():
+            if self._done.get(key) == drop.fingerprint:
+                continue
+            seen = self._seen.get(key)
+            if seen is None or seen[0] != drop.fingerprint:
+                self._seen[key] = (drop.fingerprint, now)
+                if seen is None:
+                    logger.info(f"New drop {drop.name} in {drop.directory}")
+                continue
+            missing = [t for t in self.required if t not in drop.files]
+            if missing or now - seen[1] < self.settle_seconds:
+                continue
+            if key not in self._done and self.db_service.get_last_load_status(
+                DROP_LOG_TABLE, file_name=drop.name
+            ) in _DONE:
+                logger.info(f"Drop {drop.name} was already loaded")
+                self._done[key] = drop.fingerprint
+                self._loaded(drop)
+                continue
+            ready.append(drop)
+        return sorted(ready, key=lambda d: d.prefix)
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Scan once and load the newest ready drop.
+
+        Returns:
+            Drop results (empty if nothing was ready)
+        """
+        ready = self.ready_drops()
+        newest = None
+        # The same prefix as the loaded drop is only ready again if its files changed
+        if ready and (self.latest is None or ready[-1].prefix >= self.latest):
+            newest = ready.pop()
+        results = []
+        for drop in ready:
+            reason = (
+                f"Superseded by {newest.name}" if newest is not None
+                else f"Older than the loaded {self.latest}*"
+            )
+            logger.warning(f"Skipping drop {drop.name}: {reason}")
+            self.db_service.log_data_load(
+                file_name=drop.name,
+                table_name=DROP_LOG_TABLE,
+                records_loaded=0,
+                status="SKIPPED",
+                error_message=reason
+            )
+            self._done[(drop.directory, drop.prefix)] = drop.fingerprint
+            results.append({"drop": drop.name, "status": "SKIPPED", "records_loaded": 0})
+        if newest is not None:
+            results.append(self.ingest(newest))
+        return results
+
+    def _loaded(self, drop: Drop) -> None:
+        """Remember a drop whose data is in the tables."""
+        if self.latest is None or drop.prefix > self.latest:
+            self.latest = drop.prefix
+
+    def ingest(self, drop: Drop) -> Dict[str, Any]:
+        """
+        Load every file of a drop and record the drop in data_load_log.
+
+        Args:
+            drop: Complete drop
+
+        Returns:
+            Dict with the drop ``status`` (SUCCESS, PARTIAL or FAILED),
+            ``records_loaded`` and the per-file ``results``
+        """
+        logger.info(f"Ingesting drop {drop.name} ({len(drop.files)} files) from {drop.directory}")
+        start = time.time()
+        load_id = self.db_service.start_data_load(drop.name, DROP_LOG_TABLE)
+        results = []
+        error = None
+        try:
+            results = self._load_tables(drop)
+            if self.features:
+                loader = DataLoader(
+                    data_dir=drop.directory, db_service=self.db_service, file_prefix=drop.prefix
+                )
+                results.append(loader.build_features())
+        except Exception as e:
+            logger.error(f"Error ingesting drop {drop.name}: {e}")
+            error = str(e)
+
+        failed = [r["file_type"] for r in results if r["status"] not in ("SUCCESS", "SKIPPED")]
+        if error is None and not failed:
+            status = "SUCCESS"
+        elif len(failed) < len(results):
+            status = "PARTIAL"
+        else:
+            status = "FAILED"
+        if failed and error is None:
+            error = "Failed: " + ", ".join(failed)
+        records = sum(r["records_loaded"] for r in results)
+        self.db_service.log_data_load(
+            file_name=drop.name,
+            table_name=DROP_LOG_TABLE,
+            records_loaded=records,
+            status=status,
+            error_message=error,
+            load_id=load_id
+        )
+        # Recorded either way: a failed drop is retried once its files change
+        self._done[(drop.directory, drop.prefix)] = drop.fingerprint
+        if status == "SUCCESS":
+            # A partial drop must not supersede its own corrected re-export
+            self._loaded(drop)
+
+        duration = time.time() - start
+        log = logger.info if status == "SUCCESS" else logger.warning
+        log(f"Drop {drop.name}: {status}, {records:,} records in {duration:.1f}s")
+        return {
+            "drop": drop.name,
+            "status": status,
+            "records_loaded": records,
+            "duration_seconds": duration,
+            "results": results,
+        }
+
+    def _load_tables(self, drop: Drop) -> List[Dict[str, Any]]:
+        """Load a drop's files in LOADING_ORDER, in parallel within a group."""
+        loader = DataLoader(
+            data_dir=drop.directory, db_service=self.db_service, file_prefix=drop.prefix
+        )
+        known = set(self.layout_config.file_names)
+        file_types = [t for t in loader.get_available_files() if t in known]
+        return load_in_order(loader, self.load_options, file_types, self.workers)
+
+    def run(self, poll_seconds: float = 30.0, should_stop: Callable[[], bool] = lambda: False) -> None:
+        """
+        Poll the folder until ``should_stop`` returns True.
+
+        A drop being loaded is always finished before stopping.
+
+        Args:
+            poll_seconds: Seconds between scans
+            should_stop: Checked between scans
+        """
+        logger.info(
+            f"Watching {self.watch_dir} every {poll_seconds:g}s "
+            f"(drops settle for {self.settle_seconds:g}s)"
+        )
+        while not should_stop():
+            try:
+                self.poll()
+            except Exception as e:
+                # A scan error (e.g. the folder is briefly unavailable) must not stop the daemon
+                logger.error(f"Error scanning {self.watch_dir}: {e}")
+            deadline = time.monotonic() + poll_seconds
+            while not should_stop() and time.monotonic() < deadline:
+                time.sleep(min(1.0, poll_seconds))
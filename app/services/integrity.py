@@ -0,0 +1,210 @@
+"""In-memory referential integrity checks for child records during a load."""
+
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+import logging
+import sys
+
+from app.models.layout import FileConfig, LayoutConfig
+
+
+logger = logging.getLogger("cad_loader")
+
+# Bitset size always allowed (keys up to ~8 million)
+_MIN_BITSET_BYTES = 1 << 20
+# Past the minimum, the bitset grows only while it costs less per key than a set entry
+_BYTES_PER_KEY = 64
+
+
+class KeySet:
+    """
+    Set of non-negative integer keys stored as a bitset.
+
+    One bit per possible key: 300,000 prop_ids in the range 1..3,000,000
+    take ~370 KB, against well over 10 MB for a Python set of ints. The
+    bitset only grows while it stays below ``_MIN_BITSET_BYTES`` or
+    ``_BYTES_PER_KEY`` per key held; keys beyond that (a corrupt 12-digit
+    prop_id would need a 125 GB bitset) go to a small overflow set.
+    """
+
+    __slots__ = ("bits", "count", "overflow")
+
+    def __init__(self, capacity: int = 0):
+        """
+        Initialize an empty set.
+
+        Args:
+            capacity: Expected largest key (the bitset grows as needed)
+        """
+        self.bits = bytearray((min(capacity, _MIN_BITSET_BYTES << 3) >> 3) + 1)
+        self.count = 0
+        self.overflow = set()
+
+    def add(self, key: int) -> None:
+        """Add a key; negative keys are ignored."""
+        if key < 0:
+            return
+        index = key >> 3
+        if index >= len(self.bits):
+            limit = max(_MIN_BITSET_BYTES, _BYTES_PER_KEY * (self.count + 1))
+            if index >= limit:
+                if key not in self.overflow:
+                    self.overflow.add(key)
+                    self.count += 1
+                return
+            # Grow geometrically so adding ascending keys stays amortized O(1)
+            size = min(max(index + 1, 2 * len(self.bits)), limit)
+            self.bits.extend(bytes(size - len(self.bits)))
+            covered = [k for k in self.overflow if k >> 3 < size]
+            for k in covered:
+                self.overflow.discard(k)
+                self.bits[k >> 3] |= 1 << (k & 7)
+        mask = 1 << (key & 7)
+        if not self.bits[index] & mask:
+            self.bits[index] |= mask
+            self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        index = key >> 3
+        if 0 <= index < len(self.bits):
+            return bool(self.bits[index] & (1 << (key & 7)))
+        return key in self.overflow
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bitset and the overflow set."""
+        return len(self.bits) + (sys.getsizeof(self.overflow) if self.overflow else 0)
+
+
+def parse_reference(reference: str) -> Tuple[str, str]:
+    """
+    Split a ``FILE.column`` reference.
+
+    Args:
+        reference: Reference from a layout's ``references`` mapping
+
+    Returns:
+        Tuple of (file type, column name)
+    """
+    file_type, _, column = reference.partition(".")
+    return file_type, column
+
+
+def referenced_keys(layout_config: LayoutConfig) -> Dict[str, List[str]]:
+    """
+    Find the parent columns that other files reference.
+
+    Args:
+        layout_config: Layout configuration
+
+    Returns:
+        Referenced column names keyed by parent file type
+    """
+    parents: Dict[str, List[str]] = {}
+    for file_config in layout_config.files:
+        for reference in (file_config.references or {}).values():
+            file_type, column = parse_reference(reference)
+            if column not in parents.setdefault(file_type, []):
+                parents[file_type].append(column)
+    return parents
+
+
+def scan_keys(file_path: Path, file_config: FileConfig, column: str) -> KeySet:
+    """
+    Build a key set from one column of a data file without parsing records.
+
+    Used when the parent file is not loaded in the same run.
+
+    Args:
+        file_path: Path to the parent data file
+        file_config: Parent file configuration
+        column: Key column name
+
+    Returns:
+        Key set of every integer value in the column
+    """
+    spans = {col.name: (start, end) for col, start, end in file_config.column_spans}
+    start, end = spans[column]
+    keys = KeySet()
+    with open(file_path, "rb") as f:
+        for line in f:
+            try:
+                keys.add(int(line[start:end]))
+            except ValueError:
+                continue
+    logger.info(
+        f"Scanned {len(keys):,} {file_config.fileName}.{column} keys "
+        f"({keys.nbytes:,} bytes)"
+    )
+    return keys
+
+
+class KeyCollector:
+    """Record check that adds the parent key columns of each record to key sets."""
+
+    def __init__(self, file_config: FileConfig, columns: Iterable[str]):
+        """
+        Initialize the collector.
+
+        Args:
+            file_config: Parent file configuration
+            columns: Key columns to collect
+        """
+        self.positions = [(name, file_config.column_index(name)) for name in columns]
+        self.keys = {name: KeySet() for name, _ in self.positions}
+
+    def __call__(self, line: str, record: Tuple[Any, ...]) -> bool:
+        for name, position in self.positions:
+            value = record[position]
+            if value is not None:
+                self.keys[name].add(value)
+        return True
+
+
+class OrphanCheck:
+    """
+    Record check that rejects child records whose references do not exist.
+
+    Null and zero references mean "no parent" and are not checked. Rejected
+    lines are written unchanged to a quarantine file so they can be
+    inspected or reloaded later.
+    """
+
+    def __init__(
+        self,
+        file_config: FileConfig,
+        parent_keys: Dict[str, KeySet],
+        quarantine: Optional[IO[str]] = None
+    ):
+        """
+        Initialize the check.
+
+        Args:
+            file_config: Child file configuration
+            parent_keys: Parent key set for each referencing column
+            quarantine: Open text file receiving orphan lines
+        """
+        self.checks = [
+            (name, file_config.column_index(name), keys)
+            for name, keys in parent_keys.items()
+        ]
+        self.quarantine = quarantine
+        self.orphans = {name: 0 for name in parent_keys}
+        self.rejected = 0
+
+    def __call__(self, line: str, record: Tuple[Any, ...]) -> bool:
+        orphan = False
+        for name, position, keys in self.checks:
+            value = record[position]
+            if value and value not in keys:
+                self.orphans[name] += 1
+                orphan = True
+        if orphan:
+            self.rejected += 1
+            if self.quarantine is not None:
+                self.quarantine.write(line if line.endswith("\n") else line + "\n")
+            return False
+        return True
@@ -1,22 +1,195 @@
 """Data loader service - orchestrates file reading and database loading."""
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
 import logging
+import tempfile
 
-from app.models.layout import LayoutConfig, load_layout_config
+from app.models.layout import FileConfig, LayoutConfig, load_layout_config
 from app.services.file_reader import (
+    ReadProgress,
     read_fixed_width_file,
     get_file_path,
     discover_data_files
 )
-from app.services.database import DatabaseService
-from app.config import DATA_DIR, CONFIG_DIR, BATCH_SIZE
+from app.services.storage import StorageBackend, create_storage
+from app.services.schema import SchemaDriftError, find_schema_drift
+from app.services.column_stats import FileStats
+from app.services.clustering import external_sort, find_unsorted_line
+from app.services.dedup import KeyDeduplicator
+from app.services.features import FeaturePivot
+from app.services.integrity import (
+    KeyCollector,
+    KeySet,
+    OrphanCheck,
+    parse_reference,
+    referenced_keys,
+    scan_keys
+)
+from app.services.reconcile import (
+    GroupTotals,
+    find_discrepancies,
+    read_export_totals,
+    read_totals_file
+)
+from app.services.sampling import PropertySample
+from app.config import (
+    DATA_DIR,
+    CONFIG_DIR,
+    CLUSTER_SORT_MEMORY_MB,
+    DEDUP_WINDOW_KEYS,
+    QUARANTINE_DIR
+)
 
 
 logger = logging.getLogger("cad_loader")
 
+# Loading order: reference tables first, then main tables; the tables of a
+# group do not depend on each other and may load in parallel
+LOADING_ORDER = [
+    {
+        "name": "Reference Tables",
+        "tables": ["HEADER", "STATE_CODE", "COUNTRY_CODE", "ABSTRACT_SUBDV", "AGENT", "ENTITY"]
+    },
+    {
+        "name": "Main Property Tables",
+        "tables": ["INFO", "LAND_DETAIL", "IMPROVEMENT_INFO", "IMPROVEMENT_DETAIL", 
+                  "IMPROVEMENT_DETAIL_ATTR"]
+    },
+    {
+        "name": "Entity and Relationship Tables",
+        "tables": ["ENTITY_INFO", "ENTITY_TOTALS"]
+    },
+    {
+        "name": "Additional Tables",
+        "tables": ["LAWSUIT", "MOBILE_HOME_INFO", "TAX_DEFERRAL_INFO", "UDI"]
+    }
+]
+
+
+# Loader used by worker processes (created once per process)
+_worker_loader = None
+
+
+def _init_worker(
+    db_config: Dict[str, Any],
+    config_path: Path,
+    data_dir: Path,
+    file_prefix: str
+) -> None:
+    """Create the worker process's own loader and database connection."""
+    global _worker_loader
+    _worker_loader = DataLoader(config_path, data_dir, create_storage(db_config), file_prefix)
+
+
+def _load_in_worker(
+    file_type: str,
+    load_options: Dict[str, Any],
+    parent_keys: Dict[str, KeySet],
+    run: Callable[["DataLoader", str, Dict[str, Any]], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Worker process entry point."""
+    # Keys of parents loaded earlier in the run; other parents are scanned from their files
+    _worker_loader._parent_keys.update(parent_keys)
+    return run(_worker_loader, file_type, load_options)
+
+
+def _load_file(loader: "DataLoader", file_type: str, load_options: Dict[str, Any]) -> Dict[str, Any]:
+    """Load one table with ``DataLoader.load_file``."""
+    return loader.load_file(file_type, **load_options)
+
+
+def load_in_order(
+    loader: "DataLoader",
+    load_options: Dict[str, Any],
+    file_types: Optional[List[str]] = None,
+    workers: int = 1,
+    run: Callable[["DataLoader", str, Dict[str, Any]], Dict[str, Any]] = _load_file,
+    on_group: Optional[Callable[[str, List[str]], None]] = None,
+    on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Load tables group by group in ``LOADING_ORDER``.
+    
+    With several workers the tables of a group load in parallel processes,
+    each with its own loader and connection built from ``loader``'s
+    database config, layout, data directory and file prefix. With
+    ``check_integrity``, tables that other files reference (INFO) load
+    first, in this process, and the keys they collect are handed to the
+    workers. Children are therefore checked against the parent rows that
+    were actually loaded, as with one worker, even when ``max_records``,
+    ``sample`` or a resumed load left part of the parent file out.
+    
+    Args:
+        loader: Loader whose settings the workers copy
+        load_options: Keyword arguments of ``DataLoader.load_file``
+        file_types: File types to load (None for every LOADING_ORDER
+            type); types outside LOADING_ORDER load last
+        workers: Parallel worker processes per group
+        run: Callable(loader, file_type, load_options) loading one table;
+            must be picklable when ``workers`` > 1
+        on_group: Called with a group's name and tables before it loads
+        on_result: Called with each table's result as it completes
+        
+    Returns:
+        Load results in completion order; a table whose load raised gets
+        a FAILED result
+    """
+    grouped = [table for group in LOADING_ORDER for table in group["tables"]]
+    groups = [
+        (group["name"], [t for t in group["tables"] if file_types is None or t in file_types])
+        for group in LOADING_ORDER
+    ]
+    if file_types:
+        groups.append(("Other Tables", [t for t in file_types if t not in grouped]))
+    parents = (
+        set(referenced_keys(loader.layout_config))
+        if load_options.get("check_integrity") else set()
+    )
+    
+    results = []
+    
+    def finish(file_type: str, load: Callable[[], Dict[str, Any]]) -> None:
+        try:
+            result = load()
+        except Exception as e:
+            logger.error(f"Error loading {file_type}: {e}")
+            result = {"file_type": file_type, "status": "FAILED", "records_loaded": 0,
+                      "error": str(e)}
+        results.append(result)
+        if on_result is not None:
+            on_result(file_type, result)
+    
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(loader.db_service.config, loader.config_path, loader.data_dir,
+                      loader.file_prefix)
+        )
+    try:
+        for name, tables in groups:
+            if not tables:
+                continue
+            if on_group is not None:
+                on_group(name, tables)
+            local = tables if pool is None else [t for t in tables if t in parents]
+            for table in local:
+                finish(table, lambda: run(loader, table, load_options))
+            futures = {
+                pool.submit(_load_in_worker, table, load_options, loader._parent_keys, run): table
+                for table in tables if table not in local
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return results
+
 
 class DataLoader:
     """Orchestrates loading of CAD data files into the database."""
@@ -25,7 +198,8 @@ class DataLoader:
         self,
         config_path: Optional[Path] = None,
         data_dir: Optional[Path] = None,
-        db_service: Optional[DatabaseService] = None
+        db_service: Optional[StorageBackend] = None,
+        file_prefix: Optional[str] = None
     ):
         """
         Initialize the data loader.
@@ -33,12 +207,17 @@ class DataLoader:
         Args:
             config_path: Path to layout config JSON
             data_dir: Directory containing data files
-            db_service: Database service instance
+            db_service: Storage backend (from DATABASE_CONFIG if None)
+            file_prefix: File name prefix of the export to load (the
+                layout's ``filePrefix`` if None)
         """
         self.config_path = config_path or CONFIG_DIR / "file_layouts.json"
         self.data_dir = data_dir or DATA_DIR
-        self.db_service = db_service or DatabaseService()
+        self.db_service = db_service or create_storage()
+        self._file_prefix = file_prefix
         self._layout_config = None
+        # Parent key sets for integrity checks, keyed by "FILE.column"
+        self._parent_keys: Dict[str, KeySet] = {}
     
     @property
     def layout_config(self) -> LayoutConfig:
@@ -48,19 +227,108 @@ class DataLoader:
             logger.info(f"Loaded layout config: {self._layout_config.description}")
         return self._layout_config
     
+    @property
+    def file_prefix(self) -> str:
+        """File name prefix of the export being loaded."""
+        return self._file_prefix or self.layout_config.filePrefix
+    
+    def check_schema(
+        self,
+        file_types: Optional[List[str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Check database tables against the file layout.
+        
+        Args:
+            file_types: File types to check (None for all)
+            
+        Returns:
+            Drift problems keyed by file type (only types with problems)
+        """
+        drift = {}
+        for file_type in file_types or self.layout_config.file_names:
+            file_config = self.layout_config.get_file_config(file_type)
+            if not file_config:
+                continue
+            db_columns = self.db_service.get_table_columns(file_config.tableName)
+            problems = find_schema_drift(file_config, db_columns)
+            if problems:
+                drift[file_type] = problems
+        return drift
+    
     def load_file(
         self,
         file_type: str,
         truncate: bool = True,
-        max_records: Optional[int] = None
+        max_records: Optional[int] = None,
+        check_schema: bool = True,
+        collect_stats: bool = False,
+        resume: bool = False,
+        cluster: bool = False,
+        check_integrity: bool = False,
+        dedup: Optional[str] = None,
+        reconcile: bool = False,
+        export_totals: Optional[Path] = None,
+        sample: Optional[PropertySample] = None
     ) -> Dict[str, Any]:
         """
         Load a single file type into the database.
         
+        Progress is checkpointed (byte offset, line number, rows loaded) in
+        the same transaction as the rows every CHECKPOINT_EVERY_BATCHES
+        batches. With ``resume``, an unfinished load continues from its last
+        checkpoint instead of truncating, so no row is loaded twice.
+        
+        With ``cluster``, files that have a ``clusterKey`` are inserted in
+        key order: the file is scanned to verify it is already sorted,
+        otherwise it is external-sorted first. The backend then builds
+        range (BRIN) indexes that rely on that physical order.
+        
+        With ``check_integrity``, parent files (INFO) collect their keys in
+        a bitset while loading, and child records whose ``references`` point
+        to a missing parent are counted, written to a quarantine file and
+        left out of the table.
+        
+        With ``dedup``, files with a ``primaryKey`` are written with
+        INSERT ... ON CONFLICT, so repeated keys no longer fail whole
+        batches. Repeats are also detected in-stream (bounded by
+        DEDUP_WINDOW_KEYS) and reported; the 'first' policy drops them
+        before they reach the database, 'last' lets them overwrite.
+        Duplicates are counted from those in-stream hits and the rows the
+        database skipped on conflict, without scanning the table; under
+        'last', repeats outside the window overwrite uncounted.
+        
+        With ``reconcile``, files with a ``totals`` spec (ENTITY_INFO) sum
+        their values per group while streaming and compare the sums with
+        the totals file (ENTITY_TOTALS) and, if given, the export totals
+        report, without querying the loaded table. Rows the database
+        rejects are taken back out of the sums. Only complete,
+        non-resumed loads are reconciled; under ``dedup='last'`` repeated
+        keys are counted once per occurrence.
+        
+        With ``sample``, INFO and the files referencing it keep only the
+        sampled properties (lines are filtered before parsing), so a
+        development load stays consistent across tables. Reference tables
+        load in full.
+        
         Args:
             file_type: File type name (e.g., 'INFO', 'ENTITY')
             truncate: Whether to truncate table before loading
             max_records: Maximum records to load (None for all)
+            check_schema: Fail before touching the table if it has drifted
+                from the layout
+            collect_stats: Profile every column while parsing and persist
+                the statistics with the load log entry
+            resume: Continue from the last checkpoint; tables whose last
+                load succeeded are skipped
+            cluster: Insert rows in ``clusterKey`` order
+            check_integrity: Quarantine child records with missing parents
+            dedup: Duplicate primary key policy, 'first' or 'last' (None
+                for plain inserts)
+            reconcile: Reconcile per-group totals after the load
+            export_totals: JSON of expected totals from the export totals
+                report (see ``read_export_totals``)
+            sample: Property sample to load instead of every record
             
         Returns:
             Dict with load results
@@ -72,6 +340,12 @@ class DataLoader:
             "records_loaded": 0,
             "error": None
         }
+        file_name = f"{self.file_prefix}{file_type}.TXT"
+        file_config = None
+        stats = None
+        load_id = None
+        sort_dir = None
+        quarantine = None
         
         try:
             # Get file configuration
@@ -82,58 +356,461 @@ class DataLoader:
             # Build file path
             file_path = get_file_path(
                 self.data_dir,
-                self.layout_config.filePrefix,
+                self.file_prefix,
                 file_type
             )
             
             if not file_path.exists():
                 raise FileNotFoundError(f"Data file not found: {file_path}")
             
-            # Truncate if requested
-            if truncate:
-                self.db_service.truncate_table(file_config.tableName)
+            if check_schema:
+                problems = find_schema_drift(
+                    file_config,
+                    self.db_service.get_table_columns(file_config.tableName)
+                )
+                if problems:
+                    raise SchemaDriftError(
+                        f"Schema drift in {file_config.tableName}: " + "; ".join(problems)
+                    )
+            
+            file_size = file_path.stat().st_size
+            clustered = cluster and bool(file_config.clusterKey)
+            needs_sort = False
+            source_name = file_name
+            if clustered:
+                unsorted_line = find_unsorted_line(file_path, file_config)
+                needs_sort = unsorted_line is not None
+                result["clustered"] = "sorted" if needs_sort else "presorted"
+                if needs_sort:
+                    logger.info(
+                        f"{file_type} is not in {', '.join(file_config.clusterKey)} order "
+                        f"(line {unsorted_line:,}); sorting before load"
+                    )
+                    # Checkpoint offsets refer to the sorted copy, not the source
+                    source_name = f"{file_name}#sorted"
+            
+            line_filter = sample.line_filter(file_config) if sample else None
+            if line_filter is not None:
+                result["sample"] = str(sample)
+                # A checkpoint of another sample must not be resumed
+                source_name = f"{source_name}#{sample}"
+            
+            checkpoint = None
+            if resume:
+                checkpoint = self._resume_checkpoint(file_config.tableName, source_name, file_size)
+                if checkpoint is None and (
+                    self.db_service.get_last_load_status(file_config.tableName) == "SUCCESS"
+                ):
+                    logger.info(f"Skipping {file_type}: last load succeeded")
+                    result["status"] = "SKIPPED"
+                    result["duration_seconds"] = 0.0
+                    return result
+            
+            progress = ReadProgress()
+            records_before = 0
+            if checkpoint:
+                load_id = checkpoint["load_id"]
+                progress = ReadProgress(checkpoint["byte_offset"], checkpoint["line_num"])
+                records_before = checkpoint["records_loaded"]
+                result["resumed_from_line"] = checkpoint["line_num"]
+            else:
+                # Truncate if requested
+                if truncate:
+                    self.db_service.truncate_table(file_config.tableName)
+                self.db_service.clear_checkpoint(file_config.tableName)
+                load_id = self.db_service.start_data_load(file_name, file_config.tableName)
+                if clustered and not truncate:
+                    logger.warning(
+                        f"Appending to {file_config.tableName}: physical order is only "
+                        f"guaranteed for the rows of this load"
+                    )
+            
+            read_path = file_path
+            if needs_sort:
+                # Sorting is deterministic, so a resumed load rebuilds the same copy
+                sort_dir = tempfile.TemporaryDirectory(prefix="cad_sort_")
+                read_path = Path(sort_dir.name) / file_path.name
+                external_sort(
+                    file_path, file_config, read_path, CLUSTER_SORT_MEMORY_MB * 1024 * 1024
+                )
+            
+            if collect_stats:
+                stats = FileStats(file_config)
+            
+            checks = []
+            orphan_check = None
+            collector = None
+            if check_integrity:
+                if file_config.references:
+                    quarantine_path = QUARANTINE_DIR / f"{file_name}.orphans"
+                    quarantine_path.parent.mkdir(parents=True, exist_ok=True)
+                    quarantine = open(
+                        quarantine_path, "a" if checkpoint else "w",
+                        encoding=self.layout_config.encoding, newline=""
+                    )
+                    orphan_check = OrphanCheck(
+                        file_config,
+                        {
+                            column: self._parent_key_set(reference)
+                            for column, reference in file_config.references.items()
+                        },
+                        quarantine
+                    )
+                    checks.append(orphan_check)
+            
+            deduplicator = None
+            on_conflict = dedup if file_config.primaryKey else None
+            if on_conflict:
+                deduplicator = KeyDeduplicator(file_config, on_conflict, DEDUP_WINDOW_KEYS)
+                checks.append(deduplicator)
+            
+            if check_integrity:
+                key_columns = referenced_keys(self.layout_config).get(file_type)
+                if key_columns:
+                    collector = KeyCollector(file_config, key_columns)
+                    checks.append(collector)
+            
+            accumulator = None
+            if reconcile and file_config.totals:
+                if checkpoint or max_records or line_filter:
+                    logger.info(f"Not reconciling {file_type}: only part of the file is loaded")
+                else:
+                    # Last, so records dropped by the other checks are not counted
+                    accumulator = GroupTotals(file_config)
+                    checks.append(accumulator)
+            
+            def record_check(line: str, record: tuple) -> bool:
+                return all(check(line, record) for check in checks)
             
             # Read and insert records using streaming
             records_gen = read_fixed_width_file(
-                file_path,
+                read_path,
                 file_config,
                 self.layout_config.encoding,
-                max_records=max_records
+                max_records=max_records,
+                record_format="tuple",
+                stats=stats,
+                progress=progress,
+                record_check=record_check if checks else None,
+                line_filter=line_filter
             )
             
+            def save_checkpoint(cur, rows_inserted: int) -> None:
+                self.db_service.write_checkpoint(cur, file_config.tableName, {
+                    "load_id": load_id,
+                    "file_name": source_name,
+                    "file_size": file_size,
+                    "byte_offset": progress.byte_offset,
+                    "line_num": progress.line_num,
+                    "records_loaded": records_before + rows_inserted,
+                })
+            
+            self.db_service.prepare_load(file_config)
             records_loaded = self.db_service.insert_records_streaming(
                 records_gen,
                 file_config,
-                batch_size=BATCH_SIZE
+                checkpoint=save_checkpoint if load_id is not None else None,
+                on_conflict=on_conflict,
+                # Rows the database rejected were counted when they were parsed
+                on_skip=accumulator.remove if accumulator is not None else None
             )
+            result["batching"] = self.db_service.last_batch_metrics
+            self.db_service.finalize_load(file_config, clustered=clustered)
+            self.db_service.clear_checkpoint(file_config.tableName)
+            
+            if on_conflict:
+                # Repeats dropped in-stream ('first') or passed through to
+                # overwrite ('last'), plus rows ON CONFLICT DO NOTHING left out
+                result["duplicates"] = deduplicator.duplicates + self.db_service.last_conflicts
+                if on_conflict == "last":
+                    # Each repeat seen in-stream replaced a row instead of adding one
+                    records_loaded -= deduplicator.duplicates
+                result["duplicate_samples"] = deduplicator.samples
+                if result["duplicates"]:
+                    logger.warning(
+                        f"{file_type}: {result['duplicates']:,} duplicate primary keys "
+                        f"({on_conflict} wins), e.g. {deduplicator.samples[:3]}"
+                    )
             
             result["status"] = "SUCCESS"
-            result["records_loaded"] = records_loaded
+            result["records_loaded"] = records_before + records_loaded
+            
+            if collector is not None and checkpoint is None:
+                # A resumed load saw only part of the file; rescan it when needed
+                for column, keys in collector.keys.items():
+                    self._parent_keys[f"{file_type}.{column}"] = keys
+            if accumulator is not None:
+                result["reconciliation"] = self._reconcile(file_config, accumulator, export_totals)
+            if orphan_check is not None:
+                result["orphans"] = orphan_check.orphans
+                if orphan_check.rejected:
+                    result["quarantine_file"] = quarantine.name
+                    logger.warning(
+                        f"Quarantined {orphan_check.rejected:,} orphan {file_type} records "
+                        f"({orphan_check.orphans}) to {quarantine.name}"
+                    )
             
         except Exception as e:
             logger.error(f"Error loading {file_type}: {e}")
             result["error"] = str(e)
+        finally:
+            if sort_dir is not None:
+                sort_dir.cleanup()
+            if quarantine is not None:
+                quarantine.close()
+                if checkpoint is None and (orphan_check is None or not orphan_check.rejected):
+                    Path(quarantine.name).unlink()
         
         # Calculate duration
         duration = (datetime.now() - start_time).total_seconds()
         result["duration_seconds"] = duration
         
+        if stats is not None:
+            result["drift_warnings"] = stats.drift_warnings()
+            for warning in result["drift_warnings"]:
+                logger.warning(f"Layout drift in {file_type}: {warning}")
+        
         # Log to database
-        self.db_service.log_data_load(
-            file_name=f"{self.layout_config.filePrefix}{file_type}.TXT",
+        load_id = self.db_service.log_data_load(
+            file_name=file_name,
             table_name=file_config.tableName if file_config else file_type,
             records_loaded=result["records_loaded"],
             status=result["status"],
-            error_message=result.get("error")
+            error_message=result.get("error"),
+            load_id=load_id
         )
+        result["load_id"] = load_id
+        
+        if stats is not None and load_id is not None:
+            self.db_service.save_column_stats(load_id, file_config.tableName, stats.summary())
+        
+        return result
+    
+    def build_features(
+        self,
+        file_type: str = "IMPROVEMENT_DETAIL_ATTR",
+        check_schema: bool = True,
+        sample: Optional[PropertySample] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the wide table of a file's ``pivot`` spec (property_features).
+        
+        The attribute file and the files its columns are taken from are
+        read from the data directory in (prop_id, tax_year) order (unsorted
+        files are external-sorted first) and merge-joined, so memory holds
+        one property's rows at a time. The table is rebuilt from scratch.
+        
+        Args:
+            file_type: Attribute file type with a ``pivot`` spec
+            check_schema: Fail before touching the table if it has drifted
+                from the spec
+            sample: Keep only the feature rows of sampled properties
+            
+        Returns:
+            Dict with load results, plus ``unparsed`` value counts by column
+            and the most common ``unmapped`` attribute codes
+        """
+        start_time = datetime.now()
+        result = {
+            "file_type": file_type,
+            "status": "FAILED",
+            "records_loaded": 0,
+            "error": None
+        }
+        file_name = f"{self.file_prefix}{file_type}.TXT"
+        file_config = None
+        load_id = None
         
+        try:
+            pivot = FeaturePivot(self.layout_config, file_type)
+            file_config = pivot.file_config
+            result["file_type"] = file_config.fileName
+            
+            paths = {}
+            for source_type in [file_type] + pivot.source_types:
+                path = get_file_path(self.data_dir, self.file_prefix, source_type)
+                if path.exists():
+                    paths[source_type] = path
+            if file_type not in paths:
+                raise FileNotFoundError(f"Data file not found: {self.data_dir / file_name}")
+            
+            if check_schema:
+                problems = find_schema_drift(
+                    file_config,
+                    self.db_service.get_table_columns(file_config.tableName)
+                )
+                if problems:
+                    raise SchemaDriftError(
+                        f"Schema drift in {file_config.tableName}: " + "; ".join(problems)
+                    )
+            
+            self.db_service.truncate_table(file_config.tableName)
+            load_id = self.db_service.start_data_load(file_name, file_config.tableName)
+            self.db_service.prepare_load(file_config)
+            with tempfile.TemporaryDirectory(prefix="cad_features_") as work_dir:
+                records_loaded = self.db_service.insert_records_streaming(
+                    pivot.rows(
+                        paths, Path(work_dir), CLUSTER_SORT_MEMORY_MB * 1024 * 1024, sample
+                    ),
+                    file_config
+                )
+            result["batching"] = self.db_service.last_batch_metrics
+            self.db_service.finalize_load(file_config, clustered=True)
+            
+            result["status"] = "SUCCESS"
+            result["records_loaded"] = records_loaded
+            if sample is not None:
+                result["sample"] = str(sample)
+            result["unparsed"] = dict(pivot.unparsed)
+            result["unmapped"] = pivot.unmapped.most_common(10)
+            for column, count in pivot.unparsed.items():
+                logger.warning(f"{file_config.tableName}.{column}: {count:,} values did not convert")
+            if pivot.unmapped:
+                logger.info(
+                    f"{len(pivot.unmapped):,} attribute codes are not pivoted, most common: "
+                    + ", ".join(f"{code} ({count:,})" for code, count in result["unmapped"])
+                )
+            
+        except Exception as e:
+            logger.error(f"Error building {result['file_type']}: {e}")
+            result["error"] = str(e)
+        
+        result["duration_seconds"] = (datetime.now() - start_time).total_seconds()
+        result["load_id"] = self.db_service.log_data_load(
+            file_name=file_name,
+            table_name=file_config.tableName if file_config else result["file_type"],
+            records_loaded=result["records_loaded"],
+            status=result["status"],
+            error_message=result.get("error"),
+            load_id=load_id
+        )
         return result
     
+    def _parent_key_set(self, reference: str) -> KeySet:
+        """
+        Get the key set of a referenced parent column.
+        
+        Keys collected while the parent loaded in this run are reused;
+        otherwise the parent data file is scanned once.
+        
+        Args:
+            reference: ``FILE.column`` reference
+            
+        Returns:
+            Parent key set
+        """
+        if reference not in self._parent_keys:
+            file_type, column = parse_reference(reference)
+            self._parent_keys[reference] = scan_keys(
+                get_file_path(self.data_dir, self.file_prefix, file_type),
+                self.layout_config.get_file_config(file_type),
+                column
+            )
+        return self._parent_keys[reference]
+    
+    def _reconcile(
+        self,
+        file_config: FileConfig,
+        accumulator: GroupTotals,
+        export_totals: Optional[Path] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare totals accumulated during a load with the expected totals.
+        
+        Args:
+            file_config: Loaded file configuration with a ``totals`` spec
+            accumulator: Totals accumulated while the file streamed
+            export_totals: Optional JSON of expected totals
+            
+        Returns:
+            Dict with groups, sources checked and discrepancies
+        """
+        spec = file_config.totals
+        actual = accumulator.totals()
+        sources = []
+        discrepancies = []
+        
+        totals_path = get_file_path(self.data_dir, self.file_prefix, spec["file"])
+        if totals_path.exists():
+            expected = read_totals_file(
+                totals_path,
+                self.layout_config.get_file_config(spec["file"]),
+                self.layout_config.encoding,
+                spec["match"]
+            )
+            discrepancies.extend(find_discrepancies(actual, expected, spec["file"]))
+            sources.append(spec["file"])
+        else:
+            logger.warning(f"Cannot reconcile against {spec['file']}: {totals_path} not found")
+        
+        if export_totals:
+            discrepancies.extend(find_discrepancies(
+                actual, read_export_totals(export_totals), export_totals.name, partial=True
+            ))
+            sources.append(export_totals.name)
+        
+        for item in discrepancies[:10]:
+            logger.warning(
+                f"{file_config.fileName} {spec['groupBy']}={item['group']} {item['measure']}: "
+                f"{item['actual']:,} loaded vs {item['expected']:,} in {item['source']} "
+                f"({item['difference']:+,})"
+            )
+        if sources and not discrepancies:
+            logger.info(
+                f"{file_config.fileName} totals for {len(actual):,} {spec['groupBy']} "
+                f"values match {', '.join(sources)}"
+            )
+        return {
+            "groups": len(actual),
+            "sources": sources,
+            "discrepancies": discrepancies
+        }
+    
+    def _resume_checkpoint(
+        self,
+        table_name: str,
+        file_name: str,
+        file_size: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a checkpoint that is safe to resume from.
+        
+        Args:
+            table_name: Target table
+            file_name: Source file name being loaded
+            file_size: Current size of the source file
+            
+        Returns:
+            Checkpoint dict, or None if there is none or the source changed
+        """
+        checkpoint = self.db_service.get_checkpoint(table_name)
+        if not checkpoint:
+            return None
+        if checkpoint["file_name"] != file_name or checkpoint["file_size"] != file_size:
+            logger.warning(
+                f"Ignoring checkpoint for {table_name}: source file changed since it was written"
+            )
+            return None
+        logger.info(
+            f"Resuming {table_name} from line {checkpoint['line_num']:,} "
+            f"({checkpoint['records_loaded']:,} records already loaded)"
+        )
+        return checkpoint
+    
     def load_all_files(
         self,
         truncate: bool = True,
         file_types: Optional[List[str]] = None,
-        max_records: Optional[int] = None
+        max_records: Optional[int] = None,
+        collect_stats: bool = False,
+        resume: bool = False,
+        cluster: bool = False,
+        check_integrity: bool = False,
+        dedup: Optional[str] = None,
+        reconcile: bool = False,
+        export_totals: Optional[Path] = None,
+        features: bool = False,
+        sample: Optional[PropertySample] = None
     ) -> List[Dict[str, Any]]:
         """
         Load all configured file types.
@@ -142,6 +819,18 @@ class DataLoader:
             truncate: Whether to truncate tables before loading
             file_types: Specific file types to load (None for all)
             max_records: Maximum records per file (None for all)
+            collect_stats: Profile columns while parsing each file
+            resume: Continue unfinished loads from their checkpoints
+            cluster: Insert files with a ``clusterKey`` in key order
+            check_integrity: Quarantine child records with missing parents
+            dedup: Duplicate primary key policy for files with a
+                ``primaryKey`` ('first', 'last' or None)
+            reconcile: Reconcile per-group totals of files with a ``totals``
+                spec
+            export_totals: JSON of expected totals from the export totals
+                report
+            features: Build property_features after the files are loaded
+            sample: Property sample to load instead of every record
             
         Returns:
             List of load results
@@ -190,11 +879,21 @@ class DataLoader:
             result = self.load_file(
                 file_type,
                 truncate=truncate,
-                max_records=max_records
+                max_records=max_records,
+                collect_stats=collect_stats,
+                resume=resume,
+                cluster=cluster,
+                check_integrity=check_integrity,
+                dedup=dedup,
+                reconcile=reconcile,
+                export_totals=export_totals,
+                sample=sample
             )
             results.append(result)
             
-            if result["status"] == "SUCCESS":
+            if result["status"] == "SKIPPED":
+                logger.info(f"Skipped {file_type}: already loaded")
+            elif result["status"] == "SUCCESS":
                 logger.info(
                     f"Loaded {result['records_loaded']} records "
                     f"in {result['duration_seconds']:.2f}s"
@@ -202,6 +901,12 @@ class DataLoader:
             else:
                 logger.warning(f"Failed to load {file_type}: {result['error']}")
         
+        if features:
+            result = self.build_features(sample=sample)
+            results.append(result)
+            if result["status"] == "SUCCESS":
+                logger.info(f"Built {result['records_loaded']} property feature rows")
+        
         return results
     
     def get_available_files(self) -> List[str]:
@@ -211,7 +916,7 @@ class DataLoader:
         Returns:
             List of file type names found in data directory
         """
-        return discover_data_files(self.data_dir, self.layout_config.filePrefix)
+        return discover_data_files(self.data_dir, self.file_prefix)
     
     def get_load_summary(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -232,5 +937,13 @@ class DataLoader:
             "failed": len(failed),
             "total_records": sum(r["records_loaded"] for r in successful),
             "total_duration": sum(r.get("duration_seconds", 0) for r in results),
-            "failed_files": [r["file_type"] for r in failed]
+            "failed_files": [r["file_type"] for r in failed],
+            "drift_warnings": {
+                r["file_type"]: r["drift_warnings"]
+                for r in results if r.get("drift_warnings")
+            },
+            "reconciliation": {
+                r["file_type"]: r["reconciliation"]["discrepancies"]
+                for r in results if r.get("reconciliation")
+            }
         }
@@ -0,0 +1,317 @@
+"""In-memory property lookup indexes with response caching and latency metrics."""
+
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import re
+import sys
+import time
+
+from app.services.storage import StorageBackend
+
+
+logger = logging.getLogger("cad_loader")
+
+PROPERTY_FIELDS = [
+    "prop_id", "prop_val_yr", "owner_id", "owner_name", "mail_addr_line1", "mail_addr_line2",
+    "mail_city", "mail_state", "mail_zip", "situs_street", "situs_city", "situs_zip",
+    "legal_desc", "abs_subdv_cd",
+]
+
+ENTITY_FIELDS = ["tax_year", "entity_id", "entity_cd", "entity_name", "taxable_val", "assessed_val"]
+
+# Columns repeated across many parcels; interning stores each distinct value once
+_INTERNED = {"mail_city", "mail_state", "mail_zip", "situs_city", "situs_zip", "abs_subdv_cd"}
+
+_STREET_SUFFIXES = {
+    "STREET": "ST", "DRIVE": "DR", "AVENUE": "AVE", "LANE": "LN", "ROAD": "RD",
+    "BOULEVARD": "BLVD", "COURT": "CT", "CIRCLE": "CIR", "PLACE": "PL", "TRAIL": "TRL",
+    "PARKWAY": "PKWY", "HIGHWAY": "HWY",
+}
+_NON_WORD = re.compile(r"[^A-Z0-9 ]+")
+
+# Latency samples kept per endpoint for percentiles
+_LATENCY_SAMPLES = 10000
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """
+    Normalize an owner name for prefix search.
+
+    Args:
+        text: Raw name
+
+    Returns:
+        Upper case words without punctuation, separated by single spaces
+    """
+    return " ".join(_NON_WORD.sub(" ", (text or "").upper()).split())
+
+
+def normalize_address(text: Optional[str]) -> str:
+    """
+    Normalize a situs address for prefix search.
+
+    Like ``normalize_name``, with street suffixes abbreviated
+    (``DRIVE`` -> ``DR``).
+
+    Args:
+        text: Raw address
+
+    Returns:
+        Normalized address
+    """
+    return " ".join(_STREET_SUFFIXES.get(word, word) for word in normalize_name(text).split())
+
+
+class PrefixIndex:
+    """
+    Sorted index of normalized keys supporting prefix search.
+
+    Keys and record positions are kept in two parallel sorted lists, and
+    a search is a binary search followed by a short forward scan.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, int]]):
+        """
+        Build the index.
+
+        Args:
+            entries: (normalized key, record position) pairs; empty keys are skipped
+        """
+        pairs = sorted(entry for entry in entries if entry[0])
+        self.keys = [key for key, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def search(self, prefix: str, limit: int) -> List[int]:
+        """
+        Find records whose key starts with a prefix.
+
+        Args:
+            prefix: Normalized prefix
+            limit: Maximum number of positions returned
+
+        Returns:
+            Record positions in key order
+        """
+        if not prefix:
+            return []
+        found = []
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and len(found) < limit and self.keys[i].startswith(prefix):
+            found.append(self.positions[i])
+            i += 1
+        return found
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class LatencyTracker:
+    """Recent request latencies per endpoint, for p50/p99 reporting."""
+
+    def __init__(self, samples: int = _LATENCY_SAMPLES):
+        """
+        Initialize the tracker.
+
+        Args:
+            samples: Latencies kept per endpoint
+        """
+        self.samples = samples
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.lock = Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Record one request's latency."""
+        with self.lock:
+            if endpoint not in self.latencies:
+                self.latencies[endpoint] = deque(maxlen=self.samples)
+                self.counts[endpoint] = 0
+            self.latencies[endpoint].append(seconds)
+            self.counts[endpoint] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize latencies.
+
+        Returns:
+            Request count and p50/p99/max in milliseconds, keyed by endpoint
+        """
+        with self.lock:
+            snapshot = {endpoint: sorted(values) for endpoint, values in self.latencies.items()}
+            counts = dict(self.counts)
+        summary = {}
+        for endpoint, values in snapshot.items():
+            summary[endpoint] = {
+                "requests": counts[endpoint],
+                "p50_ms": round(values[int(0.50 * (len(values) - 1))] * 1000, 3),
+                "p99_ms": round(values[int(0.99 * (len(values) - 1))] * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        return summary
+
+
+class PropertyLookup:
+    """
+    Read-only property lookups served from memory.
+
+    At startup parcels and their entity values are read once from the
+    database (two streamed queries) into tuples; prop_id is a dict, owner
+    names and situs addresses are ``PrefixIndex``es. Responses are
+    serialized JSON cached in an LRU cache, so repeated lookups skip both
+    the index and serialization.
+    """
+
+    def __init__(self, storage: StorageBackend, schema: str = "cad", cache_size: int = 10000):
+        """
+        Load parcels and build the indexes.
+
+        Args:
+            storage: Storage backend holding the loaded tables
+            schema: Database schema
+            cache_size: Responses kept in the LRU cache
+        """
+        start = time.perf_counter()
+        self.records: List[Tuple[Any, ...]] = []
+        self.by_prop_id: Dict[int, int] = {}
+        interned = [i for i, name in enumerate(PROPERTY_FIELDS) if name in _INTERNED]
+        columns = ", ".join(PROPERTY_FIELDS)
+        for row in storage.iter_query(
+            f"SELECT {columns} FROM {schema}.appraisal_info ORDER BY prop_id, prop_val_yr"
+        ):
+            row = list(row)
+            for i in interned:
+                if isinstance(row[i], str):
+                    row[i] = sys.intern(row[i].strip())
+            position = self.by_prop_id.get(row[0])
+            if position is None:
+                self.by_prop_id[row[0]] = len(self.records)
+                self.records.append(tuple(row))
+            else:
+                # Ordered by value year, so the latest year wins
+                self.records[position] = tuple(row)
+
+        self.entities: Dict[int, Tuple[Tuple[Any, ...], ...]] = {}
+        columns = ", ".join(ENTITY_FIELDS)
+        current, rows = None, []
+        for row in storage.iter_query(
+            f"SELECT prop_id, {columns} FROM {schema}.appraisal_entity_info "
+            f"ORDER BY prop_id, tax_year, entity_id"
+        ):
+            if row[0] != current:
+                if rows:
+                    self.entities[current] = tuple(rows)
+                current, rows = row[0], []
+            rows.append(tuple(
+                sys.intern(value.strip()) if isinstance(value, str) else value
+                for value in row[1:]
+            ))
+        if rows:
+            self.entities[current] = tuple(rows)
+
+        owner = PROPERTY_FIELDS.index("owner_name")
+        street = PROPERTY_FIELDS.index("situs_street")
+        city = PROPERTY_FIELDS.index("situs_city")
+        self.owner_index = PrefixIndex(
+            (normalize_name(record[owner]), i) for i, record in enumerate(self.records)
+        )
+        self.address_index = PrefixIndex(
+            (normalize_address(f"{record[street] or ''} {record[city] or ''}"), i)
+            for i, record in enumerate(self.records)
+        )
+
+        self.latency = LatencyTracker()
+        self.cached_response = lru_cache(maxsize=cache_size)(self._response)
+        self.load_seconds = time.perf_counter() - start
+        logger.info(
+            f"Indexed {len(self.records):,} parcels and {len(self.entities):,} entity value "
+            f"sets in {self.load_seconds:.1f}s"
+        )
+
+    def _property(self, position: int, with_entities: bool = True) -> Dict[str, Any]:
+        """Build the response dict of one parcel."""
+        record = dict(zip(PROPERTY_FIELDS, self.records[position]))
+        for name in ("owner_name", "situs_street", "legal_desc", "mail_addr_line1", "mail_addr_line2"):
+            if isinstance(record[name], str):
+                record[name] = " ".join(record[name].split())
+        if with_entities:
+            record["entities"] = [
+                dict(zip(ENTITY_FIELDS, row)) for row in self.entities.get(record["prop_id"], ())
+            ]
+        return record
+
+    def _response(self, kind: str, query: str, limit: int) -> Tuple[int, bytes]:
+        """
+        Build a serialized response (wrapped in the LRU cache).
+
+        Args:
+            kind: 'property', 'owner' or 'address'
+            query: prop_id or search text
+            limit: Maximum search results
+
+        Returns:
+            Tuple of (HTTP status, JSON body)
+        """
+        if kind == "property":
+            try:
+                position = self.by_prop_id.get(int(query))
+            except ValueError:
+                return 400, json.dumps({"error": f"Invalid prop_id: {query}"}).encode()
+            if position is None:
+                return 404, json.dumps({"error": f"prop_id {query} not found"}).encode()
+            return 200, json.dumps(self._property(position), default=str).encode()
+
+        if kind == "owner":
+            positions = self.owner_index.search(normalize_name(query), limit)
+        else:
+            positions = self.address_index.search(normalize_address(query), limit)
+        results = [self._property(position, with_entities=False) for position in positions]
+        return 200, json.dumps({"query": query, "count": len(results), "results": results},
+                               default=str).encode()
+
+    def lookup(self, kind: str, query: str, limit: int = 20) -> Tuple[int, bytes]:
+        """
+        Answer a lookup and record its latency.
+
+        Args:
+            kind: 'property' (by prop_id), 'owner' (name prefix) or
+                'address' (situs address prefix)
+            query: prop_id or search text
+            limit: Maximum search results
+
+        Returns:
+            Tuple of (HTTP status, JSON body)
+        """
+        start = time.perf_counter()
+        try:
+            return self.cached_response(kind, query.strip(), limit)
+        finally:
+            self.latency.record(kind, time.perf_counter() - start)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get index sizes, cache statistics and latency percentiles.
+
+        Returns:
+            Metrics dict
+        """
+        cache = self.cached_response.cache_info()
+        lookups = cache.hits + cache.misses
+        return {
+            "parcels": len(self.records),
+            "owner_keys": len(self.owner_index),
+            "address_keys": len(self.address_index),
+            "load_seconds": round(self.load_seconds, 2),
+            "cache": {
+                "size": cache.currsize,
+                "max_size": cache.maxsize,
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "hit_rate": round(cache.hits / lookups, 3) if lookups else 0.0,
+            },
+            "latency": self.latency.summary(),
+        }
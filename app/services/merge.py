@@ -0,0 +1,70 @@
+"""Streaming group-by and merge-join of record streams sorted by a key."""
+
+from itertools import groupby
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+
+# Marks an exhausted stream in merge_groups
+_DONE = object()
+
+
+def group_by_key(
+    records: Iterable[Any],
+    key: Callable[[Any], Hashable],
+    name: str = "stream"
+) -> Iterator[Tuple[Hashable, List[Any]]]:
+    """
+    Group consecutive records of a stream sorted by key.
+
+    Only one group is held in memory at a time.
+
+    Args:
+        records: Records in ascending key order
+        key: Function extracting the key from a record
+        name: Stream name used in error messages
+
+    Yields:
+        Tuples of (key, records with that key)
+
+    Raises:
+        ValueError: If a key is smaller than the one before it
+    """
+    previous = None
+    for group_key, group in groupby(records, key=key):
+        if previous is not None and group_key < previous:
+            raise ValueError(f"{name} is not sorted: key {group_key} follows {previous}")
+        previous = group_key
+        yield group_key, list(group)
+
+
+def merge_groups(
+    *streams: Iterable[Tuple[Hashable, Any]]
+) -> Iterator[Tuple[Hashable, List[Optional[Any]]]]:
+    """
+    Full outer merge-join of keyed streams sorted by the same key.
+
+    Runs in a single pass over every stream, holding one item per stream.
+    Keys must be unique within each stream.
+
+    Args:
+        *streams: (key, item) pairs in ascending key order, e.g. outputs
+            of ``group_by_key``
+
+    Yields:
+        Tuples of (key, [item from each stream, or None if it lacks the key])
+    """
+    iterators = [iter(stream) for stream in streams]
+    heads = [next(it, _DONE) for it in iterators]
+    while True:
+        keys = [head[0] for head in heads if head is not _DONE]
+        if not keys:
+            return
+        current = min(keys)
+        groups: List[Optional[Any]] = []
+        for i, head in enumerate(heads):
+            if head is not _DONE and head[0] == current:
+                groups.append(head[1])
+                heads[i] = next(iterators[i], _DONE)
+            else:
+                groups.append(None)
+        yield current, groups
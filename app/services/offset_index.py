@@ -0,0 +1,306 @@
+"""Sidecar prop_id -> byte offset indexes for random access into raw export files."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+
+from app.models.layout import FileConfig
+from app.services.file_reader import parse_line
+
+
+logger = logging.getLogger("cad_loader")
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+SPARSE = "sparse"
+FULL = "full"
+
+# Lines that do not parse a prop_id are left out of the index
+_UNPARSED = -1
+
+
+class StaleIndexError(ValueError):
+    """Raised when an index no longer matches its source file."""
+
+
+def index_path_for(file_path: Path, index_dir: Optional[Path] = None) -> Path:
+    """
+    Get the sidecar index path of a data file.
+
+    Args:
+        file_path: Data file
+        index_dir: Directory for indexes (next to the data file if None)
+
+    Returns:
+        Index file path
+    """
+    return (index_dir or file_path.parent) / (file_path.name + INDEX_SUFFIX)
+
+
+def _source_stamp(file_path: Path) -> Dict[str, int]:
+    """Size and modification time identifying a version of a source file."""
+    stat = file_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+@dataclass
+class OffsetIndex:
+    """
+    prop_id -> byte offset index of one data file.
+
+    A ``sparse`` index (files sorted by prop_id) keeps the first line of
+    every ``every``-line block and of the file; a lookup seeks to the last
+    entry before the prop_id and scans at most one block. A ``full`` index
+    (unsorted files) keeps every line, sorted by prop_id, and seeks to each
+    match directly.
+    """
+
+    source: Dict[str, Any]
+    mode: str
+    every: int
+    keys: array
+    offsets: array
+
+    def save(self, index_path: Path) -> None:
+        """
+        Write the index: a JSON header line followed by the key and offset arrays.
+
+        Args:
+            index_path: Index file path
+        """
+        header = {
+            "version": INDEX_VERSION,
+            "source": self.source,
+            "mode": self.mode,
+            "every": self.every,
+            "entries": len(self.keys),
+        }
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = index_path.with_name(index_path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            self.keys.tofile(f)
+            self.offsets.tofile(f)
+        # Readers never see a half-written index
+        temp_path.replace(index_path)
+
+    @classmethod
+    def load(cls, index_path: Path) -> "OffsetIndex":
+        """
+        Read an index written by ``save``.
+
+        Args:
+            index_path: Index file path
+
+        Returns:
+            OffsetIndex
+
+        Raises:
+            StaleIndexError: If the index was written by another version
+        """
+        with open(index_path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != INDEX_VERSION:
+                raise StaleIndexError(f"{index_path.name}: unsupported index version")
+            keys = array("q")
+            offsets = array("q")
+            keys.fromfile(f, header["entries"])
+            offsets.fromfile(f, header["entries"])
+        return cls(header["source"], header["mode"], header["every"], keys, offsets)
+
+    def is_current(self, file_path: Path) -> bool:
+        """Check that the source file is unchanged since the index was built."""
+        return self.source == _source_stamp(file_path)
+
+    def candidate_offsets(self, prop_id: int) -> Tuple[List[int], bool]:
+        """
+        Get the offsets to read for a prop_id.
+
+        Args:
+            prop_id: Property ID
+
+        Returns:
+            Tuple of (offsets, scan): with ``scan`` the single offset is a
+            starting point to read forward from; otherwise each offset is a
+            matching line
+        """
+        if self.mode == FULL:
+            start = bisect_left(self.keys, prop_id)
+            end = bisect_right(self.keys, prop_id)
+            return sorted(self.offsets[start:end]), False
+        # Entries are block starts, so the prop_id's first line is in the
+        # block of the last entry with a smaller key
+        i = bisect_left(self.keys, prop_id)
+        return [self.offsets[i - 1] if i else 0], True
+
+
+def _prop_id_bounds(file_config: FileConfig) -> Tuple[int, int]:
+    """Get the (start, end) slice of the prop_id column."""
+    for column, start, end in file_config.column_spans:
+        if column.name == "prop_id":
+            return start, end
+    raise KeyError(f"No prop_id column in {file_config.fileName}")
+
+
+def _line_prop_id(line: bytes, bounds: Tuple[int, int]) -> int:
+    """Parse the prop_id of a raw line."""
+    try:
+        return int(line[bounds[0]:bounds[1]])
+    except ValueError:
+        return _UNPARSED
+
+
+def build_offset_index(file_path: Path, file_config: FileConfig, every: int = 64) -> OffsetIndex:
+    """
+    Scan a data file and build its prop_id index.
+
+    Files in prop_id order get a sparse index; otherwise every line is
+    indexed. Only the prop_id is sliced from each line. Column positions
+    are treated as byte positions, as with the single-byte layout encoding.
+
+    Args:
+        file_path: Data file
+        file_config: File configuration with a prop_id column
+        every: Lines per sparse index entry (1 indexes every line)
+
+    Returns:
+        OffsetIndex
+    """
+    bounds = _prop_id_bounds(file_config)
+    source = _source_stamp(file_path)
+    keys = array("q")
+    offsets = array("q")
+    in_order = True
+    previous = None
+    line_count = 0
+    offset = 0
+
+    with open(file_path, "rb") as f:
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            prop_id = _line_prop_id(line, bounds)
+            if prop_id == _UNPARSED:
+                continue
+            if previous is not None and prop_id < previous:
+                in_order = False
+            previous = prop_id
+            keys.append(prop_id)
+            offsets.append(line_offset)
+            line_count += 1
+
+    if in_order and every > 1:
+        sparse_keys = array("q")
+        sparse_offsets = array("q")
+        for i in range(0, len(keys), every):
+            sparse_keys.append(keys[i])
+            sparse_offsets.append(offsets[i])
+        index = OffsetIndex(source, SPARSE, every, sparse_keys, sparse_offsets)
+    else:
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        index = OffsetIndex(
+            source, FULL, 1,
+            array("q", (keys[i] for i in order)),
+            array("q", (offsets[i] for i in order))
+        )
+    logger.info(
+        f"Indexed {file_path.name}: {line_count:,} lines, {len(index.keys):,} {index.mode} entries"
+    )
+    return index
+
+
+def open_offset_index(
+    file_path: Path,
+    file_config: FileConfig,
+    index_dir: Optional[Path] = None,
+    every: int = 64,
+    rebuild: bool = True
+) -> OffsetIndex:
+    """
+    Load a file's sidecar index, building it if missing or out of date.
+
+    Args:
+        file_path: Data file
+        file_config: File configuration with a prop_id column
+        index_dir: Directory for indexes (next to the data file if None)
+        every: Lines per sparse entry when the index is (re)built
+        rebuild: Rebuild a missing or stale index instead of raising
+
+    Returns:
+        OffsetIndex matching the current file
+
+    Raises:
+        StaleIndexError: If the index is missing or stale and ``rebuild``
+            is False
+    """
+    index_path = index_path_for(file_path, index_dir)
+    if index_path.exists():
+        try:
+            index = OffsetIndex.load(index_path)
+            if index.is_current(file_path):
+                return index
+            reason = "source file changed"
+        except (StaleIndexError, ValueError, EOFError) as e:
+            reason = str(e)
+    else:
+        reason = "no index"
+    if not rebuild:
+        raise StaleIndexError(f"{index_path.name}: {reason}")
+
+    logger.info(f"Building index for {file_path.name} ({reason})")
+    index = build_offset_index(file_path, file_config, every)
+    index.save(index_path)
+    return index
+
+
+def lookup_records(
+    file_path: Path,
+    file_config: FileConfig,
+    index: OffsetIndex,
+    prop_id: int,
+    encoding: str = "utf-8"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Read the records of one prop_id using an index.
+
+    Only the matching lines (plus at most one sparse block) are read and
+    parsed with ``parse_line``.
+
+    Args:
+        file_path: Data file the index was built from
+        file_config: File configuration
+        index: Current index of the file
+        prop_id: Property ID to fetch
+        encoding: File encoding
+
+    Yields:
+        Record dicts in file order
+
+    Raises:
+        StaleIndexError: If the file changed since the index was built
+    """
+    if not index.is_current(file_path):
+        raise StaleIndexError(f"Index of {file_path.name} is out of date")
+    bounds = _prop_id_bounds(file_config)
+    offsets, scan = index.candidate_offsets(prop_id)
+
+    with open(file_path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            for line in f:
+                if not line.strip():
+                    continue
+                current = _line_prop_id(line, bounds)
+                if current == prop_id:
+                    yield parse_line(line.decode(encoding, errors="replace"), file_config)
+                elif scan and current != _UNPARSED and current > prop_id:
+                    break
+                if not scan:
+                    break
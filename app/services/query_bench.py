@@ -0,0 +1,315 @@
+"""Query benchmark harness: timings, EXPLAIN plans and baseline regression checks."""
+
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import json
+import logging
+import re
+import time
+
+from app.services.storage import StorageBackend
+
+
+logger = logging.getLogger("cad_loader")
+
+# Section headers of the example SQL files, e.g. "-- 11. PROPERTIES BY CITY"
+_HEADER = re.compile(r"^--\s*(\d+)\.\s+(.+?)\s*$")
+
+
+@dataclass
+class BenchQuery:
+    """One benchmarked statement."""
+
+    name: str
+    sql: str
+
+
+def parse_sql_file(path: Path) -> List[BenchQuery]:
+    """
+    Split a SQL file into named statements.
+
+    Statements end with a semicolon at the end of a line. Each is named
+    after the file and the numbered section header above it (as in
+    ``sql/examples``), e.g. ``basic_queries/11_properties_by_city``.
+
+    Args:
+        path: SQL file
+
+    Returns:
+        Statements in file order
+    """
+    queries = []
+    section = None
+    lines: List[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        header = _HEADER.match(line)
+        if header and not lines:
+            slug = re.sub(r"[^a-z0-9]+", "_", header.group(2).lower()).strip("_")
+            section = f"{int(header.group(1)):02d}_{slug}"
+            continue
+        if line.strip().startswith("--") or (not lines and not line.strip()):
+            continue
+        lines.append(line)
+        if line.rstrip().endswith(";"):
+            name = f"{path.stem}/{section or len(queries) + 1}"
+            if any(query.name == name for query in queries):
+                name = f"{name}_{len(queries) + 1}"
+            queries.append(BenchQuery(name, "\n".join(lines).rstrip().rstrip(";")))
+            section = None
+            lines = []
+    return queries
+
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Walk an EXPLAIN (FORMAT JSON) plan tree depth-first."""
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def _node_label(node: Dict[str, Any]) -> str:
+    """Describe a plan node by its type, table and index."""
+    label = node["Node Type"]
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    return label
+
+
+def summarize_plan(explain: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) result to what is compared.
+
+    Args:
+        explain: Parsed EXPLAIN output
+
+    Returns:
+        Dict with the sorted plan ``nodes``, the tables read by
+        ``seq_scans``, buffer counts, timings and the full ``plan``
+    """
+    root = explain[0]
+    plan = root["Plan"]
+    nodes = [_node_label(node) for node in _plan_nodes(plan)]
+    return {
+        "nodes": sorted(nodes),
+        "seq_scans": sorted({
+            node["Relation Name"] for node in _plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan" and "Relation Name" in node
+        }),
+        "shared_hit_blocks": plan.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": plan.get("Shared Read Blocks", 0),
+        "planning_ms": root.get("Planning Time"),
+        "execution_ms": root.get("Execution Time"),
+        "plan": plan,
+    }
+
+
+def run_query(cur, query: BenchQuery, repeat: int) -> Dict[str, Any]:
+    """
+    Time a query and capture its plan.
+
+    The query runs once to warm the cache, then ``repeat`` times with the
+    rows fetched to the client; its median wall time is the latency. One
+    ``EXPLAIN (ANALYZE, BUFFERS)`` run then records the plan, since its
+    instrumentation inflates timings.
+
+    Args:
+        cur: Plain (not server-side) database cursor
+        query: Query to run
+        repeat: Timed runs
+
+    Returns:
+        Dict with ``median_ms``, ``min_ms``, ``rows`` and the plan summary
+    """
+    cur.execute(query.sql)
+    rows = len(cur.fetchall())
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(query.sql)
+        cur.fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}")
+    explain = cur.fetchone()[0]
+    if isinstance(explain, str):
+        explain = json.loads(explain)
+    return {
+        "median_ms": round(median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "rows": rows,
+        **summarize_plan(explain),
+    }
+
+
+def run_benchmark(
+    storage: StorageBackend,
+    queries: Sequence[BenchQuery],
+    repeat: int = 5,
+    tables: Sequence[str] = (),
+    timeout_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run every query and collect a benchmark run.
+
+    Each query runs in its own transaction, which is rolled back. A query
+    that fails (or times out) is recorded with its error and the rest
+    still run.
+
+    Args:
+        storage: PostgreSQL storage backend
+        queries: Queries to run
+        repeat: Timed runs per query
+        tables: Schema-qualified tables whose row counts describe the data set
+        timeout_ms: statement_timeout per query (None for no limit)
+
+    Returns:
+        Run dict with ``timestamp``, table ``row_counts`` and ``queries``
+    """
+    run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "row_counts": {},
+        "queries": {},
+    }
+    with storage.get_connection() as conn, closing(conn.cursor()) as cur:
+        for table in tables:
+            try:
+                cur.execute(f"SELECT COUNT(*) FROM {table}")
+                run["row_counts"][table] = cur.fetchone()[0]
+            except Exception as e:
+                logger.warning(f"Cannot count {table}: {str(e).strip()}")
+            finally:
+                conn.rollback()
+
+        for query in queries:
+            try:
+                if timeout_ms:
+                    cur.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+                result = run_query(cur, query, repeat)
+                logger.info(
+                    f"{query.name}: {result['median_ms']:.1f} ms, {result['rows']:,} rows"
+                    + (f", seq scan on {', '.join(result['seq_scans'])}" if result["seq_scans"] else "")
+                )
+            except Exception as e:
+                result = {"error": str(e).strip()}
+                logger.warning(f"{query.name}: {result['error']}")
+            finally:
+                conn.rollback()
+            run["queries"][query.name] = result
+    return run
+
+
+def compare_runs(
+    run: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_ms: float,
+    watch_tables: Sequence[str] = ()
+) -> List[Dict[str, str]]:
+    """
+    Compare a run with a baseline run.
+
+    A query regresses when its median time exceeds the baseline's by more
+    than ``threshold`` (a fraction) and by at least ``min_ms``, so noise on
+    very fast queries is ignored. Plan changes are reported separately; a
+    new sequential scan on a watched table is its own finding.
+
+    Args:
+        run: Current run
+        baseline: Baseline run
+        threshold: Allowed relative slowdown, e.g. 0.25 for 25%
+        min_ms: Smallest absolute slowdown reported
+        watch_tables: Tables whose new sequential scans are flagged
+
+    Returns:
+        Findings as dicts with ``query``, ``kind`` (latency, seq_scan,
+        plan, error or data) and ``detail``
+    """
+    findings = []
+    if run["row_counts"] != baseline.get("row_counts", {}):
+        findings.append({
+            "query": "*",
+            "kind": "data",
+            "detail": "table row counts differ from the baseline; timings may not be comparable",
+        })
+
+    for name, result in run["queries"].items():
+        before = baseline["queries"].get(name)
+        if before is None or "error" in before:
+            continue
+        if "error" in result:
+            findings.append({"query": name, "kind": "error", "detail": result["error"]})
+            continue
+
+        slower = result["median_ms"] - before["median_ms"]
+        if slower >= min_ms and result["median_ms"] > before["median_ms"] * (1 + threshold):
+            detail = f"{before['median_ms']:.1f} ms -> {result['median_ms']:.1f} ms"
+            if before["median_ms"]:
+                detail += f" (+{slower / before['median_ms']:.0%})"
+            findings.append({"query": name, "kind": "latency", "detail": detail})
+
+        new_scans = [
+            table for table in result["seq_scans"]
+            if table not in before["seq_scans"] and table in watch_tables
+        ]
+        if new_scans:
+            findings.append({
+                "query": name,
+                "kind": "seq_scan",
+                "detail": f"new sequential scan on {', '.join(new_scans)}",
+            })
+        if result["nodes"] != before["nodes"]:
+            added = sorted(set(result["nodes"]) - set(before["nodes"]))
+            removed = sorted(set(before["nodes"]) - set(result["nodes"]))
+            parts = []
+            if added:
+                parts.append(f"added {', '.join(added)}")
+            if removed:
+                parts.append(f"removed {', '.join(removed)}")
+            findings.append({
+                "query": name,
+                "kind": "plan",
+                "detail": "; ".join(parts) or "same node types, different counts",
+            })
+    return findings
+
+
+def read_history(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read the run history (one JSON run per line).
+
+    Args:
+        path: History file
+
+    Returns:
+        Runs, oldest first (empty if the file does not exist)
+    """
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latest_baseline(history: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Get the most recent run marked as a baseline."""
+    for run in reversed(history):
+        if run.get("baseline"):
+            return run
+    return None
+
+
+def append_history(path: Path, run: Dict[str, Any]) -> None:
+    """
+    Append a run to the history file.
+
+    Args:
+        path: History file
+        run: Run to append
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, default=str) + "\n")
@@ -0,0 +1,272 @@
+"""Query results as typed DataFrame chunks, and bounded-memory group-bys over them."""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+import logging
+import tempfile
+
+import pandas as pd
+
+from app.config import QUERY_CHUNK_ROWS, ROLLUP_MEMORY_MB
+from app.models.layout import LayoutConfig
+from app.services.frame_reader import (
+    CODE_WIDTH,
+    LOW_CARDINALITY_COLUMNS,
+    concat_frames,
+    layout_dtypes
+)
+from app.services.rollup import MAX, MIN, SUM, HashAggregator
+from app.services.storage import StorageBackend
+
+
+logger = logging.getLogger("cad_loader")
+
+# pandas dtypes of PostgreSQL types by pg_type OID (text types are handled apart)
+PG_TYPE_DTYPES = {
+    16: "boolean",                   # bool
+    20: "Int64",                     # int8
+    21: "Int16",                     # int2
+    23: "Int32",                     # int4
+    700: "Float64",                  # float4
+    701: "Float64",                  # float8
+    1700: "Float64",                 # numeric
+    1082: "datetime64[us]",          # date
+    1114: "datetime64[us]",          # timestamp
+    1184: "datetime64[us, UTC]",     # timestamptz
+}
+
+# bpchar, varchar, text
+_TEXT_TYPES = (1042, 1043, 25)
+
+# Partial aggregates computed per chunk for each aggregation, and how they combine
+_PARTS = {
+    "sum": (("sum", SUM),),
+    "count": (("count", SUM),),
+    "size": (("size", SUM),),
+    "min": (("min", MIN),),
+    "max": (("max", MAX),),
+    "mean": (("sum", SUM), ("count", SUM)),
+}
+
+AGGREGATIONS = tuple(_PARTS)
+
+
+def query_dtypes(
+    description: Sequence[Any],
+    layout_config: Optional[LayoutConfig] = None,
+    categories: Optional[Iterable[str]] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Choose a pandas dtype for each result column.
+
+    PostgreSQL reports each column's type, which maps to the same nullable
+    dtypes as ``layout_dtypes``. Text columns become categoricals when
+    they are codes (up to 10 characters wide) or known low-cardinality
+    columns, otherwise ``str``. Backends without type information
+    (SQLite) fall back to the layout column of the same name, if any.
+
+    Args:
+        description: DB-API cursor description of the result
+        layout_config: Layout used for columns of unknown type
+        categories: Text columns to make categorical instead of the
+            default rule
+
+    Returns:
+        Dtype name keyed by column name; None where pandas should infer it
+    """
+    categories = set(categories) if categories is not None else None
+    layout_columns = {}
+    if layout_config is not None:
+        for file_config in layout_config.files:
+            for column in file_config.active_columns:
+                layout_columns.setdefault(column.name, file_config)
+
+    dtypes: Dict[str, Optional[str]] = {}
+    for column in description:
+        name, type_code, width = column[0], column[1], column[3]
+        if type_code in _TEXT_TYPES:
+            if categories is not None:
+                categorical = name in categories
+            else:
+                categorical = 0 < (width or 0) <= CODE_WIDTH or name in LOW_CARDINALITY_COLUMNS
+            dtypes[name] = "category" if categorical else "str"
+        elif type_code in PG_TYPE_DTYPES:
+            dtypes[name] = PG_TYPE_DTYPES[type_code]
+        elif name in layout_columns:
+            dtypes[name] = layout_dtypes(layout_columns[name], [name], categories)[name]
+        else:
+            dtypes[name] = None
+    return dtypes
+
+
+def _series(values: Sequence[Any], dtype: Optional[str]) -> pd.Series:
+    """Build a typed Series from one column of fetched values."""
+    if dtype == "Float64":
+        # numeric arrives as Decimal
+        values = [None if value is None else float(value) for value in values]
+    elif dtype in ("Int16", "Int32", "Int64"):
+        # Layout-typed SQLite columns may hold text that does not parse
+        values = [value if value is None or isinstance(value, int) else None for value in values]
+    return pd.Series(values, dtype=dtype)
+
+
+def iter_query_frames(
+    storage: StorageBackend,
+    sql_str: str,
+    chunk_rows: int = QUERY_CHUNK_ROWS,
+    dtypes: Optional[Dict[str, str]] = None,
+    categories: Optional[Iterable[str]] = None,
+    layout_config: Optional[LayoutConfig] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Run a query and yield its result as typed DataFrame chunks.
+
+    Rows are fetched ``chunk_rows`` at a time through a server-side
+    cursor, so memory holds one chunk rather than the whole result as
+    ``pd.read_sql`` does. Every chunk gets the same dtypes (see
+    ``query_dtypes``); categoricals only know the categories of their
+    own chunk, which ``read_query_frame`` unions.
+
+    Args:
+        storage: Storage backend
+        sql_str: SELECT statement with schema-qualified table names
+        chunk_rows: Rows per chunk (and per fetch)
+        dtypes: Dtypes overriding the derived ones, keyed by column name
+        categories: Text columns to make categorical (None for the
+            default rule)
+        layout_config: Layout used for columns of unknown type
+
+    Yields:
+        DataFrames of at most ``chunk_rows`` rows
+    """
+    names, types = None, None
+    for description, rows in storage.iter_query_batches(sql_str, chunk_rows):
+        if types is None:
+            names = [column[0] for column in description]
+            types = query_dtypes(description, layout_config, categories)
+            types.update(dtypes or {})
+        values = list(zip(*rows))
+        yield pd.DataFrame({
+            name: _series(values[i], types[name]) for i, name in enumerate(names)
+        })
+
+
+def read_query_frame(
+    storage: StorageBackend,
+    sql_str: str,
+    chunk_rows: int = QUERY_CHUNK_ROWS,
+    dtypes: Optional[Dict[str, str]] = None,
+    categories: Optional[Iterable[str]] = None,
+    layout_config: Optional[LayoutConfig] = None
+) -> pd.DataFrame:
+    """
+    Run a query into one typed DataFrame.
+
+    A drop-in for ``pd.read_sql`` whose peak memory is the typed frame plus
+    one chunk of fetched rows, instead of the whole result as Python
+    objects. Arguments are those of ``iter_query_frames``.
+
+    Returns:
+        DataFrame with catalog-derived dtypes (no columns if the result
+        is empty)
+    """
+    frames = list(iter_query_frames(
+        storage, sql_str, chunk_rows, dtypes, categories, layout_config
+    ))
+    if not frames:
+        return pd.DataFrame()
+    frame = concat_frames(frames)
+    logger.info(
+        f"Read {len(frame):,} rows in {len(frames)} chunk(s) "
+        f"({frame.memory_usage(deep=True).sum() / 1024 / 1024:,.1f} MB)"
+    )
+    return frame
+
+
+def _scalar(value: Any) -> Any:
+    """Turn a pandas/numpy value into a plain Python value (None for missing)."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def aggregate_frames(
+    frames: Iterable[pd.DataFrame],
+    by: Sequence[str],
+    aggregations: Dict[str, Tuple[str, str]],
+    memory_bytes: int = ROLLUP_MEMORY_MB * 1024 * 1024,
+    work_dir: Optional[Path] = None
+) -> pd.DataFrame:
+    """
+    Group and aggregate a stream of DataFrame chunks in bounded memory.
+
+    The equivalent of ``pd.concat(frames).groupby(by).agg(**aggregations)``
+    for results too large to concatenate. Each chunk is reduced with
+    pandas to partial aggregates per group, which a ``HashAggregator``
+    combines across chunks and spills to disk once ``memory_bytes`` is
+    exceeded. Only the partial aggregates are held, so memory grows with
+    the number of groups, not rows. ``mean`` is carried as a sum and a
+    count. As in pandas, rows with a missing group key are dropped.
+
+    Args:
+        frames: DataFrame chunks (e.g. from ``iter_query_frames``)
+        by: Group key columns
+        aggregations: Output column -> (input column, aggregation), with
+            aggregations from ``AGGREGATIONS`` (sum, count, size, min,
+            max, mean)
+        memory_bytes: Budget for the partial aggregates in memory
+        work_dir: Directory for spill files (a temporary one if None)
+
+    Returns:
+        DataFrame indexed by the group keys in sorted order, one column
+        per aggregation
+
+    Raises:
+        ValueError: If an aggregation is not supported
+    """
+    by = list(by)
+    for output, (_, function) in aggregations.items():
+        if function not in _PARTS:
+            raise ValueError(
+                f"Unsupported aggregation '{function}' for {output}; "
+                f"use one of {', '.join(AGGREGATIONS)}"
+            )
+    # One partial aggregate column per part, e.g. _1_0 for the sum of the second output
+    partial_spec = {
+        f"_{i}_{j}": (column, part)
+        for i, (column, function) in enumerate(aggregations.values())
+        for j, (part, _) in enumerate(_PARTS[function])
+    }
+    operations = [
+        operation
+        for _, function in aggregations.values()
+        for _, operation in _PARTS[function]
+    ]
+
+    with tempfile.TemporaryDirectory(prefix="cad_groupby_", dir=work_dir) as spill_dir:
+        aggregator = HashAggregator(operations, memory_bytes, Path(spill_dir), "groupby")
+        rows = 0
+        for frame in frames:
+            rows += len(frame)
+            partial = frame.groupby(by, observed=True, sort=False).agg(**partial_spec)
+            keys = partial.index if len(by) > 1 else ((key,) for key in partial.index)
+            for key, values in zip(keys, partial.itertuples(index=False, name=None)):
+                aggregator.add(
+                    tuple(_scalar(part) for part in key), [_scalar(value) for value in values]
+                )
+
+        results = []
+        for key, state in aggregator.results():
+            row = list(key)
+            parts = iter(state)
+            for _, function in aggregations.values():
+                if function == "mean":
+                    total, count = next(parts), next(parts)
+                    row.append(total / count if count else None)
+                else:
+                    row.append(next(parts))
+            results.append(row)
+
+    logger.info(f"Aggregated {rows:,} rows into {len(results):,} groups")
+    result = pd.DataFrame(results, columns=by + list(aggregations))
+    return result.convert_dtypes().set_index(by)
@@ -0,0 +1,170 @@
+"""In-stream reconciliation of detail records against published totals."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import json
+
+from app.models.layout import FileConfig
+from app.services.file_reader import read_fixed_width_file
+
+
+# Measure name for the number of records in a group
+ROWS = "rows"
+
+
+class GroupTotals:
+    """
+    Record check that accumulates per-group row counts and column sums.
+
+    Driven by a file's ``totals`` spec: records are grouped by the
+    ``groupBy`` column and every ``sum`` column is added up. Each group
+    holds one small list ``[rows, sum1, sum2, ...]``, so memory depends on
+    the number of groups (taxing entities), not on the number of records.
+    Records are never rejected; rows that fail to insert are taken back
+    out with ``remove``.
+    """
+
+    def __init__(self, file_config: FileConfig):
+        """
+        Initialize the accumulator.
+
+        Args:
+            file_config: File configuration with a ``totals`` spec
+        """
+        spec = file_config.totals
+        self.group_position = file_config.column_index(spec["groupBy"])
+        self.measures = [ROWS] + list(spec.get("sum", []))
+        self.sum_positions = [file_config.column_index(name) for name in spec.get("sum", [])]
+        self.groups: Dict[Any, List[int]] = {}
+
+    def __call__(self, line: str, record: Tuple[Any, ...]) -> bool:
+        group = record[self.group_position]
+        sums = self.groups.get(group)
+        if sums is None:
+            sums = self.groups[group] = [0] * len(self.measures)
+        sums[0] += 1
+        for i, position in enumerate(self.sum_positions, 1):
+            value = record[position]
+            if value:
+                sums[i] += value
+        return True
+
+    def remove(self, record: Tuple[Any, ...]) -> None:
+        """
+        Take a record that was counted but not written back out of its group.
+
+        Args:
+            record: Tuple record ordered like the file's active columns
+        """
+        sums = self.groups.get(record[self.group_position])
+        if sums is None:
+            return
+        sums[0] -= 1
+        for i, position in enumerate(self.sum_positions, 1):
+            value = record[position]
+            if value:
+                sums[i] -= value
+
+    def totals(self) -> Dict[Any, Dict[str, int]]:
+        """
+        Get the accumulated totals.
+
+        Returns:
+            Measures (``rows`` and each summed column) keyed by group
+        """
+        return {
+            group: dict(zip(self.measures, sums))
+            for group, sums in self.groups.items()
+        }
+
+
+def read_totals_file(
+    file_path: Path,
+    file_config: FileConfig,
+    encoding: str,
+    match: Dict[str, str]
+) -> Dict[Any, Dict[str, int]]:
+    """
+    Read expected totals from a totals file such as ENTITY_TOTALS.
+
+    Args:
+        file_path: Path to the totals data file
+        file_config: Totals file configuration (keyed by its ``primaryKey``)
+        encoding: File encoding
+        match: Totals file column for each measure
+
+    Returns:
+        Expected measures keyed by group
+    """
+    key = file_config.primaryKey[0]
+    expected = {}
+    for record in read_fixed_width_file(file_path, file_config, encoding):
+        expected[record[key]] = {
+            measure: record[column]
+            for measure, column in match.items()
+            if record.get(column) is not None
+        }
+    return expected
+
+
+def read_export_totals(path: Path) -> Dict[Any, Dict[str, int]]:
+    """
+    Read expected totals transcribed from the export totals report.
+
+    The JSON maps each group to its measures, named like the accumulated
+    ones, e.g. ``{"CKA": {"rows": 41210, "taxable_val": 5133012345}}``.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Expected measures keyed by group
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_discrepancies(
+    actual: Dict[Any, Dict[str, int]],
+    expected: Dict[Any, Dict[str, int]],
+    source: str,
+    partial: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Compare accumulated totals with expected totals.
+
+    Groups missing on either side are reported with the other side as 0.
+
+    Args:
+        actual: Accumulated measures keyed by group
+        expected: Expected measures keyed by group
+        source: Name of the expected totals, used in the report
+        partial: Expected totals cover only some groups; groups they do
+            not list are not checked
+
+    Returns:
+        One dict per mismatching (group, measure), with source, group,
+        measure, expected, actual and difference
+    """
+    discrepancies = []
+    # Measures this source provides, for groups it does not list
+    measures = list(dict.fromkeys(measure for values in expected.values() for measure in values))
+    groups = set(expected) if partial else set(actual) | set(expected)
+    for group in sorted(groups, key=str):
+        found = actual.get(group, {})
+        wanted = expected.get(group)
+        if wanted is None:
+            wanted = {measure: 0 for measure in measures}
+        for measure, value in wanted.items():
+            total = found.get(measure, 0)
+            if total != value:
+                discrepancies.append({
+                    "source": source,
+                    "group": group,
+                    "measure": measure,
+                    "expected": value,
+                    "actual": total,
+                    "difference": total - value,
+                })
+    return discrepancies
+
@@ -0,0 +1,367 @@
+"""Per-subdivision ownership, investor and value reports."""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import csv
+import json
+import logging
+import re
+
+from app.services.storage import StorageBackend
+
+
+logger = logging.getLogger("cad_loader")
+
+REPORT_FORMATS = ("csv", "json")
+
+# One row per property, ordered so each subdivision is a contiguous run
+SUBDIVISION_QUERY = """
+SELECT
+    i.abs_subdv_cd,
+    i.prop_id,
+    i.owner_name,
+    i.mail_addr_line1,
+    i.mail_city,
+    i.mail_state,
+    i.mail_zip,
+    i.situs_street,
+    i.situs_city,
+    i.situs_zip,
+    i.legal_desc,
+    i.prop_val_yr,
+    v.appraised_value
+FROM {schema}.appraisal_info i
+LEFT JOIN (
+    SELECT prop_id, tax_year, MAX(assessed_val) AS appraised_value
+    FROM {schema}.appraisal_entity_info
+    GROUP BY prop_id, tax_year
+) v ON v.prop_id = i.prop_id AND v.tax_year = i.prop_val_yr
+WHERE i.abs_subdv_cd IS NOT NULL
+ORDER BY i.abs_subdv_cd, i.prop_id
+"""
+
+PROPERTY_COLUMNS = [
+    "prop_id", "owner_name", "mail_address", "mail_city", "mail_state", "mail_zip",
+    "situs_street", "situs_city", "situs_zip", "legal_desc", "prop_val_yr",
+    "appraised_value",
+]
+
+STREET_COLUMNS = [
+    "street_name", "total_properties", "avg_value", "median_value", "min_value",
+    "max_value", "owner_occupied_count", "investor_count", "owner_occupied_pct",
+    "investor_pct",
+]
+
+OWNER_COLUMNS = [
+    "owner_name", "owner_type", "property_count", "investor_count", "total_value",
+    "avg_value", "mail_city",
+]
+
+INDEX_COLUMNS = [
+    "abs_subdv_cd", "description", "total_properties", "total_value", "avg_value",
+    "median_value", "owner_occupied_count", "investor_count", "unknown_count",
+    "investor_pct", "corporate_investor_count", "street_count", "owner_count",
+    "top_owner", "top_owner_properties", "report",
+]
+
+OWNER_OCCUPIED = "Owner-Occupied"
+INVESTOR = "Investor/Non-Owner"
+UNKNOWN = "Unknown"
+
+# Owner name fragments that indicate a company rather than a person
+_CORPORATE_INDICATORS = (
+    "LLC", "LP", "INC", "CORP", "CORPORATION", "TRUST", "PARTNERS",
+    "PARTNERSHIP", "PROPERTIES", "HOMES", "RESIDENTIAL", "HOLDINGS",
+    "VENTURES", "HOA", "MANAGEMENT", "INVESTMENTS", "CAPITAL",
+)
+
+# Subdivisions queued ahead of the workers, bounding memory use
+_PENDING_PER_WORKER = 4
+
+
+def occupancy_status(mail_city: Optional[str], situs_city: Optional[str]) -> str:
+    """
+    Classify a property as owner-occupied or investor-owned.
+
+    An owner whose mailing city is the property's city likely lives there.
+
+    Args:
+        mail_city: Owner mailing city
+        situs_city: Property city
+
+    Returns:
+        'Owner-Occupied', 'Investor/Non-Owner' or 'Unknown'
+    """
+    mail_city = (mail_city or "").strip().upper()
+    situs_city = (situs_city or "").strip().upper()
+    if not mail_city or not situs_city:
+        return UNKNOWN
+    return OWNER_OCCUPIED if mail_city == situs_city else INVESTOR
+
+
+def owner_type(name: Optional[str]) -> str:
+    """
+    Classify an owner as a company or an individual from the name.
+
+    Args:
+        name: Owner name
+
+    Returns:
+        'Corporate/Entity', 'Individual' or 'Unknown'
+    """
+    if not name:
+        return UNKNOWN
+    name = name.upper()
+    if any(indicator in name for indicator in _CORPORATE_INDICATORS):
+        return "Corporate/Entity"
+    return "Individual"
+
+
+def _clean(text: Optional[str]) -> str:
+    """Collapse the padding inside fixed-width text fields."""
+    return " ".join((text or "").split())
+
+
+def _pct(count: int, total: int) -> float:
+    return round(count / total * 100, 1) if total else 0.0
+
+
+def _value_stats(values: List[int]) -> Dict[str, Any]:
+    """Average, median, min and max of the known values."""
+    if not values:
+        return {"avg_value": None, "median_value": None, "min_value": None, "max_value": None}
+    return {
+        "avg_value": round(sum(values) / len(values), 0),
+        "median_value": median(values),
+        "min_value": min(values),
+        "max_value": max(values),
+    }
+
+
+def build_report(
+    code: str,
+    description: Optional[str],
+    rows: Sequence[Tuple[Any, ...]]
+) -> Dict[str, Any]:
+    """
+    Compute the ownership and value report of one subdivision.
+
+    Args:
+        code: Subdivision code
+        description: Subdivision description
+        rows: Property rows in ``PROPERTY_COLUMNS`` order
+
+    Returns:
+        Dict with summary, streets, owners and properties
+    """
+    properties = []
+    streets: Dict[str, List[Dict[str, Any]]] = {}
+    owners: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        prop = dict(zip(PROPERTY_COLUMNS, row))
+        for name in ("owner_name", "situs_street", "legal_desc"):
+            prop[name] = _clean(prop[name])
+        prop["occupancy_status"] = occupancy_status(prop["mail_city"], prop["situs_city"])
+        prop["owner_type"] = owner_type(prop["owner_name"])
+        properties.append(prop)
+        streets.setdefault(prop["situs_street"] or UNKNOWN, []).append(prop)
+        owners.setdefault(prop["owner_name"] or UNKNOWN, []).append(prop)
+
+    street_rows = []
+    for street, props in sorted(streets.items()):
+        occupied = sum(p["occupancy_status"] == OWNER_OCCUPIED for p in props)
+        investors = sum(p["occupancy_status"] == INVESTOR for p in props)
+        street_rows.append({
+            "street_name": street,
+            "total_properties": len(props),
+            **_value_stats([p["appraised_value"] for p in props if p["appraised_value"] is not None]),
+            "owner_occupied_count": occupied,
+            "investor_count": investors,
+            "owner_occupied_pct": _pct(occupied, len(props)),
+            "investor_pct": _pct(investors, len(props)),
+        })
+
+    owner_rows = []
+    for owner, props in owners.items():
+        total = sum(p["appraised_value"] or 0 for p in props)
+        owner_rows.append({
+            "owner_name": owner,
+            "owner_type": props[0]["owner_type"],
+            "property_count": len(props),
+            "investor_count": sum(p["occupancy_status"] == INVESTOR for p in props),
+            "total_value": total,
+            "avg_value": round(total / len(props), 0),
+            "mail_city": props[0]["mail_city"],
+        })
+    owner_rows.sort(key=lambda o: (-o["property_count"], -o["total_value"], o["owner_name"]))
+
+    values = [p["appraised_value"] for p in properties if p["appraised_value"] is not None]
+    counts = {status: 0 for status in (OWNER_OCCUPIED, INVESTOR, UNKNOWN)}
+    for prop in properties:
+        counts[prop["occupancy_status"]] += 1
+    stats = _value_stats(values)
+    summary = {
+        "abs_subdv_cd": code,
+        "description": _clean(description),
+        "total_properties": len(properties),
+        "total_value": sum(values),
+        "avg_value": stats["avg_value"],
+        "median_value": stats["median_value"],
+        "owner_occupied_count": counts[OWNER_OCCUPIED],
+        "investor_count": counts[INVESTOR],
+        "unknown_count": counts[UNKNOWN],
+        "investor_pct": _pct(counts[INVESTOR], len(properties)),
+        "corporate_investor_count": sum(
+            p["occupancy_status"] == INVESTOR and p["owner_type"] == "Corporate/Entity"
+            for p in properties
+        ),
+        "street_count": len(streets),
+        "owner_count": len(owners),
+        "top_owner": owner_rows[0]["owner_name"] if owner_rows else None,
+        "top_owner_properties": owner_rows[0]["property_count"] if owner_rows else 0,
+    }
+    return {
+        "summary": summary,
+        "streets": street_rows,
+        "owners": owner_rows,
+        "properties": properties,
+    }
+
+
+def _write_csv(path: Path, columns: List[str], rows: Iterable[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def report_name(code: str) -> str:
+    """File system safe name for a subdivision code."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", code.strip()) or "_"
+
+
+def write_report(
+    code: str,
+    description: Optional[str],
+    rows: Sequence[Tuple[Any, ...]],
+    output_dir: Path,
+    report_format: str = "csv"
+) -> Dict[str, Any]:
+    """
+    Build one subdivision's report and write it to disk.
+
+    With 'csv' the report is a directory of summary.json, properties.csv,
+    streets.csv and owners.csv; with 'json' it is a single <code>.json.
+
+    Args:
+        code: Subdivision code
+        description: Subdivision description
+        rows: Property rows in ``PROPERTY_COLUMNS`` order
+        output_dir: Directory receiving all reports
+        report_format: 'csv' or 'json'
+
+    Returns:
+        Summary row for the county index
+    """
+    report = build_report(code, description, rows)
+    summary = report["summary"]
+    name = report_name(code)
+    if report_format == "json":
+        path = output_dir / f"{name}.json"
+        path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    else:
+        path = output_dir / name
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "summary.json").write_text(
+            json.dumps(summary, indent=2, default=str), encoding="utf-8"
+        )
+        _write_csv(
+            path / "properties.csv",
+            PROPERTY_COLUMNS + ["occupancy_status", "owner_type"],
+            report["properties"]
+        )
+        _write_csv(path / "streets.csv", STREET_COLUMNS, report["streets"])
+        _write_csv(path / "owners.csv", OWNER_COLUMNS, report["owners"])
+    summary["report"] = path.name
+    return summary
+
+
+def iter_subdivisions(
+    rows: Iterable[Tuple[Any, ...]]
+) -> Iterator[Tuple[str, List[Tuple[Any, ...]]]]:
+    """
+    Split query rows ordered by subdivision into one group per subdivision.
+
+    Args:
+        rows: Rows of ``SUBDIVISION_QUERY`` (subdivision code first)
+
+    Yields:
+        Tuples of (code, property rows without the code)
+    """
+    for code, group in groupby(rows, key=itemgetter(0)):
+        yield code.strip(), [row[1:] for row in group]
+
+
+def generate_reports(
+    storage: StorageBackend,
+    output_dir: Path,
+    workers: int = 1,
+    report_format: str = "csv",
+    schema: str = "cad",
+    min_properties: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Write a report for every subdivision plus a county index.
+
+    All properties are read in a single query ordered by subdivision and
+    streamed; each subdivision is handed to a process pool as soon as its
+    rows are complete, so reading and report building overlap.
+
+    Args:
+        storage: Storage backend holding the loaded tables
+        output_dir: Directory receiving the reports and index
+        workers: Worker processes building reports
+        report_format: 'csv' or 'json'
+        schema: Database schema
+        min_properties: Skip subdivisions with fewer properties
+
+    Returns:
+        Index rows, one per subdivision, ordered by code
+    """
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {report_format}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    descriptions = dict(storage.iter_query(
+        f"SELECT abs_subdv_cd, abs_subdv_desc FROM {schema}.appraisal_abstract_subdv"
+    ))
+    descriptions = {code.strip(): desc for code, desc in descriptions.items() if code}
+
+    subdivisions = (
+        (code, descriptions.get(code), rows, output_dir, report_format)
+        for code, rows in iter_subdivisions(
+            storage.iter_query(SUBDIVISION_QUERY.format(schema=schema))
+        )
+        if len(rows) >= min_properties
+    )
+
+    index = []
+    if workers <= 1:
+        index = [write_report(*args) for args in subdivisions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for args in subdivisions:
+                if len(pending) >= workers * _PENDING_PER_WORKER:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    index.extend(future.result() for future in done)
+                pending.add(pool.submit(write_report, *args))
+            index.extend(future.result() for future in wait(pending).done)
+
+    index.sort(key=itemgetter("abs_subdv_cd"))
+    _write_csv(output_dir / "index.csv", INDEX_COLUMNS, index)
+    logger.info(f"Wrote {len(index):,} subdivision reports to {output_dir}")
+    return index
@@ -0,0 +1,231 @@
+"""Streaming roll-to-roll change feed built from raw INFO and ENTITY_INFO files."""
+
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+import csv
+import json
+import logging
+import tempfile
+
+from app.models.layout import FileConfig, LayoutConfig
+from app.services.clustering import ensure_sorted
+from app.services.file_reader import read_fixed_width_file
+from app.services.merge import group_by_key, merge_groups
+
+
+logger = logging.getLogger("cad_loader")
+
+NEW_PARCEL = "new_parcel"
+REMOVED_PARCEL = "removed_parcel"
+OWNER_CHANGE = "owner_change"
+MAILING_CHANGE = "mailing_change"
+VALUE_CHANGE = "value_change"
+
+CHANGE_TYPES = (NEW_PARCEL, REMOVED_PARCEL, OWNER_CHANGE, MAILING_CHANGE, VALUE_CHANGE)
+
+OWNER_FIELDS = ("owner_id", "owner_name")
+MAILING_FIELDS = (
+    "mail_addr_line1", "mail_addr_line2", "mail_city", "mail_state", "mail_country", "mail_zip",
+)
+VALUE_FIELD = "assessed_val"
+
+FEED_COLUMNS = ["change_type", "prop_id", "field", "old_value", "new_value"]
+
+# Records whose prop_id does not parse sort (and are grouped) first
+_NO_PROP_ID = -1
+
+
+@dataclass
+class Roll:
+    """Raw files of one certified roll or supplement."""
+
+    info_path: Path
+    entity_info_path: Optional[Path] = None
+
+
+def find_roll_file(data_dir: Path, file_type: str) -> Optional[Path]:
+    """
+    Find a file type in an export directory, whatever its date prefix.
+
+    Args:
+        data_dir: Export directory
+        file_type: File type name (e.g., 'INFO')
+
+    Returns:
+        Path to the file, or None if the directory does not contain it
+
+    Raises:
+        ValueError: If several files match
+    """
+    matches = sorted(data_dir.glob(f"*APPRAISAL_{file_type}.TXT"))
+    if len(matches) > 1:
+        raise ValueError(f"Several {file_type} files in {data_dir}: {[m.name for m in matches]}")
+    return matches[0] if matches else None
+
+
+def _prop_id_key(file_config: FileConfig) -> Callable[[Tuple[Any, ...]], int]:
+    """Build a function extracting the prop_id of a tuple record."""
+    position = file_config.column_index("prop_id")
+
+    def key(record: Tuple[Any, ...]) -> int:
+        prop_id = record[position]
+        return prop_id if isinstance(prop_id, int) else _NO_PROP_ID
+
+    return key
+
+
+def _parcels(
+    roll: Roll,
+    layout_config: LayoutConfig,
+    work_dir: Path,
+    memory_bytes: int
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream one snapshot per parcel of a roll, in prop_id order.
+
+    The INFO row of the latest value year is used; the parcel value is the
+    largest ENTITY_INFO assessed value of the latest tax year.
+
+    Args:
+        roll: Roll files
+        layout_config: Layout configuration
+        work_dir: Directory for sorted copies of unsorted files
+        memory_bytes: Memory budget of an external sort
+
+    Yields:
+        Tuples of (prop_id, snapshot dict of owner, mailing and value fields)
+    """
+    encoding = layout_config.encoding
+    info_config = layout_config.get_file_config("INFO")
+    info_fields = [
+        (name, info_config.column_index(name)) for name in OWNER_FIELDS + MAILING_FIELDS
+    ]
+    streams = [group_by_key(
+        read_fixed_width_file(
+            ensure_sorted(roll.info_path, info_config, work_dir, memory_bytes),
+            info_config, encoding, record_format="tuple"
+        ),
+        _prop_id_key(info_config),
+        roll.info_path.name
+    )]
+
+    entity_config = layout_config.get_file_config("ENTITY_INFO")
+    if roll.entity_info_path is not None:
+        year = entity_config.column_index("tax_year")
+        value = entity_config.column_index(VALUE_FIELD)
+        streams.append(group_by_key(
+            read_fixed_width_file(
+                ensure_sorted(roll.entity_info_path, entity_config, work_dir, memory_bytes),
+                entity_config, encoding, record_format="tuple"
+            ),
+            _prop_id_key(entity_config),
+            roll.entity_info_path.name
+        ))
+
+    for prop_id, groups in merge_groups(*streams):
+        info_rows = groups[0]
+        if info_rows is None or prop_id == _NO_PROP_ID:
+            # Values without a parcel are not part of the feed
+            continue
+        # Rows are in (prop_id, year) order, so the last is the latest year
+        snapshot = {name: info_rows[-1][position] for name, position in info_fields}
+        if len(streams) > 1:
+            snapshot[VALUE_FIELD] = None
+            entity_rows = groups[1]
+            if entity_rows:
+                latest = entity_rows[-1][year]
+                values = [
+                    row[value] for row in entity_rows
+                    if row[year] == latest and row[value] is not None
+                ]
+                snapshot[VALUE_FIELD] = max(values) if values else None
+        yield prop_id, snapshot
+
+
+def _change(change_type: str, prop_id: int, field: Optional[str], old: Any, new: Any) -> Dict[str, Any]:
+    return {
+        "change_type": change_type,
+        "prop_id": prop_id,
+        "field": field,
+        "old_value": old,
+        "new_value": new,
+    }
+
+
+def diff_rolls(
+    old: Roll,
+    new: Roll,
+    layout_config: LayoutConfig,
+    memory_bytes: int = 256 * 1024 * 1024
+) -> Iterator[Dict[str, Any]]:
+    """
+    Compare two rolls parcel by parcel and yield the changes.
+
+    Both rolls are merge-joined on prop_id in a single pass, so time is
+    linear and memory stays constant (files that are not in prop_id order
+    are external-sorted first). A parcel can produce several changes, one
+    per changed field. New and removed parcels carry the owner name.
+    Values are compared only when both rolls include ENTITY_INFO.
+
+    Args:
+        old: Earlier roll
+        new: Later roll
+        layout_config: Layout configuration used to parse both rolls
+        memory_bytes: Memory budget of an external sort
+
+    Yields:
+        Change dicts with ``FEED_COLUMNS`` keys
+    """
+    compare_values = old.entity_info_path is not None and new.entity_info_path is not None
+    with tempfile.TemporaryDirectory(prefix="cad_diff_") as work_dir:
+        old_dir = Path(work_dir) / "old"
+        new_dir = Path(work_dir) / "new"
+        old_dir.mkdir()
+        new_dir.mkdir()
+        for prop_id, (before, after) in merge_groups(
+            _parcels(old, layout_config, old_dir, memory_bytes),
+            _parcels(new, layout_config, new_dir, memory_bytes)
+        ):
+            if before is None:
+                yield _change(NEW_PARCEL, prop_id, None, None, after["owner_name"])
+                continue
+            if after is None:
+                yield _change(REMOVED_PARCEL, prop_id, None, before["owner_name"], None)
+                continue
+            for change_type, fields in ((OWNER_CHANGE, OWNER_FIELDS), (MAILING_CHANGE, MAILING_FIELDS)):
+                for field in fields:
+                    if before[field] != after[field]:
+                        yield _change(change_type, prop_id, field, before[field], after[field])
+            if compare_values and before[VALUE_FIELD] != after[VALUE_FIELD]:
+                yield _change(
+                    VALUE_CHANGE, prop_id, VALUE_FIELD, before[VALUE_FIELD], after[VALUE_FIELD]
+                )
+
+
+def write_change_feed(changes: Iterable[Dict[str, Any]], output_path: Path) -> Counter:
+    """
+    Write a change feed as CSV, or as JSON lines for a .jsonl path.
+
+    Args:
+        changes: Change dicts
+        output_path: Output file
+
+    Returns:
+        Number of changes by change type
+    """
+    counts: Counter = Counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        if output_path.suffix == ".jsonl":
+            for change in changes:
+                f.write(json.dumps(change) + "\n")
+                counts[change["change_type"]] += 1
+        else:
+            writer = csv.DictWriter(f, fieldnames=FEED_COLUMNS)
+            writer.writeheader()
+            for change in changes:
+                writer.writerow(change)
+                counts[change["change_type"]] += 1
+    return counts
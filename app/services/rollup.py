@@ -0,0 +1,444 @@
+"""Per-property value rollups computed straight from the export files."""
+
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import heapq
+import json
+import logging
+import pickle
+import sys
+import tempfile
+
+from app.models.layout import FileConfig, LayoutConfig
+from app.services.clustering import find_unsorted_line
+from app.services.file_reader import read_fixed_width_file
+from app.services.merge import group_by_key, merge_groups
+
+
+logger = logging.getLogger("cad_loader")
+
+RollupKey = Tuple[int, int]
+
+# How a measure combines values from several records
+SUM = "sum"
+MIN = "min"
+MAX = "max"
+LAST = "last"
+
+STRATEGIES = ("auto", "merge", "hash")
+
+# Keys that do not parse are dropped from the rollup
+_UNPARSED = -1
+
+# New hash aggregation entries between memory estimate refreshes
+_SAMPLE_EVERY = 1024
+
+
+@dataclass
+class RollupSource:
+    """
+    Contribution of one file to a rollup.
+
+    Attributes:
+        file_type: File type name (e.g., 'LAND_DETAIL')
+        year_column: Column holding the year part of the key
+        measures: (output column, SUM/MIN/MAX/LAST, function of a tuple record
+            returning the value or None to skip the record)
+    """
+
+    file_type: str
+    year_column: str
+    measures: List[Tuple[str, str, Callable[[Tuple[Any, ...]], Any]]]
+
+    @property
+    def columns(self) -> List[str]:
+        """Output columns of the measures."""
+        return [name for name, _, _ in self.measures]
+
+    @property
+    def operations(self) -> List[str]:
+        """Combine operation of each measure."""
+        return [operation for _, operation, _ in self.measures]
+
+
+def _combine(state: List[Any], values: Iterable[Any], operations: List[str]) -> None:
+    """Fold one record's (or one partial aggregate's) values into a state in place."""
+    for i, (value, operation) in enumerate(zip(values, operations)):
+        if value is None:
+            continue
+        current = state[i]
+        if current is None or operation == LAST:
+            state[i] = value
+        elif operation == SUM:
+            state[i] = current + value
+        elif operation == MIN:
+            if value < current:
+                state[i] = value
+        elif value > current:
+            state[i] = value
+
+
+def _key_func(file_config: FileConfig, year_column: str) -> Callable[[Tuple[Any, ...]], RollupKey]:
+    """Build a function extracting (prop_id, year) from a tuple record."""
+    prop_id = file_config.column_index("prop_id")
+    year = file_config.column_index(year_column)
+
+    def key(record: Tuple[Any, ...]) -> RollupKey:
+        return (
+            record[prop_id] if isinstance(record[prop_id], int) else _UNPARSED,
+            record[year] if isinstance(record[year], int) else _UNPARSED,
+        )
+
+    return key
+
+
+def _entry_bytes(key: RollupKey, state: List[Any]) -> int:
+    """Estimate the memory held by one hash aggregation entry."""
+    size = sys.getsizeof(key) + sys.getsizeof(state) + 100  # dict slot and hash
+    size += sum(sys.getsizeof(part) for part in key)
+    size += sum(sys.getsizeof(value) for value in state if value is not None)
+    return size
+
+
+class HashAggregator:
+    """
+    Hash aggregation by key that spills to disk past a memory budget.
+
+    Partial aggregates are kept in a dict. When its estimated size reaches
+    ``memory_bytes`` the entries are sorted by key and written to a run
+    file, and the dict starts over. ``results`` merges the runs, combining
+    the partial aggregates of each key, so the output is in key order no
+    matter how the input was ordered.
+    """
+
+    def __init__(self, operations: List[str], memory_bytes: int, work_dir: Path, name: str = "input"):
+        """
+        Initialize the aggregator.
+
+        Args:
+            operations: Combine operation of each measure (SUM, MIN, MAX or LAST)
+            memory_bytes: Budget for the in-memory entries
+            work_dir: Directory for run files
+            name: Input name used in log messages
+        """
+        self.operations = operations
+        self.memory_bytes = memory_bytes
+        self.work_dir = work_dir
+        self.name = name
+        self.entries: Dict[RollupKey, List[Any]] = {}
+        self.runs: List[Path] = []
+        self._entry_size = 0.0
+        self._samples = 0
+        self._limit = 1
+
+    def add(self, key: RollupKey, values: Iterable[Any]) -> None:
+        """
+        Fold one record's measure values into its key's aggregate.
+
+        Args:
+            key: Rollup key
+            values: Measure values (None where the record does not count)
+        """
+        state = self.entries.get(key)
+        if state is not None:
+            _combine(state, values, self.operations)
+            return
+
+        state = [None] * len(self.operations)
+        self.entries[key] = state
+        _combine(state, values, self.operations)
+        if len(self.entries) % _SAMPLE_EVERY == 1:
+            # Running average of sampled entry sizes
+            self._samples += 1
+            self._entry_size += (_entry_bytes(key, state) - self._entry_size) / self._samples
+            self._limit = max(1, int(self.memory_bytes / self._entry_size))
+        if len(self.entries) >= self._limit:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Write the in-memory entries to a sorted run file and clear them."""
+        with tempfile.NamedTemporaryFile("wb", dir=self.work_dir, suffix=".agg", delete=False) as f:
+            for item in sorted(self.entries.items()):
+                pickle.dump(item, f, pickle.HIGHEST_PROTOCOL)
+            self.runs.append(Path(f.name))
+        logger.debug(
+            f"{self.name}: spilled {len(self.entries):,} partial aggregates "
+            f"(run {len(self.runs)})"
+        )
+        self.entries = {}
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[Tuple[RollupKey, List[Any]]]:
+        """Read the entries of a run file back in key order."""
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def results(self) -> Iterator[Tuple[RollupKey, List[Any]]]:
+        """
+        Yield the final aggregates in key order.
+
+        Run files are deleted once read.
+
+        Yields:
+            Tuples of (key, aggregated measure values)
+        """
+        if not self.runs:
+            entries, self.entries = self.entries, {}
+            yield from sorted(entries.items())
+            return
+
+        if self.entries:
+            self._spill()
+        logger.info(f"{self.name}: merging {len(self.runs)} spilled runs")
+        try:
+            # heapq.merge keeps run order on ties, so LAST still means last in the file
+            merged = heapq.merge(*(self._read_run(run) for run in self.runs), key=itemgetter(0))
+            current, state = None, None
+            for key, values in merged:
+                if key != current:
+                    if state is not None:
+                        yield current, state
+                    current, state = key, list(values)
+                else:
+                    _combine(state, values, self.operations)
+            if state is not None:
+                yield current, state
+        finally:
+            for run in self.runs:
+                run.unlink(missing_ok=True)
+
+
+def aggregate_file(
+    path: Path,
+    source: RollupSource,
+    layout_config: LayoutConfig,
+    work_dir: Path,
+    memory_bytes: int,
+    strategy: str = "auto"
+) -> Iterator[Tuple[RollupKey, List[Any]]]:
+    """
+    Aggregate one file's measures per (prop_id, year), in key order.
+
+    Files already ordered by their cluster key are grouped as they stream
+    (one key in memory). Other files go through a ``HashAggregator``,
+    which needs no sort of the raw lines and spills partial aggregates
+    when the budget is exceeded.
+
+    Args:
+        path: Data file
+        source: Measures of the file
+        layout_config: Layout configuration
+        work_dir: Directory for spill files
+        memory_bytes: Hash aggregation budget
+        strategy: 'merge', 'hash', or 'auto' to pick by checking the order
+
+    Returns:
+        Iterator of (key, aggregated measure values)
+    """
+    file_config = layout_config.get_file_config(source.file_type)
+    if strategy == "auto":
+        strategy = "merge" if find_unsorted_line(path, file_config) is None else "hash"
+    logger.info(f"{path.name}: {strategy} aggregation")
+
+    records = read_fixed_width_file(path, file_config, layout_config.encoding, record_format="tuple")
+    key = _key_func(file_config, source.year_column)
+    extractors = [extract for _, _, extract in source.measures]
+    operations = source.operations
+
+    if strategy == "merge":
+        return _grouped(group_by_key(records, key, path.name), extractors, operations)
+
+    aggregator = HashAggregator(operations, memory_bytes, work_dir, path.name)
+    for record in records:
+        aggregator.add(key(record), [extract(record) for extract in extractors])
+    return aggregator.results()
+
+
+def _grouped(
+    groups: Iterable[Tuple[RollupKey, List[Tuple[Any, ...]]]],
+    extractors: List[Callable[[Tuple[Any, ...]], Any]],
+    operations: List[str]
+) -> Iterator[Tuple[RollupKey, List[Any]]]:
+    """Fold the records of each group of a sorted stream."""
+    for key, records in groups:
+        state = [None] * len(operations)
+        for record in records:
+            _combine(state, [extract(record) for extract in extractors], operations)
+        yield key, state
+
+
+def value_rollup_sources(layout_config: LayoutConfig) -> List[RollupSource]:
+    """
+    Describe the per-property value rollup of the analysis notebooks.
+
+    INFO supplies the parcel (and the key rows), ENTITY_INFO the appraised
+    value (largest assessed value), LAND_DETAIL and IMPROVEMENT_INFO the
+    land and improvement values split by homesite.
+
+    Args:
+        layout_config: Layout configuration
+
+    Returns:
+        Sources, INFO first
+    """
+    def column(file_type: str, name: str) -> Callable[[Tuple[Any, ...]], Any]:
+        return itemgetter(layout_config.get_file_config(file_type).column_index(name))
+
+    info_columns = [
+        "owner_name", "situs_street", "situs_city", "situs_zip", "abs_subdv_cd", "legal_desc",
+    ]
+    info = RollupSource("INFO", "prop_val_yr", [
+        (name, LAST, column("INFO", name)) for name in info_columns
+    ])
+
+    entity = RollupSource("ENTITY_INFO", "tax_year", [
+        ("appraised_value", MAX, column("ENTITY_INFO", "assessed_val")),
+        ("entity_count", SUM, lambda record: 1),
+    ])
+
+    land_value = column("LAND_DETAIL", "appraised_val")
+    land_state = column("LAND_DETAIL", "state_cd")
+    ag_flag = column("LAND_DETAIL", "ag_flag")
+    mkt_val = column("LAND_DETAIL", "mkt_val")
+    prod_val = column("LAND_DETAIL", "prod_val")
+    land = RollupSource("LAND_DETAIL", "tax_year", [
+        ("land_value", SUM, land_value),
+        ("land_homesite_value", SUM,
+         lambda record: land_value(record) if land_state(record) == "HS" else None),
+        ("land_non_homesite_value", SUM,
+         lambda record: land_value(record) if land_state(record) != "HS" else None),
+        ("ag_market_valuation", SUM,
+         lambda record: (mkt_val(record) or 0) - (prod_val(record) or 0)
+         if ag_flag(record) == "Y" else None),
+        ("land_acres", SUM, column("LAND_DETAIL", "land_acres")),
+    ])
+
+    impr_value = column("IMPROVEMENT_INFO", "appraised_val")
+    homesite = column("IMPROVEMENT_INFO", "homesite_flag")
+    improvements = RollupSource("IMPROVEMENT_INFO", "tax_year", [
+        ("improvement_value", SUM, impr_value),
+        ("improvement_homesite_value", SUM,
+         lambda record: impr_value(record) if homesite(record) == "Y" else None),
+        ("improvement_non_homesite_value", SUM,
+         lambda record: impr_value(record) if homesite(record) != "Y" else None),
+        ("improvement_count", SUM, lambda record: 1),
+    ])
+    return [info, entity, land, improvements]
+
+
+def rollup_columns(sources: List[RollupSource]) -> List[str]:
+    """Output columns of a rollup, in row order."""
+    columns = ["prop_id", "year"]
+    for source in sources:
+        columns.extend(source.columns)
+    return columns
+
+
+def iter_rollup(
+    paths: Dict[str, Path],
+    layout_config: LayoutConfig,
+    sources: Optional[List[RollupSource]] = None,
+    memory_bytes: int = 256 * 1024 * 1024,
+    strategy: str = "auto"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Roll up measures of several files per (prop_id, year) without a database.
+
+    Each file is aggregated on its own (see ``aggregate_file``), so one
+    property's land rows never multiply its improvement rows as they do
+    in a single SQL join. The per-file streams come out in key order and
+    are merge-joined; every key of the first source produces one row, like
+    a LEFT JOIN from it. Hash aggregations share ``memory_bytes``.
+
+    Args:
+        paths: Data file paths keyed by file type; a missing file leaves
+            its columns None
+        layout_config: Layout configuration
+        sources: Rollup sources, driving file first (the value rollup if None)
+        memory_bytes: Memory budget of the hash aggregations
+        strategy: 'auto', 'merge' or 'hash' for every file
+
+    Yields:
+        Row dicts with ``rollup_columns`` keys; the value rollup adds
+        ``calculated_market_value`` (land plus improvements) and
+        ``market_value`` (that plus the ag market valuation)
+
+    Raises:
+        FileNotFoundError: If the driving file is missing
+        ValueError: If the strategy is unknown, or 'merge' is forced on an
+            unsorted file
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown rollup strategy: {strategy}")
+    value_rollup = sources is None
+    sources = sources or value_rollup_sources(layout_config)
+    if sources[0].file_type not in paths:
+        raise FileNotFoundError(f"{sources[0].file_type} file is required for the rollup")
+    present = [source for source in sources if source.file_type in paths]
+    for source in sources:
+        if source.file_type not in paths:
+            logger.warning(f"{source.file_type} not found; its rollup columns are left empty")
+
+    columns = rollup_columns(sources)
+    with tempfile.TemporaryDirectory(prefix="cad_rollup_") as work_dir:
+        streams = [
+            aggregate_file(
+                paths[source.file_type], source, layout_config, Path(work_dir),
+                memory_bytes // len(present), strategy
+            )
+            for source in present
+        ]
+        for key, states in merge_groups(*streams):
+            if states[0] is None or _UNPARSED in key:
+                continue
+            row = list(key)
+            states_by_type = dict(zip((source.file_type for source in present), states))
+            for source in sources:
+                state = states_by_type.get(source.file_type)
+                row.extend(state if state is not None else [None] * len(source.measures))
+            record = dict(zip(columns, row))
+            if value_rollup:
+                # As in the notebook: land plus improvements, and that plus ag market valuation
+                record["calculated_market_value"] = (
+                    (record["land_value"] or 0) + (record["improvement_value"] or 0)
+                )
+                record["market_value"] = (
+                    record["calculated_market_value"] + (record["ag_market_valuation"] or 0)
+                )
+            yield record
+
+
+def write_rollup(rows: Iterable[Dict[str, Any]], output_path: Path) -> int:
+    """
+    Write rollup rows as CSV, or as JSON lines for a .jsonl path.
+
+    Args:
+        rows: Row dicts, all with the same keys
+        output_path: Output file
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        if output_path.suffix == ".jsonl":
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+                count += 1
+        else:
+            writer = None
+            for row in rows:
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                count += 1
+    return count
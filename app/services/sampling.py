@@ -0,0 +1,223 @@
+"""Consistent prop_id sampling for fast, internally consistent development loads."""
+
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import heapq
+import logging
+
+from app.models.layout import FileConfig, LayoutConfig
+from app.services.integrity import KeySet, parse_reference
+
+
+logger = logging.getLogger("cad_loader")
+
+# Column that identifies a property; other files reference it
+SAMPLE_KEY = "INFO.prop_id"
+
+_MASK = (1 << 64) - 1
+
+
+def property_hash(prop_id: int, seed: int = 0) -> int:
+    """
+    Hash a prop_id to a well-mixed 64-bit integer (splitmix64).
+
+    The hash only depends on the prop_id and seed, so every file and every
+    run agrees on which properties are in a sample.
+
+    Args:
+        prop_id: Property ID
+        seed: Sample seed
+
+    Returns:
+        Hash in [0, 2**64)
+    """
+    x = (prop_id + seed * 0x9E3779B97F4A7C15 + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+class PropertySample:
+    """
+    Subset of properties applied to INFO and every file that references it.
+
+    A property is in the sample when its hash is below ``fraction`` of the
+    hash range, so child rows are kept exactly when their parent is, a
+    larger fraction always contains a smaller one, and no file has to be
+    read in advance. A stratified sample (see ``stratified``) instead keeps
+    the lowest-hash share of every stratum of an INFO column, so small
+    property types or cities are represented too.
+
+    Rows are filtered on the raw line before parsing, which is what makes
+    a small sample fast. Rows with several references (UDI) are kept only
+    when every referenced property is in the sample; blank or zero
+    references are ignored, as in the integrity checks.
+    """
+
+    def __init__(
+        self,
+        fraction: float,
+        seed: int = 0,
+        selected: Optional[KeySet] = None,
+        stratify: Optional[str] = None
+    ):
+        """
+        Initialize the sample.
+
+        Args:
+            fraction: Share of properties to keep, in (0, 1]
+            seed: Seed choosing which properties are kept
+            selected: Explicit set of kept prop_ids (stratified samples)
+            stratify: INFO column the explicit set was stratified by
+
+        Raises:
+            ValueError: If the fraction is out of range
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+        self.fraction = fraction
+        self.seed = seed
+        self.selected = selected
+        self.stratify = stratify
+        self.threshold = min(int(fraction * 2 ** 64), 2 ** 64)
+
+    def __str__(self) -> str:
+        label = f"{self.fraction:.4g} sample, seed {self.seed}"
+        if self.stratify:
+            label += f", by {self.stratify}"
+        return label
+
+    def __contains__(self, prop_id: int) -> bool:
+        if self.selected is not None:
+            return prop_id in self.selected
+        return property_hash(prop_id, self.seed) < self.threshold
+
+    @classmethod
+    def stratified(
+        cls,
+        info_path: Path,
+        layout_config: LayoutConfig,
+        column: str,
+        fraction: float,
+        seed: int = 0,
+        min_per_stratum: int = 1
+    ) -> "PropertySample":
+        """
+        Build a sample stratified by an INFO column.
+
+        INFO is read twice, slicing only prop_id and the stratum column:
+        once to count each stratum, once to keep the lowest-hash
+        ``fraction`` of it (at least ``min_per_stratum`` properties). Only
+        the kept prop_ids are held in memory.
+
+        Args:
+            info_path: INFO data file
+            layout_config: Layout configuration
+            column: INFO column to stratify by (e.g. prop_type_cd, situs_city)
+            fraction: Share of each stratum to keep
+            seed: Seed choosing which properties are kept
+            min_per_stratum: Fewest properties kept of any stratum
+
+        Returns:
+            PropertySample with an explicit prop_id set
+
+        Raises:
+            ValueError: If the column is not in INFO
+        """
+        file_type, key_column = parse_reference(SAMPLE_KEY)
+        file_config = layout_config.get_file_config(file_type)
+        spans = {col.name: (start, end) for col, start, end in file_config.column_spans}
+        if column not in spans:
+            raise ValueError(f"{file_type} has no column {column}")
+        key_start, key_end = spans[key_column]
+        stratum_start, stratum_end = spans[column]
+
+        def properties():
+            with open(info_path, "rb") as f:
+                for line in f:
+                    try:
+                        prop_id = int(line[key_start:key_end])
+                    except ValueError:
+                        continue
+                    yield prop_id, line[stratum_start:stratum_end].strip().upper()
+
+        sizes = Counter(stratum for _, stratum in properties())
+        quotas = {
+            stratum: min(size, max(min_per_stratum, round(fraction * size)))
+            for stratum, size in sizes.items()
+        }
+
+        # Max-heaps (negated hashes) of each stratum's lowest hashes so far
+        heaps: Dict[bytes, List[Tuple[int, int]]] = {stratum: [] for stratum in sizes}
+        for prop_id, stratum in properties():
+            heap = heaps[stratum]
+            entry = (-property_hash(prop_id, seed), prop_id)
+            if len(heap) < quotas[stratum]:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        selected = KeySet()
+        for heap in heaps.values():
+            for _, prop_id in heap:
+                selected.add(prop_id)
+        logger.info(
+            f"Stratified sample by {column}: {len(selected):,} of {sum(sizes.values()):,} "
+            f"properties across {len(sizes):,} strata"
+        )
+        return cls(fraction, seed, selected, column)
+
+    def key_columns(self, file_config: FileConfig) -> List[str]:
+        """
+        Get the columns of a file that hold sampled prop_ids.
+
+        Args:
+            file_config: File configuration
+
+        Returns:
+            The key column for INFO, the referencing columns for its
+            children, and an empty list for files that are not sampled
+        """
+        file_type, key_column = parse_reference(SAMPLE_KEY)
+        if file_config.fileName == file_type:
+            return [key_column]
+        return [
+            column for column, reference in (file_config.references or {}).items()
+            if reference == SAMPLE_KEY
+        ]
+
+    def line_filter(self, file_config: FileConfig) -> Optional[Callable[[str], bool]]:
+        """
+        Build a check of whether a raw line belongs to the sample.
+
+        Args:
+            file_config: File configuration
+
+        Returns:
+            Callable(line) returning False for lines to skip, or None if
+            the file is not sampled (reference tables load in full)
+        """
+        columns = self.key_columns(file_config)
+        if not columns:
+            return None
+        spans = {col.name: (start, end) for col, start, end in file_config.column_spans}
+        bounds = [spans[column] for column in columns]
+
+        def keep(line: str) -> bool:
+            sampled = False
+            for start, end in bounds:
+                try:
+                    key = int(line[start:end])
+                except ValueError:
+                    # Blank optional references (UDI parent) do not count
+                    if line[start:end].strip():
+                        return False
+                    continue
+                if key:
+                    if key not in self:
+                        return False
+                    sampled = True
+            return sampled
+
+        return keep
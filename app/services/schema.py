@@ -0,0 +1,240 @@
+"""Table DDL generation and schema drift detection from the file layout."""
+
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from app.models.layout import ColumnConfig, FileConfig, LayoutConfig
+
+
+logger = logging.getLogger("cad_loader")
+
+# Alignment groups in PostgreSQL storage order: 8-byte, 4-byte, 2-byte fixed
+# width types first, variable-length types last. Ordering columns this way
+# avoids padding bytes between attributes in every heap tuple.
+_ALIGNMENT_ORDER = {"BIGINT": 0, "TIMESTAMP": 0, "INTEGER": 1, "SMALLINT": 2}
+_VARLENA_RANK = 3
+
+# Integer types by the number of decimal digits they always hold
+_INTEGER_TYPES = [(4, "SMALLINT"), (9, "INTEGER"), (18, "BIGINT")]
+_INTEGER_RANK = {"SMALLINT": 0, "INTEGER": 1, "BIGINT": 2}
+
+# information_schema.columns data_type -> DDL type name
+_CATALOG_TYPES = {
+    "smallint": "SMALLINT",
+    "integer": "INTEGER",
+    "bigint": "BIGINT",
+    "numeric": "NUMERIC",
+    "character": "CHAR",
+    "character varying": "VARCHAR",
+    "text": "TEXT",
+}
+
+
+class SchemaDriftError(ValueError):
+    """Raised when a database table no longer matches its file layout."""
+
+
+def _is_year_column(column: ColumnConfig) -> bool:
+    """Check whether a numeric column holds a calendar year."""
+    name = column.name.lower()
+    return name.endswith("_yr") or "year" in name
+
+
+def column_sql_type(column: ColumnConfig) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Choose the most compact SQL type that holds every value of a column.
+
+    Args:
+        column: Column configuration
+
+    Returns:
+        Tuple of (type name, length or precision, scale)
+    """
+    data_type = column.dataType.upper()
+
+    if data_type in ("INTEGER", "INT", "BIGINT"):
+        if _is_year_column(column):
+            return "SMALLINT", None, None
+        for digits, type_name in _INTEGER_TYPES:
+            if column.length <= digits:
+                return type_name, None, None
+        return "NUMERIC", column.length, 0
+
+    if data_type == "DECIMAL":
+        return "NUMERIC", column.length, column.precision or 0
+
+    # Text: code mappings can expand a 1-character code into a longer label
+    length = column.length
+    if column.codeMappings:
+        length = max([length] + [len(v) for v in column.codeMappings.values()])
+    if length == 1:
+        return "CHAR", 1, None
+    return "VARCHAR", length, None
+
+
+def _format_type(type_name: str, size: Optional[int], scale: Optional[int]) -> str:
+    """Render a type tuple as DDL text."""
+    if type_name == "NUMERIC":
+        return f"NUMERIC({size}, {scale})"
+    if size is not None:
+        return f"{type_name}({size})"
+    return type_name
+
+
+def _alignment_rank(type_name: str) -> int:
+    """Get the storage alignment group of a type (lower sorts first)."""
+    return _ALIGNMENT_ORDER.get(type_name, _VARLENA_RANK)
+
+
+def generate_table_ddl(
+    file_config: FileConfig,
+    schema: str = "cad",
+    dialect: str = "postgres"
+) -> str:
+    """
+    Generate CREATE TABLE DDL for one file layout.
+
+    Columns are ordered by alignment to minimize padding. Layouts with a
+    ``primaryKey`` get that constraint; others get a surrogate ``id``.
+
+    Args:
+        file_config: File configuration
+        schema: Database schema (attached database name for SQLite)
+        dialect: 'postgres' or 'sqlite'
+
+    Returns:
+        CREATE TABLE statement
+    """
+    primary_key = file_config.primaryKey or []
+
+    # (rank, position, definition) so the sort is stable within a group
+    definitions = []
+    for position, column in enumerate(file_config.active_columns):
+        type_name, size, scale = column_sql_type(column)
+        definition = f"{column.name} {_format_type(type_name, size, scale)}"
+        if not column.nullable or column.name in primary_key:
+            definition += " NOT NULL"
+        definitions.append((_alignment_rank(type_name), position, definition))
+
+    if not primary_key:
+        surrogate = "id INTEGER PRIMARY KEY" if dialect == "sqlite" else "id SERIAL PRIMARY KEY"
+        definitions.append((_alignment_rank("INTEGER"), -1, surrogate))
+    definitions.append(
+        (_alignment_rank("TIMESTAMP"), len(definitions),
+         "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+    )
+
+    lines = [definition for _, _, definition in sorted(definitions)]
+    if primary_key:
+        lines.append(f"PRIMARY KEY ({', '.join(primary_key)})")
+
+    body = ",\n".join(f"    {line}" for line in lines)
+    return (
+        f"-- {file_config.fileName}: {file_config.description}\n"
+        f"CREATE TABLE IF NOT EXISTS {schema}.{file_config.tableName} (\n"
+        f"{body}\n"
+        f");\n"
+    )
+
+
+def generate_schema_ddl(
+    layout_config: LayoutConfig,
+    schema: str = "cad",
+    dialect: str = "postgres"
+) -> str:
+    """
+    Generate the table DDL for every file in the layout.
+
+    Tables derived from other files at load time (``pivot`` specs) follow
+    the file tables.
+
+    Args:
+        layout_config: Layout configuration
+        schema: Database schema (attached database name for SQLite)
+        dialect: 'postgres' or 'sqlite'
+
+    Returns:
+        SQL script creating the schema and all layout tables
+    """
+    header = (
+        "-- Kaufman CAD Database Schema\n"
+        f"-- Generated from file_layouts.json (layout {layout_config.version}, "
+        f"tax year {layout_config.taxYear})\n"
+        "-- by scripts/generate_schema.py. Do not edit by hand.\n"
+    )
+    if dialect != "sqlite":
+        header += (
+            "\n"
+            f"CREATE SCHEMA IF NOT EXISTS {schema};\n"
+            "\n"
+            f"SET search_path TO {schema}, public;\n"
+        )
+    tables = [
+        generate_table_ddl(fc, schema, dialect)
+        for fc in layout_config.files + layout_config.derived_files
+    ]
+    return header + "\n" + "\n".join(tables)
+
+
+def find_schema_drift(
+    file_config: FileConfig,
+    db_columns: Dict[str, Dict[str, Any]]
+) -> List[str]:
+    """
+    Compare a table's catalog columns against its file layout.
+
+    Only differences that make loads fail or truncate data are reported;
+    wider database columns are accepted.
+
+    Args:
+        file_config: File configuration
+        db_columns: Column info keyed by name, with ``data_type``,
+            ``character_maximum_length``, ``numeric_precision`` and
+            ``numeric_scale`` as in information_schema.columns
+
+    Returns:
+        List of human-readable drift problems (empty if none)
+    """
+    table = file_config.tableName
+    if not db_columns:
+        return [f"{table}: table does not exist"]
+
+    problems = []
+    for column in file_config.active_columns:
+        info = db_columns.get(column.name)
+        if info is None:
+            problems.append(f"{table}.{column.name}: column missing")
+            continue
+
+        want_type, want_size, want_scale = column_sql_type(column)
+        have_type = _CATALOG_TYPES.get(str(info.get("data_type")).lower(), "OTHER")
+        expected = _format_type(want_type, want_size, want_scale)
+
+        if want_type in ("CHAR", "VARCHAR"):
+            have_len = info.get("character_maximum_length")
+            if have_type == "TEXT":
+                continue
+            if have_type not in ("CHAR", "VARCHAR"):
+                problems.append(f"{table}.{column.name}: {info.get('data_type')}, expected {expected}")
+            elif have_len is not None and have_len < want_size:
+                problems.append(
+                    f"{table}.{column.name}: length {have_len} < layout length {want_size}"
+                )
+        elif want_type in _INTEGER_RANK:
+            if have_type == "NUMERIC":
+                continue
+            if have_type not in _INTEGER_RANK or _INTEGER_RANK[have_type] < _INTEGER_RANK[want_type]:
+                problems.append(f"{table}.{column.name}: {info.get('data_type')}, expected {expected}")
+        elif want_type == "NUMERIC":
+            precision = info.get("numeric_precision")
+            scale = info.get("numeric_scale")
+            if have_type != "NUMERIC":
+                problems.append(f"{table}.{column.name}: {info.get('data_type')}, expected {expected}")
+            elif precision is not None and (
+                (scale or 0) < want_scale or precision - (scale or 0) < want_size - want_scale
+            ):
+                problems.append(
+                    f"{table}.{column.name}: NUMERIC({precision}, {scale}), expected {expected}"
+                )
+
+    return problems
@@ -0,0 +1,528 @@
+"""Embedded SQLite storage backend for loading and querying without a server."""
+
+from contextlib import contextmanager, closing
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import json
+import logging
+import re
+import sqlite3
+
+from app.config import SQL_DIR, SQLITE_BATCH_SIZE, SQLITE_BATCH_TARGET_BYTES, SQLITE_CACHE_KB
+from app.models.layout import FileConfig, LayoutConfig
+from app.services.schema import generate_schema_ddl
+from app.services.storage import StorageBackend
+
+
+logger = logging.getLogger("cad_loader")
+
+SQLITE_SQL_DIR = SQL_DIR / "sqlite"
+
+# Declared SQLite column type -> information_schema.columns data_type
+_DECLARED_TYPES = {
+    "SMALLINT": "smallint",
+    "INTEGER": "integer",
+    "INT": "integer",
+    "BIGINT": "bigint",
+    "NUMERIC": "numeric",
+    "DECIMAL": "numeric",
+    "CHAR": "character",
+    "VARCHAR": "character varying",
+    "TEXT": "text",
+}
+_DECLARED_TYPE_RE = re.compile(r"^\s*(\w+)\s*(?:\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\))?")
+_INDEX_RE = re.compile(r"CREATE INDEX IF NOT EXISTS \w+\.(\w+) ON (\w+)\(", re.IGNORECASE)
+
+
+def _sql_statements(file_name: str, schema: str = "cad") -> List[str]:
+    """
+    Read a script from sql/sqlite as individual statements.
+
+    Args:
+        file_name: Script file name
+        schema: Attached database name to use instead of ``cad``
+
+    Returns:
+        Statements without comments or trailing semicolons
+    """
+    text = "\n".join(
+        line.replace("cad.", f"{schema}.")
+        for line in (SQLITE_SQL_DIR / file_name).read_text(encoding="utf-8").splitlines()
+        if not line.strip().startswith("--")
+    )
+    return [stmt.strip() for stmt in text.split(";") if stmt.strip()]
+
+
+class SQLiteDatabaseService(StorageBackend):
+    """
+    Service for embedded SQLite database operations.
+
+    The database file is attached under the schema name (``cad``), so
+    queries written for PostgreSQL such as ``SELECT ... FROM cad.appraisal_info``
+    run unchanged. Loads use large ``executemany`` transactions with
+    ``synchronous=OFF``; secondary indexes are dropped before a table is
+    loaded and rebuilt afterwards.
+    """
+
+    batch_size = SQLITE_BATCH_SIZE
+    batch_bytes = SQLITE_BATCH_TARGET_BYTES
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the SQLite service.
+
+        Args:
+            config: Database configuration dict. Uses default if None.
+                ``sqlite_path`` names the database file.
+        """
+        super().__init__(config)
+        self.path = Path(self.config["sqlite_path"])
+        self.schema = self.config.get("schema", "cad")
+
+    @contextmanager
+    def get_connection(self, bulk: bool = False):
+        """
+        Context manager for database connections.
+
+        Args:
+            bulk: Relax durability (synchronous=OFF) for a bulk load
+
+        Yields:
+            Database connection
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Parallel loaders share the single writer lock; wait for it instead of failing
+        conn = sqlite3.connect(":memory:", isolation_level=None, timeout=300)
+        try:
+            conn.execute("ATTACH DATABASE ? AS " + self.schema, (str(self.path),))
+            conn.execute(f"PRAGMA {self.schema}.journal_mode=WAL")
+            conn.execute(f"PRAGMA {self.schema}.synchronous={'OFF' if bulk else 'NORMAL'}")
+            conn.execute(f"PRAGMA {self.schema}.cache_size=-{SQLITE_CACHE_KB}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            yield conn
+        finally:
+            conn.close()
+
+    def _bulk_connection(self):
+        """Connection used by insert_records_streaming."""
+        return self.get_connection(bulk=True)
+
+    def test_connection(self) -> bool:
+        """
+        Test database connectivity.
+
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute("SELECT 1")
+            logger.info(f"SQLite database ready: {self.path}")
+            return True
+        except Exception as e:
+            logger.error(f"SQLite connection failed: {e}")
+            return False
+
+    def create_tables(self, layout_config: LayoutConfig, schema: str = "cad") -> None:
+        """
+        Create layout and load-tracking tables if they do not exist.
+
+        Args:
+            layout_config: Layout configuration
+            schema: Attached database name
+        """
+        with self.get_connection() as conn:
+            conn.executescript(generate_schema_ddl(layout_config, schema, dialect="sqlite"))
+            for statement in _sql_statements("002_logging.sql", schema):
+                conn.execute(statement)
+        logger.info(f"Created layout tables in {self.path}")
+
+    def _table_indexes(self, table_name: str, schema: str = "cad") -> List[Tuple[str, str]]:
+        """Get (index name, CREATE statement) pairs for a table's secondary indexes."""
+        indexes = []
+        for statement in _sql_statements("003_indexes.sql", schema):
+            match = _INDEX_RE.search(statement)
+            if match and match.group(2) == table_name:
+                indexes.append((match.group(1), statement))
+        return indexes
+
+    def prepare_load(self, file_config: FileConfig, schema: str = "cad") -> None:
+        """
+        Drop secondary indexes so the bulk load does not maintain them.
+
+        Args:
+            file_config: File configuration of the table
+            schema: Attached database name
+        """
+        with self.get_connection() as conn:
+            for index_name, _ in self._table_indexes(file_config.tableName, schema):
+                conn.execute(f"DROP INDEX IF EXISTS {schema}.{index_name}")
+
+    def finalize_load(
+        self,
+        file_config: FileConfig,
+        schema: str = "cad",
+        clustered: bool = False
+    ) -> None:
+        """
+        Build secondary indexes and refresh planner statistics after a load.
+
+        SQLite has no range indexes; clustered loads still benefit because
+        rows sharing a key land on neighbouring pages.
+
+        Args:
+            file_config: File configuration of the table
+            schema: Attached database name
+            clustered: Rows were inserted in ``clusterKey`` order
+        """
+        with self.get_connection(bulk=True) as conn:
+            for index_name, statement in self._table_indexes(file_config.tableName, schema):
+                conn.execute(statement)
+                logger.info(f"Built index {index_name}")
+            conn.execute(f"ANALYZE {schema}.{file_config.tableName}")
+
+    def truncate_table(self, table_name: str, schema: str = "cad") -> bool:
+        """
+        Remove all rows from a table.
+
+        Args:
+            table_name: Name of table to truncate
+            schema: Attached database name
+
+        Returns:
+            True if successful
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute(f"DELETE FROM {schema}.{table_name}")
+            logger.info(f"Truncated table: {schema}.{table_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error truncating table: {e}")
+            return False
+
+    def _insert_sql(
+        self,
+        conn,
+        file_config: FileConfig,
+        schema: str,
+        on_conflict: Optional[str] = None
+    ) -> str:
+        """Build the parameterized INSERT statement for a file's table."""
+        columns = [col.name for col in file_config.active_columns]
+        query = (
+            f"INSERT INTO {schema}.{file_config.tableName} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+
+        if on_conflict:
+            key = file_config.primaryKey
+            updates = [col for col in columns if col not in key]
+            if on_conflict == "last" and updates:
+                action = "DO UPDATE SET " + ", ".join(f"{col} = excluded.{col}" for col in updates)
+            else:
+                action = "DO NOTHING"
+            query += f" ON CONFLICT ({', '.join(key)}) {action}"
+        return query
+
+    def _execute_batch(self, cur, sql_str: str, rows: List[Tuple[Any, ...]]) -> int:
+        """Execute an INSERT for many rows and return how many rows it wrote."""
+        cur.executemany(sql_str, rows)
+        return cur.rowcount
+
+    def _begin(self, cur) -> None:
+        """Open an explicit transaction (the connection is in autocommit mode)."""
+        cur.execute("BEGIN")
+
+    def get_table_count(self, table_name: str, schema: str = "cad") -> int:
+        """
+        Get record count for a table.
+
+        Args:
+            table_name: Table name
+            schema: Attached database name
+
+        Returns:
+            Record count
+        """
+        try:
+            with self.get_connection() as conn:
+                return conn.execute(f"SELECT COUNT(*) FROM {schema}.{table_name}").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error getting table count: {e}")
+            return -1
+
+    def get_table_columns(
+        self,
+        table_name: str,
+        schema: str = "cad"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get column definitions in information_schema.columns form.
+
+        Args:
+            table_name: Table name
+            schema: Attached database name
+
+        Returns:
+            Column info dicts keyed by column name (empty if no table)
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute(f"PRAGMA {schema}.table_info({table_name})").fetchall()
+
+        columns = {}
+        for _, name, declared, _, _, _ in rows:
+            match = _DECLARED_TYPE_RE.match(declared or "")
+            type_name = match.group(1).upper() if match else ""
+            size = int(match.group(2)) if match and match.group(2) else None
+            scale = int(match.group(3)) if match and match.group(3) else None
+            data_type = _DECLARED_TYPES.get(type_name, type_name.lower())
+            text = data_type in ("character", "character varying")
+            columns[name] = {
+                "data_type": data_type,
+                "character_maximum_length": size if text else None,
+                "numeric_precision": size if data_type == "numeric" else None,
+                "numeric_scale": (scale or 0) if data_type == "numeric" else None,
+            }
+        return columns
+
+    def start_data_load(
+        self,
+        file_name: str,
+        table_name: str,
+        schema: str = "cad"
+    ) -> Optional[int]:
+        """
+        Open a load log entry with status RUNNING.
+
+        Args:
+            file_name: Source file name
+            table_name: Target table
+            schema: Attached database name
+
+        Returns:
+            Load log id, or None if logging failed
+        """
+        try:
+            with self.get_connection() as conn:
+                cur = conn.execute(
+                    f"""
+                    INSERT INTO {schema}.data_load_log
+                    (file_name, table_name, records_loaded, status, load_start)
+                    VALUES (?, ?, 0, 'RUNNING', CURRENT_TIMESTAMP)
+                    """,
+                    (file_name, table_name)
+                )
+                return cur.lastrowid
+        except Exception as e:
+            logger.warning(f"Could not start load log: {e}")
+            return None
+
+    def log_data_load(
+        self,
+        file_name: str,
+        table_name: str,
+        records_loaded: int,
+        status: str,
+        error_message: Optional[str] = None,
+        schema: str = "cad",
+        load_id: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Log a data load operation.
+
+        Args:
+            file_name: Source file name
+            table_name: Target table
+            records_loaded: Number of records
+            status: Load status (SUCCESS, FAILED, etc.)
+            error_message: Error message if failed
+            schema: Attached database name
+            load_id: Entry from start_data_load to complete (None inserts
+                a new entry)
+
+        Returns:
+            Load log id, or None if logging failed
+        """
+        try:
+            with self.get_connection() as conn:
+                if load_id is not None:
+                    conn.execute(
+                        f"""
+                        UPDATE {schema}.data_load_log
+                        SET records_loaded = ?, status = ?, error_message = ?,
+                            load_end = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                        """,
+                        (records_loaded, status, error_message, load_id)
+                    )
+                    return load_id
+                cur = conn.execute(
+                    f"""
+                    INSERT INTO {schema}.data_load_log
+                    (file_name, table_name, records_loaded, status, error_message, load_end)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    """,
+                    (file_name, table_name, records_loaded, status, error_message)
+                )
+                return cur.lastrowid
+        except Exception as e:
+            logger.warning(f"Could not log data load: {e}")
+            return None
+
+    def get_last_load_status(
+        self,
+        table_name: str,
+        schema: str = "cad",
+        file_name: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get the status of the most recent load of a table.
+
+        Args:
+            table_name: Target table
+            schema: Attached database name
+            file_name: Only consider loads of this source file
+
+        Returns:
+            Status string, or None if the table was never loaded
+        """
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    f"SELECT status FROM {schema}.data_load_log "
+                    f"WHERE table_name = ? AND (? IS NULL OR file_name = ?) "
+                    f"ORDER BY id DESC LIMIT 1",
+                    (table_name, file_name, file_name)
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(f"Could not read load log: {e}")
+            return None
+
+    def get_checkpoint(self, table_name: str, schema: str = "cad") -> Optional[Dict[str, Any]]:
+        """
+        Get the last committed checkpoint of an unfinished load.
+
+        Args:
+            table_name: Target table
+            schema: Attached database name
+
+        Returns:
+            Checkpoint dict, or None if there is none
+        """
+        with self.get_connection() as conn:
+            row = conn.execute(
+                f"""
+                SELECT load_id, file_name, file_size, byte_offset, line_num, records_loaded
+                FROM {schema}.data_load_checkpoint
+                WHERE table_name = ?
+                """,
+                (table_name,)
+            ).fetchone()
+        if not row:
+            return None
+        return dict(zip(
+            ("load_id", "file_name", "file_size", "byte_offset", "line_num", "records_loaded"),
+            row
+        ))
+
+    def write_checkpoint(
+        self,
+        cur,
+        table_name: str,
+        checkpoint: Dict[str, Any],
+        schema: str = "cad"
+    ) -> None:
+        """
+        Record load progress using the caller's cursor.
+
+        Args:
+            cur: Cursor of the loading transaction
+            table_name: Target table
+            checkpoint: Dict with load_id, file_name, file_size,
+                byte_offset, line_num and records_loaded
+            schema: Attached database name
+        """
+        cur.execute(
+            f"""
+            INSERT INTO {schema}.data_load_checkpoint
+            (table_name, load_id, file_name, file_size, byte_offset,
+             line_num, records_loaded, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE SET
+                load_id = excluded.load_id,
+                file_name = excluded.file_name,
+                file_size = excluded.file_size,
+                byte_offset = excluded.byte_offset,
+                line_num = excluded.line_num,
+                records_loaded = excluded.records_loaded,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (
+                table_name, checkpoint["load_id"], checkpoint["file_name"],
+                checkpoint["file_size"], checkpoint["byte_offset"],
+                checkpoint["line_num"], checkpoint["records_loaded"]
+            )
+        )
+
+    def clear_checkpoint(self, table_name: str, schema: str = "cad") -> None:
+        """
+        Remove the checkpoint of a table after its load completes.
+
+        Args:
+            table_name: Target table
+            schema: Attached database name
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    f"DELETE FROM {schema}.data_load_checkpoint WHERE table_name = ?",
+                    (table_name,)
+                )
+        except Exception as e:
+            logger.warning(f"Could not clear checkpoint: {e}")
+
+    def save_column_stats(
+        self,
+        load_id: int,
+        table_name: str,
+        column_stats: List[Dict[str, Any]],
+        schema: str = "cad"
+    ) -> None:
+        """
+        Persist per-column statistics collected during a load.
+
+        Args:
+            load_id: data_load_log id of the load
+            table_name: Target table
+            column_stats: Dicts from FileStats.summary()
+            schema: Attached database name
+        """
+        try:
+            with self.get_connection() as conn, closing(conn.cursor()) as cur:
+                cur.execute("BEGIN")
+                cur.executemany(
+                    f"""
+                    INSERT INTO {schema}.data_load_column_stats
+                    (load_id, table_name, column_name, row_count, null_count,
+                     parse_failures, min_value, max_value, distinct_estimate,
+                     top_values, length_histogram, drift_flags)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            load_id, table_name, stats["column_name"],
+                            stats["row_count"], stats["null_count"],
+                            stats["parse_failures"], stats["min_value"],
+                            stats["max_value"], stats["distinct_estimate"],
+                            json.dumps(stats["top_values"]),
+                            json.dumps(stats["length_histogram"]),
+                            json.dumps(stats["drift_flags"])
+                        )
+                        for stats in column_stats
+                    ]
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Could not save column stats: {e}")
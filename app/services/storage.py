@@ -0,0 +1,587 @@
+"""Storage backend interface shared by the PostgreSQL and SQLite services."""
+
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, Union, Callable
+import logging
+import time
+
+from app.config import (
+    DATABASE_CONFIG,
+    ADAPTIVE_BATCHING,
+    BATCH_SIZE,
+    BATCH_MAX_BYTES,
+    BATCH_MIN_BYTES,
+    BATCH_TARGET_BYTES,
+    CHECKPOINT_EVERY_BATCHES
+)
+from app.models.layout import FileConfig, LayoutConfig
+from app.services.batching import AdaptiveBatcher
+
+
+logger = logging.getLogger("cad_loader")
+
+
+def _record_values(
+    record: Union[Dict[str, Any], Tuple[Any, ...]],
+    columns: List[str]
+) -> Tuple[Any, ...]:
+    """Get insert parameters for a record; tuple records pass through as-is."""
+    if isinstance(record, tuple):
+        return record
+    return tuple(record.get(col) for col in columns)
+
+
+class StorageBackend(ABC):
+    """
+    Operations the data loader needs from a database.
+
+    Subclasses provide connections and backend-specific SQL; the streaming
+    insert loop (batching, savepoint fallback, checkpoint commits) is shared.
+    """
+
+    #: Rows per batch when adaptive batching is off
+    batch_size: int = BATCH_SIZE
+    #: Starting batch size in bytes for adaptive batching
+    batch_bytes: int = BATCH_TARGET_BYTES
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the storage backend.
+
+        Args:
+            config: Database configuration dict. Uses default if None.
+        """
+        self.config = config or DATABASE_CONFIG
+        #: Batch sizing metrics of the most recent insert_records_streaming call
+        self.last_batch_metrics: Dict[str, Any] = {}
+        #: Rows the most recent insert_records_streaming call left out on
+        #: ON CONFLICT DO NOTHING
+        self.last_conflicts = 0
+
+    @abstractmethod
+    def get_connection(self):
+        """Context manager yielding a DB-API connection."""
+
+    @abstractmethod
+    def test_connection(self) -> bool:
+        """Test database connectivity."""
+
+    @abstractmethod
+    def create_tables(self, layout_config: LayoutConfig, schema: str = "cad") -> None:
+        """Create layout and load-tracking tables if they do not exist."""
+
+    @abstractmethod
+    def truncate_table(self, table_name: str, schema: str = "cad") -> bool:
+        """Remove all rows from a table."""
+
+    @abstractmethod
+    def get_table_count(self, table_name: str, schema: str = "cad") -> int:
+        """Get record count for a table."""
+
+    @abstractmethod
+    def get_table_columns(self, table_name: str, schema: str = "cad") -> Dict[str, Dict[str, Any]]:
+        """Get columns in information_schema.columns form, keyed by name."""
+
+    @abstractmethod
+    def start_data_load(self, file_name: str, table_name: str, schema: str = "cad") -> Optional[int]:
+        """Open a load log entry with status RUNNING."""
+
+    @abstractmethod
+    def log_data_load(
+        self,
+        file_name: str,
+        table_name: str,
+        records_loaded: int,
+        status: str,
+        error_message: Optional[str] = None,
+        schema: str = "cad",
+        load_id: Optional[int] = None
+    ) -> Optional[int]:
+        """Record the outcome of a load."""
+
+    @abstractmethod
+    def get_last_load_status(
+        self,
+        table_name: str,
+        schema: str = "cad",
+        file_name: Optional[str] = None
+    ) -> Optional[str]:
+        """Get the status of the most recent load of a table (optionally of one file)."""
+
+    @abstractmethod
+    def get_checkpoint(self, table_name: str, schema: str = "cad") -> Optional[Dict[str, Any]]:
+        """Get the last committed checkpoint of an unfinished load."""
+
+    @abstractmethod
+    def write_checkpoint(
+        self,
+        cur,
+        table_name: str,
+        checkpoint: Dict[str, Any],
+        schema: str = "cad"
+    ) -> None:
+        """Record load progress in the caller's transaction."""
+
+    @abstractmethod
+    def clear_checkpoint(self, table_name: str, schema: str = "cad") -> None:
+        """Remove the checkpoint of a table."""
+
+    @abstractmethod
+    def save_column_stats(
+        self,
+        load_id: int,
+        table_name: str,
+        column_stats: List[Dict[str, Any]],
+        schema: str = "cad"
+    ) -> None:
+        """Persist per-column statistics collected during a load."""
+
+    @abstractmethod
+    def _insert_sql(
+        self,
+        conn,
+        file_config: FileConfig,
+        schema: str,
+        on_conflict: Optional[str] = None
+    ) -> str:
+        """
+        Build the parameterized INSERT statement for a file's table.
+
+        Args:
+            conn: Database connection
+            file_config: File configuration
+            schema: Database schema
+            on_conflict: None for a plain insert; 'first' to ignore rows
+                whose primary key exists, 'last' to overwrite them
+        """
+
+    @abstractmethod
+    def _execute_batch(self, cur, sql_str: str, rows: List[Tuple[Any, ...]]) -> int:
+        """Execute an INSERT for many rows and return how many rows it wrote."""
+
+    def _bulk_connection(self):
+        """Connection context manager used for bulk inserts."""
+        return self.get_connection()
+
+    def _begin(self, cur) -> None:
+        """Start a transaction if the driver does not do so implicitly."""
+
+    def prepare_load(self, file_config: FileConfig, schema: str = "cad") -> None:
+        """
+        Hook run before a table is bulk loaded.
+
+        Args:
+            file_config: File configuration of the table
+            schema: Database schema
+        """
+
+    def finalize_load(
+        self,
+        file_config: FileConfig,
+        schema: str = "cad",
+        clustered: bool = False
+    ) -> None:
+        """
+        Hook run after a table is bulk loaded (e.g. to build indexes).
+
+        Args:
+            file_config: File configuration of the table
+            schema: Database schema
+            clustered: Rows were inserted in ``clusterKey`` order
+        """
+
+    def _stream_cursor(self, conn):
+        """Cursor used by iter_query."""
+        return conn.cursor()
+
+    def iter_query(self, sql_str: str, fetch_size: int = 10000) -> Iterator[Tuple[Any, ...]]:
+        """
+        Run a read query and yield its rows without holding the whole result.
+
+        Args:
+            sql_str: SELECT statement with schema-qualified table names
+            fetch_size: Rows fetched per round trip
+
+        Yields:
+            Result rows as tuples
+        """
+        for _, rows in self.iter_query_batches(sql_str, fetch_size):
+            yield from rows
+
+    def iter_query_batches(
+        self,
+        sql_str: str,
+        fetch_size: int = 10000
+    ) -> Iterator[Tuple[Tuple[Any, ...], List[Tuple[Any, ...]]]]:
+        """
+        Run a read query and yield its rows one fetch at a time.
+
+        Args:
+            sql_str: SELECT statement with schema-qualified table names
+            fetch_size: Rows fetched per round trip
+
+        Yields:
+            Tuples of (DB-API cursor description, rows of the fetch)
+        """
+        with self.get_connection() as conn:
+            cur = self._stream_cursor(conn)
+            try:
+                cur.execute(sql_str)
+                while True:
+                    rows = cur.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    # A named cursor only has a description after its first fetch
+                    yield cur.description, rows
+            finally:
+                cur.close()
+
+    def _write_batch(
+        self,
+        cur,
+        sql_str: str,
+        batch: List[Tuple[Any, ...]],
+        skipped_so_far: int = 0,
+        on_skip: Optional[Callable[[Tuple[Any, ...]], None]] = None
+    ) -> Tuple[int, int]:
+        """
+        Insert a batch inside the current transaction.
+
+        The batch runs under a savepoint; if it fails, rows are retried one
+        by one under their own savepoints so bad records are skipped without
+        discarding earlier uncommitted work.
+
+        Args:
+            cur: Database cursor
+            sql_str: INSERT statement
+            batch: Rows to insert
+            skipped_so_far: Rows already skipped in this load (limits logging)
+            on_skip: Optional callback run with each skipped row
+
+        Returns:
+            Tuple of (rows written, rows skipped); rows left out by ON
+            CONFLICT DO NOTHING are neither
+        """
+        cur.execute("SAVEPOINT cad_batch")
+        try:
+            written = self._execute_batch(cur, sql_str, batch)
+            cur.execute("RELEASE SAVEPOINT cad_batch")
+            return written, 0
+        except Exception:
+            cur.execute("ROLLBACK TO SAVEPOINT cad_batch")
+            cur.execute("RELEASE SAVEPOINT cad_batch")
+
+        inserted = 0
+        skipped = 0
+        for row in batch:
+            cur.execute("SAVEPOINT cad_row")
+            try:
+                cur.execute(sql_str, row)
+                inserted += cur.rowcount
+            except Exception as e:
+                cur.execute("ROLLBACK TO SAVEPOINT cad_row")
+                skipped += 1
+                if skipped_so_far + skipped <= 5:
+                    logger.error(f"Error inserting record: {e}")
+                if on_skip is not None:
+                    on_skip(row)
+            cur.execute("RELEASE SAVEPOINT cad_row")
+        return inserted, skipped
+
+    def insert_records_streaming(
+        self,
+        records_generator: Iterable[Union[Dict[str, Any], Tuple[Any, ...]]],
+        file_config: FileConfig,
+        schema: str = "cad",
+        batch_size: Optional[int] = None,
+        checkpoint: Optional[Callable[[Any, int], None]] = None,
+        checkpoint_every: int = CHECKPOINT_EVERY_BATCHES,
+        on_conflict: Optional[str] = None,
+        on_skip: Optional[Callable[[Tuple[Any, ...]], None]] = None
+    ) -> int:
+        """
+        Insert records from a generator (memory efficient).
+
+        Batches are sized by an AdaptiveBatcher (bytes, tuned from measured
+        write and commit times) unless ``batch_size`` is given or
+        ADAPTIVE_BATCHING is off; the chosen sizes are left in
+        ``last_batch_metrics``.
+
+        Without a checkpoint callback every batch is committed on its own.
+        With one, batches are committed in groups of ``checkpoint_every`` and
+        the callback runs inside each commit's transaction, so the recorded
+        position always matches exactly the rows that were committed.
+
+        Args:
+            records_generator: Generator yielding record dicts or tuples
+                ordered like ``file_config.active_columns``
+            file_config: File configuration
+            schema: Database schema
+            batch_size: Fixed records per batch (adaptive if None)
+            checkpoint: Optional callback(cursor, rows_inserted) that records
+                load progress in the current transaction
+            checkpoint_every: Batches per commit when checkpointing
+            on_conflict: Primary key conflict policy ('first' or 'last');
+                None inserts plainly, so duplicates fail their batch
+            on_skip: Optional callback run with the insert parameters of
+                each bad row the per-row fallback skips
+
+        Returns:
+            Number of records written; rows left out by ON CONFLICT DO
+            NOTHING are not counted (see ``last_conflicts``)
+        """
+        columns = [col.name for col in file_config.active_columns]
+        table_name = file_config.tableName
+
+        batcher = None
+        if batch_size is None and ADAPTIVE_BATCHING:
+            batcher = AdaptiveBatcher(self.batch_bytes, BATCH_MIN_BYTES, BATCH_MAX_BYTES)
+            batch_size = batcher.next_batch_rows()
+        batch_size = batch_size or self.batch_size
+
+        sent = 0
+        inserted = 0
+        skipped = 0
+        batches = 0
+        uncommitted = 0
+        next_log = 10000
+        batch = []
+
+        with self._bulk_connection() as conn:
+            sql_str = self._insert_sql(conn, file_config, schema, on_conflict)
+
+            with closing(conn.cursor()) as cur:
+                self._begin(cur)
+                for record in records_generator:
+                    batch.append(_record_values(record, columns))
+                    sent += 1
+
+                    if len(batch) >= batch_size:
+                        started = time.perf_counter()
+                        batch_inserted, batch_skipped = self._write_batch(
+                            cur, sql_str, batch, skipped, on_skip
+                        )
+                        written = time.perf_counter()
+                        inserted += batch_inserted
+                        skipped += batch_skipped
+                        batches += 1
+                        uncommitted += 1
+
+                        if checkpoint is None or batches % checkpoint_every == 0:
+                            if checkpoint is not None:
+                                checkpoint(cur, inserted)
+                            conn.commit()
+                            self._begin(cur)
+                            if batcher is not None:
+                                batcher.record_commit(time.perf_counter() - written, uncommitted)
+                            uncommitted = 0
+
+                        if batcher is not None:
+                            batcher.record(batch, written - started)
+                            batch_size = batcher.next_batch_rows()
+                        batch = []
+
+                        if inserted >= next_log:
+                            logger.info(f"Inserted {inserted} records into {table_name}")
+                            next_log = (inserted // 10000 + 1) * 10000
+
+                # Insert remaining records
+                if batch:
+                    started = time.perf_counter()
+                    batch_inserted, batch_skipped = self._write_batch(
+                        cur, sql_str, batch, skipped, on_skip
+                    )
+                    inserted += batch_inserted
+                    skipped += batch_skipped
+                    batches += 1
+                    if batcher is not None:
+                        batcher.record(batch, time.perf_counter() - started)
+                if checkpoint is not None:
+                    checkpoint(cur, inserted)
+                conn.commit()
+
+        if batcher is not None:
+            self.last_batch_metrics = batcher.metrics()
+        else:
+            self.last_batch_metrics = {"batches": batches, "batch_rows": batch_size}
+        self.last_conflicts = sent - inserted - skipped
+        if skipped > 0:
+            logger.warning(f"Skipped {skipped} bad records")
+        logger.info(f"Completed inserting {inserted} records into {schema}.{table_name}")
+        return inserted
+
+
+class NullStorage(StorageBackend):
+    """
+    Backend that discards every record.
+
+    Loading into it runs the full read/parse/check pipeline without any
+    database work, which separates parser cost from database cost. Only
+    per-table row counts are kept.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the null backend.
+
+        Args:
+            config: Database configuration dict (unused beyond defaults)
+        """
+        super().__init__(config)
+        self._counts: Dict[str, int] = {}
+
+    @contextmanager
+    def get_connection(self):
+        """Yield no connection."""
+        yield None
+
+    def test_connection(self) -> bool:
+        """Always available."""
+        return True
+
+    def create_tables(self, layout_config: LayoutConfig, schema: str = "cad") -> None:
+        """Nothing to create."""
+
+    def truncate_table(self, table_name: str, schema: str = "cad") -> bool:
+        """Reset the table's row count."""
+        self._counts[table_name] = 0
+        return True
+
+    def get_table_count(self, table_name: str, schema: str = "cad") -> int:
+        """Get the number of records consumed for a table."""
+        return self._counts.get(table_name, 0)
+
+    def get_table_columns(self, table_name: str, schema: str = "cad") -> Dict[str, Dict[str, Any]]:
+        """No tables exist."""
+        return {}
+
+    def start_data_load(self, file_name: str, table_name: str, schema: str = "cad") -> Optional[int]:
+        """Loads are not logged."""
+        return None
+
+    def log_data_load(
+        self,
+        file_name: str,
+        table_name: str,
+        records_loaded: int,
+        status: str,
+        error_message: Optional[str] = None,
+        schema: str = "cad",
+        load_id: Optional[int] = None
+    ) -> Optional[int]:
+        """Loads are not logged."""
+        return None
+
+    def get_last_load_status(
+        self,
+        table_name: str,
+        schema: str = "cad",
+        file_name: Optional[str] = None
+    ) -> Optional[str]:
+        """Loads are not logged."""
+        return None
+
+    def get_checkpoint(self, table_name: str, schema: str = "cad") -> Optional[Dict[str, Any]]:
+        """Loads are never resumed."""
+        return None
+
+    def write_checkpoint(
+        self,
+        cur,
+        table_name: str,
+        checkpoint: Dict[str, Any],
+        schema: str = "cad"
+    ) -> None:
+        """Loads are never resumed."""
+
+    def clear_checkpoint(self, table_name: str, schema: str = "cad") -> None:
+        """Loads are never resumed."""
+
+    def save_column_stats(
+        self,
+        load_id: int,
+        table_name: str,
+        column_stats: List[Dict[str, Any]],
+        schema: str = "cad"
+    ) -> None:
+        """Statistics are not persisted."""
+
+    def _insert_sql(
+        self,
+        conn,
+        file_config: FileConfig,
+        schema: str,
+        on_conflict: Optional[str] = None
+    ) -> str:
+        """No SQL is generated."""
+        return ""
+
+    def _execute_batch(self, cur, sql_str: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Rows are discarded."""
+
+    def iter_query(self, sql_str: str, fetch_size: int = 10000) -> Iterator[Tuple[Any, ...]]:
+        """Nothing is stored, so queries return no rows."""
+        return iter(())
+
+    def iter_query_batches(
+        self,
+        sql_str: str,
+        fetch_size: int = 10000
+    ) -> Iterator[Tuple[Tuple[Any, ...], List[Tuple[Any, ...]]]]:
+        """Nothing is stored, so queries return no rows."""
+        return iter(())
+
+    def insert_records_streaming(
+        self,
+        records_generator: Iterable[Union[Dict[str, Any], Tuple[Any, ...]]],
+        file_config: FileConfig,
+        schema: str = "cad",
+        batch_size: Optional[int] = None,
+        checkpoint: Optional[Callable[[Any, int], None]] = None,
+        checkpoint_every: int = CHECKPOINT_EVERY_BATCHES,
+        on_conflict: Optional[str] = None,
+        on_skip: Optional[Callable[[Tuple[Any, ...]], None]] = None
+    ) -> int:
+        """
+        Consume records without storing them.
+
+        Returns:
+            Number of records consumed
+        """
+        consumed = 0
+        for _ in records_generator:
+            consumed += 1
+        table_name = file_config.tableName
+        self._counts[table_name] = self._counts.get(table_name, 0) + consumed
+        return consumed
+
+
+def create_storage(config: Optional[Dict[str, Any]] = None) -> StorageBackend:
+    """
+    Create the storage backend selected by ``config['backend']``.
+
+    Backends are imported lazily so SQLite works without psycopg2 installed.
+    The ``null`` backend discards records (parse-only runs).
+
+    Args:
+        config: Database configuration dict. Uses default if None.
+
+    Returns:
+        Storage backend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    config = config or DATABASE_CONFIG
+    backend = config.get("backend", "postgres").lower()
+
+    if backend in ("postgres", "postgresql"):
+        from app.services.database import DatabaseService
+        return DatabaseService(config)
+    if backend == "sqlite":
+        from app.services.sqlite_database import SQLiteDatabaseService
+        return SQLiteDatabaseService(config)
+    if backend == "null":
+        return NullStorage(config)
+    raise ValueError(f"Unknown database backend: {backend}")
@@ -0,0 +1,71 @@
+"""Deterministic profiling helpers for loader runs."""
+
+import cProfile
+import io
+import pstats
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def hotspots(stats: pstats.Stats, top: int = 10) -> List[Dict[str, Any]]:
+    """
+    Get the functions with the most self time.
+
+    Args:
+        stats: Profile statistics
+        top: Number of functions to return
+
+    Returns:
+        Dicts with function, calls, self_seconds and cumulative_seconds
+    """
+    rows = []
+    for (file_name, line, func), (_, calls, self_time, cum_time, _) in stats.stats.items():
+        # Built-ins have no source location
+        name = f"{func} ({Path(file_name).name}:{line})" if line else func
+        rows.append({
+            "function": name,
+            "calls": calls,
+            "self_seconds": self_time,
+            "cumulative_seconds": cum_time,
+        })
+    rows.sort(key=lambda row: row["self_seconds"], reverse=True)
+    return rows[:top]
+
+
+def profile_call(
+    func: Callable[..., Any],
+    *args: Any,
+    output_path: Path,
+    top: int = 20,
+    **kwargs: Any
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Run a function under cProfile and save its profile.
+
+    Writes ``output_path`` (.prof, readable with pstats or snakeviz) and a
+    text report next to it (.txt) listing the top functions by self time
+    and by cumulative time.
+
+    Args:
+        func: Function to profile
+        *args: Positional arguments for func
+        output_path: Path of the .prof file to write
+        top: Number of functions in the report and returned hotspots
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Tuple of (func's return value, hotspots)
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(output_path))
+
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report)
+    stats.sort_stats("tottime").print_stats(top)
+    stats.sort_stats("cumulative").print_stats(top)
+    output_path.with_suffix(".txt").write_text(report.getvalue(), encoding="utf-8")
+
+    return result, hotspots(stats, top)
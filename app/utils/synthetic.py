@@ -0,0 +1,170 @@
+"""Synthetic fixed-width record generation for benchmarks and test loads."""
+
+import random
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from app.models.layout import FileConfig, ColumnConfig, LayoutConfig
+
+
+_WORDS = [
+    "OAK", "ELM", "CEDAR", "PARK", "GATEWAY", "FORNEY", "TERRELL", "KAUFMAN",
+    "LN", "DR", "ST", "BLVD", "CT", "LLC", "TRUST", "HOMES", "SMITH", "JONES",
+    "LOT", "BLK", "PH", "ADDITION", "ESTATES", "RANCH", "CREEK", "HILL",
+]
+
+# Records per property of the child files in a synthetic export
+CHILD_ROWS_PER_PROP = {
+    "ENTITY_INFO": 3,
+    "IMPROVEMENT_DETAIL": 3,
+    "IMPROVEMENT_DETAIL_ATTR": 4,
+}
+
+# Records in each lookup file (ENTITY, STATE_CODE, ...) of a synthetic export
+REFERENCE_ROWS = 20
+
+
+def _synthetic_value(
+    column: ColumnConfig,
+    rng: random.Random,
+    prop_id: int,
+    tax_year: int
+) -> str:
+    """
+    Produce a raw field value that fits the column width.
+
+    Args:
+        column: Column configuration
+        rng: Random number generator
+        prop_id: Property ID for the current record
+        tax_year: Tax year for year columns
+
+    Returns:
+        Raw (unpadded) field text
+    """
+    data_type = column.dataType.upper()
+
+    if column.name in ("prop_id", "parent_prop_id"):
+        return str(prop_id)
+    if column.name in ("tax_year", "prop_val_yr"):
+        return str(tax_year)
+    if "year" in column.name or column.name.endswith("_yr"):
+        return str(rng.randint(1950, tax_year))
+    if column.codeMappings:
+        return rng.choice(list(column.codeMappings))
+    if data_type in ("INTEGER", "INT", "BIGINT", "DECIMAL"):
+        digits = rng.randint(1, min(column.length, 9))
+        return str(rng.randint(0, 10 ** digits - 1))
+    if column.length <= 2:
+        return rng.choice("YNABCF")[:column.length]
+
+    words = []
+    size = 0
+    target = rng.randint(1, column.length)
+    while size < target:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:column.length]
+
+
+def synthetic_line(
+    file_config: FileConfig,
+    rng: random.Random,
+    prop_id: int,
+    tax_year: int = 2025
+) -> str:
+    """
+    Build one fixed-width line matching a file layout.
+
+    Skipped columns are left blank, like filler areas in the real export.
+
+    Args:
+        file_config: Layout for the file type
+        rng: Random number generator
+        prop_id: Property ID to embed in the record
+        tax_year: Tax year to embed in year columns
+
+    Returns:
+        Fixed-width line without a trailing newline
+    """
+    width = max(end for _, _, end in file_config.column_spans)
+    buffer = [" "] * width
+
+    for column, start, end in file_config.column_spans:
+        value = _synthetic_value(column, rng, prop_id, tax_year)
+        data_type = column.dataType.upper()
+        if data_type in ("INTEGER", "INT", "BIGINT", "DECIMAL"):
+            value = value.rjust(column.length, "0")
+        else:
+            value = value.ljust(column.length)
+        buffer[start:end] = value[:end - start]
+
+    return "".join(buffer)
+
+
+def synthetic_lines(
+    file_config: FileConfig,
+    count: int,
+    seed: Optional[int] = 42,
+    first_prop_id: int = 100000,
+    rows_per_prop: int = 1
+) -> Iterator[str]:
+    """
+    Generate fixed-width lines ordered by prop_id.
+
+    Args:
+        file_config: Layout for the file type
+        count: Number of lines to generate
+        seed: Random seed for reproducible output
+        first_prop_id: Property ID of the first record
+        rows_per_prop: Records generated per property (child files)
+
+    Yields:
+        Fixed-width lines without trailing newlines
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        yield synthetic_line(file_config, rng, first_prop_id + i // rows_per_prop)
+
+
+def write_synthetic_export(
+    out_dir: Path,
+    layout_config: LayoutConfig,
+    properties: int,
+    seed: int = 42,
+    first_prop_id: int = 100000
+) -> Dict[str, Path]:
+    """
+    Write a full synthetic export: one file per layout, named like the real one.
+
+    INFO gets one record per property and every file referencing it gets
+    ``CHILD_ROWS_PER_PROP`` records (default 1) for each of the same
+    prop_ids, so loads pass the integrity checks. Lookup files get
+    ``REFERENCE_ROWS`` records.
+
+    Args:
+        out_dir: Directory to write the files to
+        layout_config: Layout configuration
+        properties: Number of properties
+        seed: Random seed for reproducible output
+        first_prop_id: Property ID of the first property
+
+    Returns:
+        Written file paths keyed by file type
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for file_config in layout_config.files:
+        if file_config.fileName == "INFO" or file_config.references:
+            rows_per_prop = CHILD_ROWS_PER_PROP.get(file_config.fileName, 1)
+            count = properties * rows_per_prop
+        else:
+            rows_per_prop = 1
+            count = REFERENCE_ROWS
+        path = out_dir / f"{layout_config.filePrefix}{file_config.fileName}.TXT"
+        with open(path, "w", encoding=layout_config.encoding, newline="") as f:
+            for line in synthetic_lines(file_config, count, seed, first_prop_id, rows_per_prop):
+                f.write(line + "\n")
+        paths[file_config.fileName] = path
+    return paths
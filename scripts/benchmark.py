@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Loader Benchmark
+Measures parser throughput, per-record memory and database write
+throughput on synthetic records
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import closing
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models.layout import load_layout_config
+from app.services.file_reader import parse_line, parse_line_tuple
+from app.services.storage import create_storage
+from app.utils.synthetic import synthetic_lines
+from app.config import CONFIG_DIR, DATABASE_CONFIG
+
+BENCH_SCHEMA = "cad_bench"
+
+
+def bench_dict(lines, file_config):
+    """Old path: dict per record, then a column-ordered tuple for the insert."""
+    columns = file_config.column_names
+    rows = []
+    for line in lines:
+        record = parse_line(line, file_config)
+        rows.append((record, tuple(record.get(col) for col in columns)))
+    return rows
+
+
+def bench_tuple(lines, file_config):
+    """Tuple path: one column-ordered tuple consumed directly by the insert."""
+    return [parse_line_tuple(line, file_config) for line in lines]
+
+
+def run_parser_benchmark(file_config, lines, repeat):
+    """Time each record mode and measure retained memory per record"""
+    results = {}
+    for name, func in (("dict", bench_dict), ("tuple", bench_tuple)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(lines, file_config)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        rows = func(lines, file_config)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+
+        results[name] = {
+            "rate": len(lines) / best,
+            "bytes_per_record": current / len(lines),
+        }
+    return results
+
+
+def run_db_benchmark(backend, layout_config, file_types, records, workdir):
+    """
+    Time bulk inserts of pre-parsed rows into a scratch schema.
+
+    Postgres writes to the cad_bench schema, which is dropped afterwards;
+    SQLite writes to a temporary database file.
+
+    Each table is loaded twice: with the backend's fixed batch_size and
+    with adaptive (byte-based) batching.
+
+    Returns:
+        Dict of (records/s, batch rows) keyed by (file type, batching mode),
+        or None if the backend is unavailable
+    """
+    config = dict(DATABASE_CONFIG, backend=backend, schema=BENCH_SCHEMA,
+                  sqlite_path=str(Path(workdir) / "bench.db"))
+    storage = create_storage(config)
+    if not storage.test_connection():
+        return None
+
+    storage.create_tables(layout_config, BENCH_SCHEMA)
+    results = {}
+    try:
+        for file_type in file_types:
+            file_config = layout_config.get_file_config(file_type)
+            rows = [parse_line_tuple(line, file_config)
+                    for line in synthetic_lines(file_config, records)]
+            for mode, batch_size in (("fixed", storage.batch_size), ("adaptive", None)):
+                storage.truncate_table(file_config.tableName, BENCH_SCHEMA)
+                start = time.perf_counter()
+                storage.prepare_load(file_config, BENCH_SCHEMA)
+                storage.insert_records_streaming(rows, file_config, BENCH_SCHEMA, batch_size)
+                storage.finalize_load(file_config, BENCH_SCHEMA)
+                metrics = storage.last_batch_metrics
+                results[(file_type, mode)] = (
+                    len(rows) / (time.perf_counter() - start),
+                    metrics.get("final_batch_rows", metrics.get("batch_rows"))
+                )
+    finally:
+        if backend == "postgres":
+            with storage.get_connection() as conn, closing(conn.cursor()) as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+                conn.commit()
+    return results
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the CAD record parser")
+    parser.add_argument("--tables", nargs="+", default=["INFO", "ENTITY_INFO", "IMPROVEMENT_DETAIL"],
+                        help="File types to benchmark")
+    parser.add_argument("--records", type=int, default=20000,
+                        help="Synthetic records per file type")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timing repetitions (best is reported)")
+    parser.add_argument("--db", nargs="*", choices=["sqlite", "postgres"],
+                        help="Also benchmark database writes (default: both backends)")
+    args = parser.parse_args()
+
+    layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+
+    print("=" * 70)
+    print("  PARSER BENCHMARK (synthetic records)")
+    print("=" * 70)
+    print(f"  {'File':24} {'Mode':6} {'Records/s':>12} {'Bytes/record':>14}")
+    print("-" * 70)
+
+    for file_type in args.tables:
+        file_config = layout_config.get_file_config(file_type)
+        if not file_config:
+            print(f"  {file_type:24} unknown file type")
+            continue
+
+        lines = list(synthetic_lines(file_config, args.records))
+        results = run_parser_benchmark(file_config, lines, args.repeat)
+
+        for mode, stats in results.items():
+            print(f"  {file_type:24} {mode:6} {stats['rate']:>12,.0f} "
+                  f"{stats['bytes_per_record']:>14,.0f}")
+
+    print("=" * 70)
+
+    if args.db is not None:
+        file_types = [t for t in args.tables if layout_config.get_file_config(t)]
+        print()
+        print("=" * 70)
+        print("  DATABASE WRITE BENCHMARK (pre-parsed rows, incl. index build)")
+        print("=" * 70)
+        print(f"  {'File':24} {'Backend':10} {'Batching':9} {'Records/s':>12} {'Batch rows':>11}")
+        print("-" * 70)
+        with tempfile.TemporaryDirectory() as workdir:
+            for backend in args.db or ["sqlite", "postgres"]:
+                results = run_db_benchmark(
+                    backend, layout_config, file_types, args.records, workdir
+                )
+                if results is None:
+                    print(f"  {'(all)':24} {backend:10} {'unavailable':>12}")
+                    continue
+                for (file_type, mode), (rate, batch_rows) in results.items():
+                    print(f"  {file_type:24} {backend:10} {mode:9} {rate:>12,.0f} {batch_rows:>11,}")
+        print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
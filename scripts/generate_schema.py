@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Schema Generator
+Generates table DDL from config/file_layouts.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models.layout import load_layout_config
+from app.services.schema import generate_schema_ddl
+from app.config import CONFIG_DIR, DATABASE_CONFIG
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Generate table DDL from the file layout")
+    parser.add_argument("--config", type=Path, default=CONFIG_DIR / "file_layouts.json",
+                        help="Layout configuration JSON")
+    parser.add_argument("--schema", default=DATABASE_CONFIG["schema"],
+                        help="Database schema name")
+    parser.add_argument("--dialect", choices=["postgres", "sqlite"], default="postgres",
+                        help="SQL dialect to generate")
+    parser.add_argument("--output", type=Path,
+                        help="Write DDL to this file instead of stdout")
+    args = parser.parse_args()
+
+    layout_config = load_layout_config(args.config)
+    ddl = generate_schema_ddl(layout_config, args.schema, args.dialect)
+
+    if args.output:
+        args.output.write_text(ddl, encoding="utf-8")
+        print(f"✅ Wrote {len(layout_config.files) + len(layout_config.derived_files)} tables to {args.output}")
+    else:
+        sys.stdout.write(ddl)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Ingest Daemon
+Watches a drop folder and loads each complete new export automatically
+"""
+
+import argparse
+import signal
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.models.layout import load_layout_config
+from app.services.ingest import DropIngester
+from app.services.storage import create_storage
+from app.config import (
+    CONFIG_DIR,
+    DATA_DIR,
+    DATABASE_CONFIG,
+    INGEST_POLL_SECONDS,
+    INGEST_SETTLE_SECONDS
+)
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Watch a drop folder and load new exports as they land"
+    )
+    parser.add_argument("--watch-dir", type=Path, default=DATA_DIR.parent,
+                        help="Drop folder; exports may sit in it or in its subdirectories")
+    parser.add_argument("--poll-seconds", type=float, default=INGEST_POLL_SECONDS,
+                        help=f"Seconds between scans (default: {INGEST_POLL_SECONDS})")
+    parser.add_argument("--settle-seconds", type=float, default=INGEST_SETTLE_SECONDS,
+                        help="Seconds a drop's files must stay unchanged before loading "
+                             f"(default: {INGEST_SETTLE_SECONDS})")
+    parser.add_argument("--require", nargs="+", default=["INFO"], metavar="TYPE",
+                        help="File types a drop must contain (default: INFO)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Tables of a group loaded in parallel processes (default: 1)")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Insert property tables in prop_id, tax_year order")
+    parser.add_argument("--check-integrity", action="store_true",
+                        help="Quarantine child records whose prop_id is not in INFO")
+    parser.add_argument("--dedup", choices=["first", "last"],
+                        help="Upsert tables that declare a primaryKey")
+    parser.add_argument("--stats", action="store_true",
+                        help="Profile every column while parsing and save the statistics")
+    parser.add_argument("--features", action="store_true",
+                        help="Rebuild cad.property_features after each drop")
+    parser.add_argument("--once", action="store_true",
+                        help="Load whatever is ready after one settle period, then exit")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    print("=" * 70)
+    print("  KAUFMAN CAD INGEST DAEMON")
+    print("=" * 70)
+    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Drop Folder: {args.watch_dir}")
+    print(f"  Backend: {DATABASE_CONFIG['backend']}")
+    print("=" * 70)
+    print()
+
+    logger = setup_logger("ingest_daemon", level="INFO")
+
+    stop = False
+
+    def request_stop(signum, frame):
+        nonlocal stop
+        logger.info("Stop requested; finishing the current drop")
+        stop = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    try:
+        if not args.watch_dir.is_dir():
+            raise FileNotFoundError(f"Drop folder not found: {args.watch_dir}")
+        layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+        if DATABASE_CONFIG["backend"] == "sqlite":
+            # The embedded database has no setup step; create tables on demand
+            create_storage(DATABASE_CONFIG).create_tables(layout_config, DATABASE_CONFIG["schema"])
+
+        ingester = DropIngester(
+            args.watch_dir,
+            DATABASE_CONFIG,
+            layout_config,
+            required=args.require,
+            settle_seconds=args.settle_seconds,
+            workers=args.workers,
+            load_options={
+                "cluster": args.cluster,
+                "check_integrity": args.check_integrity,
+                "dedup": args.dedup,
+                "collect_stats": args.stats,
+            },
+            features=args.features
+        )
+
+        if args.once:
+            ingester.ready_drops()
+            time.sleep(args.settle_seconds)
+            results = ingester.poll()
+            failed = [r for r in results if r["status"] in ("FAILED", "PARTIAL")]
+            logger.info(f"{len(results)} drop(s) processed")
+            return 1 if failed else 0
+
+        ingester.run(args.poll_seconds, should_stop=lambda: stop)
+        logger.info("Ingest daemon stopped")
+        return 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
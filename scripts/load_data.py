@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 """
 Kaufman CAD Data Loader
-Loads fixed-width CAD data files into PostgreSQL database
+Loads fixed-width CAD data files into PostgreSQL (or embedded SQLite)
 """
 
+import argparse
 import sys
+from functools import partial
 from pathlib import Path
 import time
 from datetime import datetime
@@ -14,79 +16,124 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.utils.logging_config import setup_logger
+from app.utils.profiling import profile_call
 from app.models.layout import load_layout_config
-from app.services.database import DatabaseService
-from app.services.loader import DataLoader
-from app.config import DATA_DIR, CONFIG_DIR, DATABASE_CONFIG
+from app.services.storage import create_storage
+from app.services.loader import LOADING_ORDER, DataLoader, load_in_order
+from app.services.file_reader import get_file_path
+from app.services.sampling import PropertySample
+from app.config import DATA_DIR, CONFIG_DIR, DATABASE_CONFIG, SAMPLE_MIN_PER_STRATUM
 
-def print_banner():
+def print_banner(data_dir=DATA_DIR):
     """Print startup banner"""
     print("=" * 70)
     print("  KAUFMAN CAD DATA LOADER")
     print("  Kaufman County Central Appraisal District")
     print("=" * 70)
     print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"  Data Directory: {DATA_DIR}")
+    print(f"  Data Directory: {data_dir}")
     print(f"  Config Directory: {CONFIG_DIR}")
     print("=" * 70)
     print()
 
-def load_tables(loader, logger):
-    """Load all data tables in the correct order"""
-    
-    # Define loading order: reference tables first, then main tables
-    loading_order = [
-        {
-            "name": "Reference Tables",
-            "tables": ["HEADER", "STATE_CODE", "COUNTRY_CODE", "ABSTRACT_SUBDV", "AGENT", "ENTITY"]
-        },
-        {
-            "name": "Main Property Tables",
-            "tables": ["INFO", "LAND_DETAIL", "IMPROVEMENT_INFO", "IMPROVEMENT_DETAIL", 
-                      "IMPROVEMENT_DETAIL_ATTR"]
-        },
-        {
-            "name": "Entity and Relationship Tables",
-            "tables": ["ENTITY_INFO", "ENTITY_TOTALS"]
-        },
-        {
-            "name": "Additional Tables",
-            "tables": ["LAWSUIT", "MOBILE_HOME_INFO", "TAX_DEFERRAL_INFO", "UDI"]
-        }
-    ]
+def run_table(loader, table, load_options, profile_dir=None, profile_top=20):
+    """Load one table, under cProfile when a profile directory is given"""
+    if profile_dir is None:
+        return loader.load_file(table, **load_options)
+    
+    profile_path = Path(profile_dir) / f"{table}.prof"
+    result, top = profile_call(
+        loader.load_file, table, output_path=profile_path, top=profile_top, **load_options
+    )
+    result["profile"] = str(profile_path)
+    result["hotspots"] = top
+    return result
+
+def report_result(logger, table, result):
+    """Log one table's load result and return its record count"""
+    if result["status"] == "SKIPPED":
+        logger.info(f"⏭️  {table}: already loaded, skipped")
+        return 0
+    if result["status"] != "SUCCESS":
+        logger.error(f"❌ {table}: {result.get('error', 'Unknown error')}")
+        return 0
+    
+    duration = result.get('duration_seconds', 0)
+    records = result['records_loaded']
+    
+    logger.info(f"✅ {table}: {records:,} records in {duration:.1f}s")
+    if result.get("clustered"):
+        logger.info(f"   Clustered ({result['clustered']})")
+    if result.get("duplicates"):
+        logger.warning(f"   Duplicate keys: {result['duplicates']:,} "
+                       f"(e.g. {result['duplicate_samples'][:3]})")
+    reconciliation = result.get("reconciliation")
+    if reconciliation:
+        discrepancies = reconciliation["discrepancies"]
+        sources = ", ".join(reconciliation["sources"]) or "no totals"
+        if discrepancies:
+            logger.warning(f"   Totals: {len(discrepancies):,} discrepancies "
+                           f"across {reconciliation['groups']:,} groups vs {sources}")
+        else:
+            logger.info(f"   Totals: {reconciliation['groups']:,} groups reconciled vs {sources}")
+    if result.get("drift_warnings"):
+        logger.warning(f"   Layout drift: {len(result['drift_warnings']):,} column warning(s)")
+    if result.get("quarantine_file"):
+        logger.warning(f"   Orphans {result['orphans']} -> {result['quarantine_file']}")
+    
+    if duration > 0:
+        rate = records / duration
+        logger.info(f"   Rate: {rate:,.0f} records/second")
+    batching = result.get("batching")
+    if batching and "final_batch_rows" in batching:
+        logger.info(f"   Batches: {batching['batches']:,} "
+                    f"({batching['min_batch_rows']:,}-{batching['max_batch_rows']:,} rows, "
+                    f"settled at {batching['final_batch_rows']:,} rows / "
+                    f"{batching['final_target_bytes'] // 1024:,} KB)")
+    
+    if result.get("hotspots"):
+        logger.info(f"   Profile: {result['profile']} (report: .txt)")
+        for spot in result["hotspots"][:5]:
+            logger.info(f"     {spot['self_seconds']:8.3f}s self {spot['calls']:>10,} calls  "
+                        f"{spot['function']}")
+    return records
+
+def load_tables(loader, logger, load_options, tables=None, workers=1,
+                profile_dir=None, profile_top=20):
+    """
+    Load data tables in the correct order
     
+    Groups load one after another; with several workers the tables of a
+    group load in parallel processes.
+    """
+    total_tables = sum(
+        len([t for t in group["tables"] if not tables or t in tables]) for group in LOADING_ORDER
+    )
     overall_start = time.time()
     total_records = 0
-    total_tables = sum(len(group["tables"]) for group in loading_order)
     tables_loaded = 0
     
-    for group in loading_order:
+    def on_group(name, group_tables):
         logger.info(f"\n{'='*70}")
-        logger.info(f"Loading {group['name']}")
+        logger.info(f"Loading {name}")
         logger.info(f"{'='*70}")
-        
-        for table in group["tables"]:
-            tables_loaded += 1
-            logger.info(f"\n[{tables_loaded}/{total_tables}] Loading {table}...")
-            
-            try:
-                result = loader.load_file(table)
-                
-                if result["status"] == "SUCCESS":
-                    duration = result.get('duration_seconds', 0)
-                    records = result['records_loaded']
-                    total_records += records
-                    
-                    logger.info(f"✅ {table}: {records:,} records in {duration:.1f}s")
-                    
-                    if duration > 0:
-                        rate = records / duration
-                        logger.info(f"   Rate: {rate:,.0f} records/second")
-                else:
-                    logger.error(f"❌ {table}: {result.get('error', 'Unknown error')}")
-                    
-            except Exception as e:
-                logger.error(f"❌ {table}: Error - {str(e)}")
+        if workers > 1:
+            logger.info(f"Loading {', '.join(group_tables)} with {workers} workers...")
+    
+    def on_result(table, result):
+        nonlocal total_records, tables_loaded
+        tables_loaded += 1
+        logger.info(f"\n[{tables_loaded}/{total_tables}] {table}")
+        total_records += report_result(logger, table, result)
+    
+    load_in_order(
+        loader, load_options,
+        file_types=tables,
+        workers=workers,
+        run=partial(run_table, profile_dir=profile_dir, profile_top=profile_top),
+        on_group=on_group,
+        on_result=on_result
+    )
     
     overall_duration = time.time() - overall_start
     
@@ -96,7 +143,8 @@ def load_tables(loader, logger):
     logger.info(f"Tables loaded: {tables_loaded}")
     logger.info(f"Total records: {total_records:,}")
     logger.info(f"Total time: {overall_duration:.1f}s ({overall_duration/60:.1f} minutes)")
-    logger.info(f"Average rate: {total_records/overall_duration:,.0f} records/second")
+    if overall_duration > 0:
+        logger.info(f"Average rate: {total_records/overall_duration:,.0f} records/second")
     logger.info(f"{'='*70}\n")
 
 def verify_data(db_service, logger):
@@ -129,9 +177,75 @@ def verify_data(db_service, logger):
     logger.info(f"  {'TOTAL':40} {total:>10,}")
     logger.info("="*70 + "\n")
 
+def parse_args():
+    """Parse command-line arguments"""
+    all_tables = [t for group in LOADING_ORDER for t in group["tables"]]
+    parser = argparse.ArgumentParser(description="Load Kaufman CAD data files into PostgreSQL")
+    parser.add_argument("--tables", nargs="+", choices=all_tables, metavar="TABLE",
+                        help="File types to load (default: all). Choices: " + ", ".join(all_tables))
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parallel worker processes per table group (default: 1)")
+    parser.add_argument("--max-records", type=int,
+                        help="Load at most this many records per table")
+    parser.add_argument("--sample", type=float, metavar="FRACTION",
+                        help="Load a consistent hash-based sample of properties "
+                             "(e.g. 0.01) across INFO and every child table")
+    parser.add_argument("--sample-seed", type=int, default=0,
+                        help="Seed choosing which properties are sampled (default: 0)")
+    parser.add_argument("--stratify", metavar="COLUMN",
+                        help="Sample the same share of every value of an INFO column, "
+                             "e.g. prop_type_cd or situs_city")
+    parser.add_argument("--sample-min", type=int, default=SAMPLE_MIN_PER_STRATUM,
+                        help="Fewest properties sampled of each --stratify value "
+                             f"(default: {SAMPLE_MIN_PER_STRATUM})")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="Directory containing the data files")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue interrupted loads from their last checkpoint "
+                             "and skip tables that already loaded")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Insert property detail tables in prop_id, tax_year order "
+                             "(sorting unsorted files) and build BRIN indexes")
+    parser.add_argument("--check-integrity", action="store_true",
+                        help="Quarantine child records whose prop_id (or UDI parent_prop_id) "
+                             "is not in INFO")
+    parser.add_argument("--dedup", choices=["first", "last"],
+                        help="Upsert tables that declare a primaryKey, keeping the first "
+                             "or last record of each repeated key")
+    parser.add_argument("--reconcile", action="store_true",
+                        help="Sum ENTITY_INFO values per entity while loading and "
+                             "reconcile them against ENTITY_TOTALS")
+    parser.add_argument("--export-totals", type=Path, metavar="JSON",
+                        help="Also reconcile against totals from the export totals report "
+                             "(implies --reconcile)")
+    parser.add_argument("--stats", action="store_true",
+                        help="Profile every column while parsing and save the statistics "
+                             "to cad.data_load_column_stats")
+    parser.add_argument("--features", action="store_true",
+                        help="After loading, pivot improvement attributes, living area and "
+                             "year built into cad.property_features")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each table's load with cProfile")
+    parser.add_argument("--profile-dir", type=Path, default=project_root / "profiles",
+                        help="Where --profile writes <TABLE>.prof and <TABLE>.txt")
+    parser.add_argument("--profile-top", type=int, default=20,
+                        help="Functions listed in each profile report")
+    parser.add_argument("--null-sink", action="store_true",
+                        help="Parse and check records but discard them instead of writing "
+                             "to the database (measures parser cost alone)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.sample is not None and not 0 < args.sample <= 1:
+        parser.error("--sample must be in (0, 1]")
+    if args.stratify and args.sample is None:
+        parser.error("--stratify requires --sample")
+    return args
+
 def main():
     """Main entry point"""
-    print_banner()
+    args = parse_args()
+    print_banner(args.data_dir)
     
     # Setup logging
     logger = setup_logger("data_loader", level="INFO")
@@ -144,22 +258,86 @@ def main():
         logger.info(f"   File types configured: {len(layout_config.files)}")
         
         # Connect to database
-        logger.info("\nConnecting to database...")
-        db_service = DatabaseService(DATABASE_CONFIG)
-        logger.info(f"✅ Database connected: {DATABASE_CONFIG['database']}@{DATABASE_CONFIG['host']}")
+        db_config = dict(DATABASE_CONFIG)
+        if args.null_sink:
+            db_config["backend"] = "null"
+            logger.info("\nNull sink: records are parsed and discarded (no database)")
+        else:
+            logger.info("\nConnecting to database...")
+        db_service = create_storage(db_config)
+        if db_config["backend"] == "sqlite":
+            # The embedded database has no setup step; create tables on demand
+            db_service.create_tables(layout_config, db_config["schema"])
+            logger.info(f"✅ SQLite database ready: {db_config['sqlite_path']}")
+        elif not args.null_sink:
+            logger.info(f"✅ Database connected: {db_config['database']}@{db_config['host']}")
         
         # Initialize loader
         loader = DataLoader(
             config_path=CONFIG_DIR / "file_layouts.json",
-            data_dir=DATA_DIR,
+            data_dir=args.data_dir,
             db_service=db_service
         )
         
-        # Load all tables
-        load_tables(loader, logger)
+        if not args.null_sink:
+            # Fail fast if tables have drifted from the layout
+            logger.info("\nChecking schema against layout...")
+            drift = loader.check_schema(args.tables)
+            if drift:
+                for file_type, problems in drift.items():
+                    for problem in problems:
+                        logger.error(f"❌ {file_type}: {problem}")
+                logger.error("Schema does not match file_layouts.json. "
+                             "Regenerate it with scripts/generate_schema.py")
+                return 1
+            logger.info("✅ Schema matches layout")
+        
+        sample = None
+        if args.sample is not None:
+            if args.stratify:
+                sample = PropertySample.stratified(
+                    get_file_path(args.data_dir, layout_config.filePrefix, "INFO"),
+                    layout_config,
+                    args.stratify,
+                    args.sample,
+                    seed=args.sample_seed,
+                    min_per_stratum=args.sample_min
+                )
+            else:
+                sample = PropertySample(args.sample, seed=args.sample_seed)
+            logger.info(f"\nSampling properties: {sample}")
+        
+        # Load tables
+        load_options = {
+            "max_records": args.max_records,
+            "check_schema": not args.null_sink,
+            "collect_stats": args.stats,
+            "resume": args.resume,
+            "cluster": args.cluster,
+            "check_integrity": args.check_integrity,
+            "dedup": args.dedup,
+            "reconcile": args.reconcile or args.export_totals is not None,
+            "export_totals": args.export_totals,
+            "sample": sample,
+        }
+        load_tables(
+            loader, logger, load_options,
+            tables=args.tables,
+            workers=args.workers,
+            profile_dir=args.profile_dir if args.profile else None,
+            profile_top=args.profile_top
+        )
+        
+        if args.features:
+            logger.info(f"\n{'='*70}")
+            logger.info("Building Property Features")
+            logger.info(f"{'='*70}")
+            result = loader.build_features(check_schema=not args.null_sink, sample=sample)
+            report_result(logger, result["file_type"], result)
         
-        # Verify data
-        verify_data(db_service, logger)
+        if not args.null_sink:
+            # Verify data
+            verify_data(db_service, logger)
         
         logger.info("✅ Data loading completed successfully!")
         return 0
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Property Lookup Service
+Local HTTP service answering parcel lookups from in-memory indexes
+
+Endpoints:
+    GET /property/<prop_id>            Parcel details with entity values
+    GET /search/owner?q=SMITH&limit=20 Owner name prefix search
+    GET /search/address?q=ARBOR DR     Situs address prefix search
+    GET /metrics                       Cache statistics and p50/p99 latency
+    GET /health                        Liveness check
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.services.lookup import PropertyLookup
+from app.services.storage import create_storage
+from app.config import DATABASE_CONFIG, LOOKUP_CACHE_SIZE, LOOKUP_HOST, LOOKUP_PORT
+
+# Upper bound on the limit parameter of searches
+MAX_LIMIT = 500
+
+def make_handler(lookup):
+    """Build a request handler class bound to a PropertyLookup"""
+
+    class LookupHandler(BaseHTTPRequestHandler):
+        """Routes GET requests to the lookup service"""
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            parts = [part for part in url.path.split("/") if part]
+
+            if parts == ["health"]:
+                return self.send_json(200, b'{"status": "ok"}')
+            if parts == ["metrics"]:
+                return self.send_json(200, json.dumps(lookup.metrics()).encode())
+            if len(parts) == 2 and parts[0] == "property":
+                return self.send_json(*lookup.lookup("property", unquote(parts[1])))
+            if len(parts) == 2 and parts[0] == "search" and parts[1] in ("owner", "address"):
+                query = params.get("q", [""])[0]
+                try:
+                    limit = min(int(params.get("limit", ["20"])[0]), MAX_LIMIT)
+                except ValueError:
+                    return self.send_json(400, b'{"error": "limit must be an integer"}')
+                return self.send_json(*lookup.lookup(parts[1], query, limit))
+            return self.send_json(404, b'{"error": "unknown endpoint"}')
+
+        def send_json(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Per-request access logs would dominate sub-millisecond lookups
+            pass
+
+    return LookupHandler
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description="Serve property lookups from memory")
+    parser.add_argument("--host", default=LOOKUP_HOST,
+                        help=f"Address to bind (default: {LOOKUP_HOST})")
+    parser.add_argument("--port", type=int, default=LOOKUP_PORT,
+                        help=f"Port to listen on (default: {LOOKUP_PORT})")
+    parser.add_argument("--cache-size", type=int, default=LOOKUP_CACHE_SIZE,
+                        help="Responses kept in the LRU cache")
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    print("=" * 70)
+    print("  KAUFMAN CAD PROPERTY LOOKUP SERVICE")
+    print("=" * 70)
+    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Listening: http://{args.host}:{args.port}")
+    print("=" * 70)
+    print()
+
+    logger = setup_logger("lookup_service", level="INFO")
+
+    try:
+        logger.info("Building in-memory indexes...")
+        lookup = PropertyLookup(
+            create_storage(DATABASE_CONFIG),
+            schema=DATABASE_CONFIG["schema"],
+            cache_size=args.cache_size
+        )
+        logger.info(f"✅ {len(lookup.records):,} parcels indexed in {lookup.load_seconds:.1f}s")
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(lookup))
+        logger.info(f"✅ Serving on http://{args.host}:{args.port} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopping")
+        finally:
+            server.server_close()
+        return 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
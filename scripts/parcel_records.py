@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Parcel Records
+Prints every raw export record of one parcel using sidecar byte-offset indexes
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.models.layout import load_layout_config
+from app.services.file_reader import get_file_path
+from app.services.offset_index import lookup_records, open_offset_index
+from app.config import CONFIG_DIR, DATA_DIR, OFFSET_INDEX_EVERY
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Fetch one parcel's records from the raw export files"
+    )
+    parser.add_argument("prop_id", type=int, nargs="?",
+                        help="Property ID to fetch (omit with --build to only index)")
+    parser.add_argument("--files", nargs="+", metavar="TYPE",
+                        help="File types to search (default: every type with a prop_id)")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="Directory containing the data files")
+    parser.add_argument("--index-dir", type=Path,
+                        help="Where sidecar indexes are kept (default: next to the data files)")
+    parser.add_argument("--every", type=int, default=OFFSET_INDEX_EVERY,
+                        help="Lines per sparse index entry; 1 indexes every line "
+                             f"(default: {OFFSET_INDEX_EVERY})")
+    parser.add_argument("--build", action="store_true",
+                        help="Build missing or stale indexes up front")
+    args = parser.parse_args()
+    if args.prop_id is None and not args.build:
+        parser.error("a prop_id is required unless --build is given")
+    if args.every < 1:
+        parser.error("--every must be at least 1")
+    return args
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    logger = setup_logger("parcel_records", level="INFO")
+
+    try:
+        layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+        file_types = args.files or [
+            fc.fileName for fc in layout_config.files if "prop_id" in fc.column_names
+        ]
+
+        found = 0
+        for file_type in file_types:
+            file_config = layout_config.get_file_config(file_type)
+            if file_config is None:
+                raise ValueError(f"Unknown file type: {file_type}")
+            path = get_file_path(args.data_dir, layout_config.filePrefix, file_type)
+            if not path.exists():
+                logger.warning(f"{file_type}: {path.name} not found")
+                continue
+
+            index = open_offset_index(path, file_config, args.index_dir, args.every)
+            if args.prop_id is None:
+                continue
+
+            start = time.perf_counter()
+            records = list(lookup_records(
+                path, file_config, index, args.prop_id, layout_config.encoding
+            ))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            found += len(records)
+            print(f"# {file_type}: {len(records)} record(s) in {elapsed_ms:.2f} ms")
+            for record in records:
+                print(json.dumps(record, default=str))
+
+        if args.prop_id is not None and not found:
+            logger.warning(f"prop_id {args.prop_id} not found")
+        return 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Query Benchmark
+Times the analysis queries, captures their EXPLAIN plans and flags
+regressions against a baseline run
+"""
+
+import argparse
+import sys
+import tempfile
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.utils.synthetic import write_synthetic_export
+from app.models.layout import load_layout_config
+from app.services.storage import create_storage
+from app.services.loader import DataLoader
+from app.services.sampling import PropertySample
+from app.services.query_bench import (
+    append_history,
+    compare_runs,
+    latest_baseline,
+    parse_sql_file,
+    read_history,
+    run_benchmark
+)
+from app.config import (
+    CONFIG_DIR,
+    DATABASE_CONFIG,
+    QUERY_BENCH_HISTORY,
+    QUERY_BENCH_MIN_MS,
+    QUERY_BENCH_THRESHOLD,
+    SQL_DIR
+)
+
+DEFAULT_SQL = [
+    SQL_DIR / "examples" / "basic_queries.sql",
+    SQL_DIR / "examples" / "analysis_queries.sql",
+]
+
+# Tables counted with every run so runs on different data are recognized
+DATASET_TABLES = [
+    "cad.appraisal_info",
+    "cad.appraisal_entity_info",
+    "cad.appraisal_land_detail",
+    "cad.appraisal_improvement_info",
+]
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the analysis queries and compare them with a baseline"
+    )
+    parser.add_argument("--sql", nargs="+", type=Path, default=DEFAULT_SQL,
+                        help="SQL files to run (default: sql/examples/*_queries.sql)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Timed runs per query; the median is compared (default: 5)")
+    parser.add_argument("--timeout-ms", type=int, default=60000,
+                        help="statement_timeout per query (default: 60000)")
+    parser.add_argument("--history", type=Path, default=QUERY_BENCH_HISTORY,
+                        help="Run history file (JSON lines)")
+    parser.add_argument("--baseline", action="store_true",
+                        help="Record this run as the new baseline")
+    parser.add_argument("--label",
+                        help="Free-form label stored with the run (e.g. a commit)")
+    parser.add_argument("--threshold", type=float, default=QUERY_BENCH_THRESHOLD,
+                        help="Relative slowdown flagged as a regression "
+                             f"(default: {QUERY_BENCH_THRESHOLD})")
+    parser.add_argument("--min-ms", type=float, default=QUERY_BENCH_MIN_MS,
+                        help=f"Smallest absolute slowdown flagged (default: {QUERY_BENCH_MIN_MS})")
+    parser.add_argument("--watch", nargs="+", default=["appraisal_info"], metavar="TABLE",
+                        help="Tables whose new sequential scans are flagged "
+                             "(default: appraisal_info)")
+    seed = parser.add_mutually_exclusive_group()
+    seed.add_argument("--seed-synthetic", type=int, metavar="PROPERTIES",
+                      help="Reload the database with a synthetic export of this many "
+                           "properties before benchmarking")
+    seed.add_argument("--seed-dir", type=Path,
+                      help="Reload the database from this export directory before "
+                           "benchmarking")
+    parser.add_argument("--sample", type=float, metavar="FRACTION",
+                        help="With --seed-dir, load only a consistent sample of properties")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.sample is not None and args.seed_dir is None:
+        parser.error("--sample requires --seed-dir")
+    return args
+
+def seed_database(db_service, data_dir, sample, logger):
+    """Replace the tables' contents with an export and refresh planner statistics"""
+    layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+    db_service.create_tables(layout_config)
+    db_service.execute_sql_file(SQL_DIR / "002_indexes_and_logging.sql")
+    loader = DataLoader(
+        config_path=CONFIG_DIR / "file_layouts.json",
+        data_dir=data_dir,
+        db_service=db_service
+    )
+    results = loader.load_all_files(sample=sample, dedup="first", features=True)
+    failed = [r["file_type"] for r in results if r["status"] != "SUCCESS"]
+    if failed:
+        raise RuntimeError(f"Seeding failed for {', '.join(failed)}")
+    with db_service.get_connection() as conn, closing(conn.cursor()) as cur:
+        cur.execute("ANALYZE")
+        conn.commit()
+    logger.info(f"✅ Seeded {sum(r['records_loaded'] for r in results):,} records")
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    print("=" * 70)
+    print("  KAUFMAN CAD QUERY BENCHMARK")
+    print("=" * 70)
+    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Database: {DATABASE_CONFIG['database']}@{DATABASE_CONFIG['host']}")
+    print(f"  History: {args.history}")
+    print("=" * 70)
+    print()
+
+    logger = setup_logger("query_benchmark", level="INFO")
+
+    try:
+        if DATABASE_CONFIG["backend"] != "postgres":
+            raise ValueError("The query benchmark needs PostgreSQL (EXPLAIN ANALYZE, BUFFERS)")
+        db_service = create_storage(DATABASE_CONFIG)
+        if not db_service.test_connection():
+            raise ConnectionError("Cannot connect to the database")
+
+        if args.seed_synthetic:
+            with tempfile.TemporaryDirectory(prefix="cad_synthetic_") as data_dir:
+                layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+                write_synthetic_export(Path(data_dir), layout_config, args.seed_synthetic)
+                seed_database(db_service, Path(data_dir), None, logger)
+        elif args.seed_dir:
+            sample = PropertySample(args.sample) if args.sample is not None else None
+            seed_database(db_service, args.seed_dir, sample, logger)
+
+        queries = [query for path in args.sql for query in parse_sql_file(path)]
+        logger.info(f"Running {len(queries)} queries, {args.repeat} timed runs each")
+        run = run_benchmark(
+            db_service, queries, args.repeat, DATASET_TABLES, args.timeout_ms
+        )
+        run["label"] = args.label
+        run["database"] = f"{DATABASE_CONFIG['database']}@{DATABASE_CONFIG['host']}"
+
+        history = read_history(args.history)
+        baseline = latest_baseline(history)
+        findings = []
+        if baseline is None:
+            logger.info("No baseline yet; this run becomes the baseline")
+            run["baseline"] = True
+        else:
+            findings = compare_runs(
+                run, baseline, args.threshold, args.min_ms, args.watch
+            )
+            run["baseline"] = args.baseline
+            run["compared_to"] = baseline["timestamp"]
+        run["findings"] = findings
+        append_history(args.history, run)
+
+        logger.info(f"\n{'='*70}")
+        if baseline is not None:
+            logger.info(f"Compared with baseline of {baseline['timestamp']}")
+        for finding in findings:
+            log = logger.info if finding["kind"] == "data" else logger.warning
+            log(f"  [{finding['kind']}] {finding['query']}: {finding['detail']}")
+        regressions = [f for f in findings if f["kind"] != "data"]
+        if regressions:
+            logger.warning(f"❌ {len(regressions)} regression(s) or plan change(s)")
+        else:
+            logger.info("✅ No regressions")
+        if run["baseline"]:
+            logger.info("Recorded as the new baseline")
+        logger.info(f"{'='*70}\n")
+        return 2 if regressions else 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
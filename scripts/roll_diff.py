@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Roll Diff
+Writes the parcel changes between two exports (rolls or supplements)
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.models.layout import load_layout_config
+from app.services.roll_diff import CHANGE_TYPES, Roll, diff_rolls, find_roll_file, write_change_feed
+from app.config import CONFIG_DIR, CLUSTER_SORT_MEMORY_MB, REPORTS_DIR
+
+def find_roll(data_dir, with_values):
+    """Locate the INFO (and ENTITY_INFO) files of an export directory"""
+    info_path = find_roll_file(data_dir, "INFO")
+    if info_path is None:
+        raise FileNotFoundError(f"No INFO file in {data_dir}")
+    entity_info_path = find_roll_file(data_dir, "ENTITY_INFO") if with_values else None
+    return Roll(info_path, entity_info_path)
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Stream-compare two exports and write a parcel change feed"
+    )
+    parser.add_argument("--old", type=Path, required=True,
+                        help="Directory of the earlier export")
+    parser.add_argument("--new", type=Path, required=True,
+                        help="Directory of the later export")
+    parser.add_argument("--output", type=Path, default=REPORTS_DIR / "roll_changes.csv",
+                        help="Change feed file (.csv, or .jsonl for JSON lines)")
+    parser.add_argument("--no-values", action="store_true",
+                        help="Skip ENTITY_INFO and report owner and mailing changes only")
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    print("=" * 70)
+    print("  KAUFMAN CAD ROLL DIFF")
+    print("=" * 70)
+    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Old Export: {args.old}")
+    print(f"  New Export: {args.new}")
+    print("=" * 70)
+    print()
+
+    logger = setup_logger("roll_diff", level="INFO")
+
+    try:
+        layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+        old = find_roll(args.old, not args.no_values)
+        new = find_roll(args.new, not args.no_values)
+        if not args.no_values and (old.entity_info_path is None or new.entity_info_path is None):
+            logger.warning("ENTITY_INFO missing from an export; value changes are not reported")
+
+        start = time.time()
+        counts = write_change_feed(
+            diff_rolls(old, new, layout_config, CLUSTER_SORT_MEMORY_MB * 1024 * 1024),
+            args.output
+        )
+        duration = time.time() - start
+
+        logger.info(f"\n{'='*70}")
+        logger.info("CHANGE SUMMARY")
+        logger.info(f"{'='*70}")
+        for change_type in CHANGE_TYPES:
+            logger.info(f"  {change_type:16} {counts.get(change_type, 0):>10,}")
+        logger.info(f"Change feed: {args.output}")
+        logger.info(f"Total time: {duration:.1f}s")
+        logger.info(f"{'='*70}\n")
+        return 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
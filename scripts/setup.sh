@@ -179,7 +179,9 @@ if [ "$RECORD_COUNT" -gt "0" ]; then
         SKIP_LOAD=true
     else
         log_info "Recreating database schema..."
-        docker exec kaufman_cad_db psql -U cad_user -d kaufman_cad -f /docker-entrypoint-initdb.d/001_create_schema.sql
+        for sql_file in sql/*.sql; do
+            docker exec kaufman_cad_db psql -U cad_user -d kaufman_cad -f "/docker-entrypoint-initdb.d/$(basename "$sql_file")"
+        done
         SKIP_LOAD=false
     fi
 else
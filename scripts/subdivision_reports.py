@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Subdivision Reports
+Writes an ownership, investor and value report for every subdivision
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.services.reports import REPORT_FORMATS, generate_reports
+from app.services.storage import create_storage
+from app.config import DATABASE_CONFIG, REPORTS_DIR
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate ownership and value reports for every subdivision"
+    )
+    parser.add_argument("--output-dir", type=Path, default=REPORTS_DIR / "subdivisions",
+                        help="Directory for the reports and index.csv")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="csv",
+                        help="csv: a directory of CSVs per subdivision; "
+                             "json: one JSON file per subdivision")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes building reports (default: CPU count)")
+    parser.add_argument("--min-properties", type=int, default=1,
+                        help="Skip subdivisions with fewer properties")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    print("=" * 70)
+    print("  KAUFMAN CAD SUBDIVISION REPORTS")
+    print("=" * 70)
+    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Output Directory: {args.output_dir}")
+    print("=" * 70)
+    print()
+
+    logger = setup_logger("subdivision_reports", level="INFO")
+
+    try:
+        storage = create_storage(DATABASE_CONFIG)
+        start = time.time()
+        index = generate_reports(
+            storage,
+            args.output_dir,
+            workers=args.workers,
+            report_format=args.format,
+            schema=DATABASE_CONFIG["schema"],
+            min_properties=args.min_properties
+        )
+        duration = time.time() - start
+
+        logger.info(f"\n{'='*70}")
+        logger.info("REPORT SUMMARY")
+        logger.info(f"{'='*70}")
+        logger.info(f"Subdivisions: {len(index):,}")
+        logger.info(f"Properties: {sum(row['total_properties'] for row in index):,}")
+        logger.info(f"Index: {args.output_dir / 'index.csv'}")
+        logger.info(f"Total time: {duration:.1f}s")
+
+        top = sorted(index, key=lambda row: row["investor_count"], reverse=True)[:10]
+        if top:
+            logger.info("\nMost investor-owned subdivisions:")
+            for row in top:
+                logger.info(f"  {row['abs_subdv_cd']:10} {row['description'][:30]:30} "
+                            f"{row['investor_count']:>6,} of {row['total_properties']:>6,} "
+                            f"({row['investor_pct']:.1f}%)")
+        logger.info(f"{'='*70}\n")
+        return 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Kaufman CAD Value Rollup
+Computes per-property value rollups straight from the export files (no database)
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.logging_config import setup_logger
+from app.models.layout import load_layout_config
+from app.services.file_reader import get_file_path
+from app.services.rollup import STRATEGIES, iter_rollup, value_rollup_sources, write_rollup
+from app.config import CONFIG_DIR, DATA_DIR, REPORTS_DIR, ROLLUP_MEMORY_MB
+
+def parse_args():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Roll up land, improvement and entity values per property from the raw files"
+    )
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="Directory containing the data files")
+    parser.add_argument("--output", type=Path, default=REPORTS_DIR / "value_rollup.csv",
+                        help="Rollup file (.csv, or .jsonl for JSON lines)")
+    parser.add_argument("--memory-mb", type=int, default=ROLLUP_MEMORY_MB,
+                        help=f"Memory for hash aggregation before spilling to disk "
+                             f"(default: {ROLLUP_MEMORY_MB})")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="auto",
+                        help="merge (sorted files), hash (any order), or auto to check each file")
+    return parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    print("=" * 70)
+    print("  KAUFMAN CAD VALUE ROLLUP")
+    print("=" * 70)
+    print(f"  Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  Data Directory: {args.data_dir}")
+    print(f"  Memory Budget: {args.memory_mb} MB")
+    print("=" * 70)
+    print()
+
+    logger = setup_logger("value_rollup", level="INFO")
+
+    try:
+        layout_config = load_layout_config(CONFIG_DIR / "file_layouts.json")
+        paths = {}
+        for source in value_rollup_sources(layout_config):
+            path = get_file_path(args.data_dir, layout_config.filePrefix, source.file_type)
+            if path.exists():
+                paths[source.file_type] = path
+
+        start = time.time()
+        rows = write_rollup(
+            iter_rollup(
+                paths, layout_config,
+                memory_bytes=args.memory_mb * 1024 * 1024,
+                strategy=args.strategy
+            ),
+            args.output
+        )
+        duration = time.time() - start
+
+        logger.info(f"\n{'='*70}")
+        logger.info(f"✅ {rows:,} properties rolled up in {duration:.1f}s")
+        logger.info(f"Rollup file: {args.output}")
+        logger.info(f"{'='*70}\n")
+        return 0
+
+    except Exception as e:
+        logger.error(f"\n❌ Fatal error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+-- Kaufman CAD Secondary Indexes and Load Tracking
+-- Table definitions live in 001_create_schema.sql (generated from the layout)
+
+SET search_path TO cad, public;
+
+-- =====================================================
+-- Indexes for Performance
+-- =====================================================
+
+-- Property info indexes
+CREATE INDEX IF NOT EXISTS idx_appraisal_info_prop_id ON cad.appraisal_info(prop_id);
+CREATE INDEX IF NOT EXISTS idx_appraisal_info_year ON cad.appraisal_info(prop_val_yr);
+CREATE INDEX IF NOT EXISTS idx_appraisal_info_legal_desc ON cad.appraisal_info USING gin(to_tsvector('english', legal_desc));
+CREATE INDEX IF NOT EXISTS idx_info_owner ON cad.appraisal_info(owner_id);
+CREATE INDEX IF NOT EXISTS idx_info_situs_city ON cad.appraisal_info(situs_city);
+CREATE INDEX IF NOT EXISTS idx_info_situs_zip ON cad.appraisal_info(situs_zip);
+CREATE INDEX IF NOT EXISTS idx_info_abs_subdv ON cad.appraisal_info(abs_subdv_cd);
+
+-- Entity info indexes
+CREATE INDEX IF NOT EXISTS idx_entity_info_entity ON cad.appraisal_entity_info(entity_cd);
+
+-- Land detail indexes
+CREATE INDEX IF NOT EXISTS idx_land_state_cd ON cad.appraisal_land_detail(state_cd);
+CREATE INDEX IF NOT EXISTS idx_land_type ON cad.appraisal_land_detail(land_type_cd);
+
+-- Improvement indexes
+CREATE INDEX IF NOT EXISTS idx_impr_info_type ON cad.appraisal_improvement_info(impr_type_cd);
+CREATE INDEX IF NOT EXISTS idx_impr_info_year ON cad.appraisal_improvement_info(year_built);
+
+CREATE INDEX IF NOT EXISTS idx_impr_detail_attr_prop 
+    ON cad.appraisal_improvement_detail_attr(prop_id, tax_year, impr_id, detail_id);
+
+-- Property feature indexes (comparable-home searches)
+CREATE INDEX IF NOT EXISTS idx_features_living_area ON cad.property_features(living_area);
+CREATE INDEX IF NOT EXISTS idx_features_year_built ON cad.property_features(year_built);
+CREATE INDEX IF NOT EXISTS idx_features_beds_baths ON cad.property_features(bedrooms, bathrooms);
+
+-- Supplementary table indexes
+CREATE INDEX IF NOT EXISTS idx_lawsuit_prop ON cad.appraisal_lawsuit(prop_id, tax_year);
+CREATE INDEX IF NOT EXISTS idx_mobile_home_prop ON cad.appraisal_mobile_home_info(prop_id, tax_year);
+CREATE INDEX IF NOT EXISTS idx_tax_deferral_prop ON cad.appraisal_tax_deferral_info(prop_id, tax_year);
+CREATE INDEX IF NOT EXISTS idx_udi_prop ON cad.appraisal_udi(prop_id);
+
+-- =====================================================
+-- Data Load Tracking
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS cad.data_load_log (
+    id SERIAL PRIMARY KEY,
+    file_name VARCHAR(100) NOT NULL,
+    table_name VARCHAR(50) NOT NULL,
+    records_loaded INTEGER,
+    load_start TIMESTAMP,
+    load_end TIMESTAMP,
+    status VARCHAR(20),
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Last committed position of an unfinished load (one row per table)
+CREATE TABLE IF NOT EXISTS cad.data_load_checkpoint (
+    table_name VARCHAR(50) PRIMARY KEY,
+    load_id INTEGER REFERENCES cad.data_load_log(id) ON DELETE CASCADE,
+    file_name VARCHAR(100) NOT NULL,
+    file_size BIGINT,
+    byte_offset BIGINT NOT NULL,
+    line_num BIGINT NOT NULL,
+    records_loaded BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-column statistics collected while a file is parsed
+CREATE TABLE IF NOT EXISTS cad.data_load_column_stats (
+    id SERIAL PRIMARY KEY,
+    load_id INTEGER REFERENCES cad.data_load_log(id) ON DELETE CASCADE,
+    table_name VARCHAR(50) NOT NULL,
+    column_name VARCHAR(50) NOT NULL,
+    row_count BIGINT,
+    null_count BIGINT,
+    parse_failures BIGINT,
+    min_value TEXT,
+    max_value TEXT,
+    distinct_estimate BIGINT,
+    top_values JSONB,
+    length_histogram JSONB,
+    drift_flags JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_column_stats_load ON cad.data_load_column_stats(load_id);
+
+-- Grant permissions
+GRANT ALL PRIVILEGES ON SCHEMA cad TO cad_user;
+GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA cad TO cad_user;
+GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA cad TO cad_user;
@@ -0,0 +1,84 @@
+-- Analysis Queries for Kaufman CAD Database
+-- The canonical queries behind the Gateway Parks notebook
+-- (analysis/gateway_parks_analysis.ipynb), also run by scripts/query_benchmark.py
+
+-- ========================================
+-- 1. GATEWAY PARKS VALUE ROLLUP
+-- ========================================
+
+-- Every Gateway Parks property with land, improvement and market values
+WITH property_values AS (
+    SELECT
+        i.prop_id,
+        i.owner_name,
+        i.mail_addr_line1 as mail_address,
+        i.mail_city,
+        i.mail_state,
+        i.mail_zip,
+        i.situs_street,
+        i.situs_city,
+        i.situs_zip,
+        i.legal_desc,
+        i.prop_val_yr,
+        MAX(e.assessed_val) as appraised_value,
+        SUM(CASE WHEN l.state_cd = 'HS' THEN l.appraised_val ELSE 0 END) as land_homesite_value,
+        SUM(CASE WHEN l.state_cd != 'HS' OR l.state_cd IS NULL THEN COALESCE(l.appraised_val, 0) ELSE 0 END) as land_non_homesite_value,
+        SUM(CASE WHEN l.ag_flag = 'Y' THEN COALESCE(l.mkt_val, 0) - COALESCE(l.prod_val, 0) ELSE 0 END) as ag_market_valuation,
+        SUM(CASE WHEN imp.homesite_flag = 'Y' THEN COALESCE(imp.appraised_val, 0) ELSE 0 END) as improvement_homesite_value,
+        SUM(CASE WHEN imp.homesite_flag != 'Y' OR imp.homesite_flag IS NULL THEN COALESCE(imp.appraised_val, 0) ELSE 0 END) as improvement_non_homesite_value
+    FROM cad.appraisal_info i
+    LEFT JOIN cad.appraisal_entity_info e
+        ON i.prop_id = e.prop_id AND i.prop_val_yr = e.tax_year
+    LEFT JOIN cad.appraisal_land_detail l
+        ON i.prop_id = l.prop_id AND i.prop_val_yr = l.tax_year
+    LEFT JOIN cad.appraisal_improvement_info imp
+        ON i.prop_id = imp.prop_id AND i.prop_val_yr = imp.tax_year
+    WHERE UPPER(i.legal_desc) LIKE '%GATEWAY PARK%'
+    GROUP BY
+        i.prop_id, i.owner_name, i.mail_addr_line1, i.mail_city, i.mail_state,
+        i.mail_zip, i.situs_street, i.situs_city, i.situs_zip, i.legal_desc, i.prop_val_yr
+)
+SELECT
+    *,
+    (improvement_homesite_value + improvement_non_homesite_value +
+     land_homesite_value + land_non_homesite_value + ag_market_valuation) as market_value
+FROM property_values
+ORDER BY situs_street;
+
+-- ========================================
+-- 2. STREET-LEVEL INVESTOR STATS
+-- ========================================
+
+-- Owner-occupied vs investor-owned properties and values per Gateway Parks street
+-- (an owner whose mailing city is the property's city is counted as owner-occupied)
+WITH properties AS (
+    SELECT
+        i.prop_id,
+        TRIM(i.situs_street) as street_name,
+        CASE
+            WHEN COALESCE(TRIM(i.mail_city), '') = '' OR COALESCE(TRIM(i.situs_city), '') = '' THEN 'Unknown'
+            WHEN UPPER(TRIM(i.mail_city)) = UPPER(TRIM(i.situs_city)) THEN 'Owner-Occupied'
+            ELSE 'Investor/Non-Owner'
+        END as occupancy_status,
+        v.appraised_value
+    FROM cad.appraisal_info i
+    LEFT JOIN (
+        SELECT prop_id, tax_year, MAX(assessed_val) as appraised_value
+        FROM cad.appraisal_entity_info
+        GROUP BY prop_id, tax_year
+    ) v ON v.prop_id = i.prop_id AND v.tax_year = i.prop_val_yr
+    WHERE UPPER(i.legal_desc) LIKE '%GATEWAY PARK%'
+)
+SELECT
+    street_name,
+    COUNT(*) as total_properties,
+    ROUND(AVG(appraised_value)) as avg_value,
+    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY appraised_value) as median_value,
+    MIN(appraised_value) as min_value,
+    MAX(appraised_value) as max_value,
+    COUNT(*) FILTER (WHERE occupancy_status = 'Owner-Occupied') as owner_occupied_count,
+    COUNT(*) FILTER (WHERE occupancy_status = 'Investor/Non-Owner') as investor_count,
+    ROUND(100.0 * COUNT(*) FILTER (WHERE occupancy_status = 'Investor/Non-Owner') / COUNT(*), 1) as investor_pct
+FROM properties
+GROUP BY street_name
+ORDER BY total_properties DESC, street_name;
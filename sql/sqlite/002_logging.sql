@@ -0,0 +1,45 @@
+-- Kaufman CAD Load Tracking (SQLite)
+-- SQLite counterpart of the tracking tables in ../002_indexes_and_logging.sql.
+-- The database file is attached as "cad", so tables keep their cad. prefix.
+
+CREATE TABLE IF NOT EXISTS cad.data_load_log (
+    id INTEGER PRIMARY KEY,
+    file_name VARCHAR(100) NOT NULL,
+    table_name VARCHAR(50) NOT NULL,
+    records_loaded INTEGER,
+    load_start TIMESTAMP,
+    load_end TIMESTAMP,
+    status VARCHAR(20),
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS cad.data_load_checkpoint (
+    table_name VARCHAR(50) PRIMARY KEY,
+    load_id INTEGER REFERENCES data_load_log(id) ON DELETE CASCADE,
+    file_name VARCHAR(100) NOT NULL,
+    file_size BIGINT,
+    byte_offset BIGINT NOT NULL,
+    line_num BIGINT NOT NULL,
+    records_loaded BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS cad.data_load_column_stats (
+    id INTEGER PRIMARY KEY,
+    load_id INTEGER REFERENCES data_load_log(id) ON DELETE CASCADE,
+    table_name VARCHAR(50) NOT NULL,
+    column_name VARCHAR(50) NOT NULL,
+    row_count BIGINT,
+    null_count BIGINT,
+    parse_failures BIGINT,
+    min_value TEXT,
+    max_value TEXT,
+    distinct_estimate BIGINT,
+    top_values TEXT,
+    length_histogram TEXT,
+    drift_flags TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS cad.idx_column_stats_load ON data_load_column_stats(load_id);
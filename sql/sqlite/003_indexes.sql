@@ -0,0 +1,23 @@
+-- Kaufman CAD Secondary Indexes (SQLite)
+-- Built per table after its bulk load by SQLiteDatabaseService.finalize_load,
+-- and dropped before the next load so inserts do not maintain them.
+
+CREATE INDEX IF NOT EXISTS cad.idx_appraisal_info_prop_id ON appraisal_info(prop_id);
+CREATE INDEX IF NOT EXISTS cad.idx_appraisal_info_year ON appraisal_info(prop_val_yr);
+CREATE INDEX IF NOT EXISTS cad.idx_info_owner ON appraisal_info(owner_id);
+CREATE INDEX IF NOT EXISTS cad.idx_info_situs_city ON appraisal_info(situs_city);
+CREATE INDEX IF NOT EXISTS cad.idx_info_situs_zip ON appraisal_info(situs_zip);
+CREATE INDEX IF NOT EXISTS cad.idx_info_abs_subdv ON appraisal_info(abs_subdv_cd);
+CREATE INDEX IF NOT EXISTS cad.idx_entity_info_entity ON appraisal_entity_info(entity_cd);
+CREATE INDEX IF NOT EXISTS cad.idx_land_state_cd ON appraisal_land_detail(state_cd);
+CREATE INDEX IF NOT EXISTS cad.idx_land_type ON appraisal_land_detail(land_type_cd);
+CREATE INDEX IF NOT EXISTS cad.idx_impr_info_type ON appraisal_improvement_info(impr_type_cd);
+CREATE INDEX IF NOT EXISTS cad.idx_impr_info_year ON appraisal_improvement_info(year_built);
+CREATE INDEX IF NOT EXISTS cad.idx_impr_detail_attr_prop ON appraisal_improvement_detail_attr(prop_id, tax_year, impr_id, detail_id);
+CREATE INDEX IF NOT EXISTS cad.idx_features_living_area ON property_features(living_area);
+CREATE INDEX IF NOT EXISTS cad.idx_features_year_built ON property_features(year_built);
+CREATE INDEX IF NOT EXISTS cad.idx_features_beds_baths ON property_features(bedrooms, bathrooms);
+CREATE INDEX IF NOT EXISTS cad.idx_lawsuit_prop ON appraisal_lawsuit(prop_id, tax_year);
+CREATE INDEX IF NOT EXISTS cad.idx_mobile_home_prop ON appraisal_mobile_home_info(prop_id, tax_year);
+CREATE INDEX IF NOT EXISTS cad.idx_tax_deferral_prop ON appraisal_tax_deferral_info(prop_id, tax_year);
+CREATE INDEX IF NOT EXISTS cad.idx_udi_prop ON appraisal_udi(prop_id);
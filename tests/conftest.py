@@ -0,0 +1,50 @@
+"""Shared fixtures: the real layout and a small synthetic export written from it."""
+
+from pathlib import Path
+from typing import Callable, Dict
+import random
+
+import pytest
+
+from app.config import CONFIG_DIR, DATABASE_CONFIG
+from app.models.layout import LayoutConfig, load_layout_config
+from app.services.storage import StorageBackend, create_storage
+from app.utils.synthetic import write_synthetic_export
+
+
+# Properties in the synthetic export
+PROPERTIES = 300
+
+
+@pytest.fixture(scope="session")
+def layout_config() -> LayoutConfig:
+    return load_layout_config(CONFIG_DIR / "file_layouts.json")
+
+
+@pytest.fixture(scope="session")
+def export(tmp_path_factory, layout_config) -> Dict[str, Path]:
+    """Synthetic export in prop_id order, keyed by file type."""
+    return write_synthetic_export(tmp_path_factory.mktemp("export"), layout_config, PROPERTIES)
+
+
+@pytest.fixture
+def shuffled(tmp_path) -> Callable[[Path], Path]:
+    """Function copying a data file into tmp_path with its lines in random order."""
+    def copy(path: Path, seed: int = 7) -> Path:
+        lines = path.read_bytes().splitlines(keepends=True)
+        random.Random(seed).shuffle(lines)
+        out_path = tmp_path / path.name
+        out_path.write_bytes(b"".join(lines))
+        return out_path
+
+    return copy
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path, layout_config) -> StorageBackend:
+    """Embedded SQLite backend in tmp_path with the layout tables created."""
+    storage = create_storage(dict(
+        DATABASE_CONFIG, backend="sqlite", sqlite_path=str(tmp_path / "cad.db")
+    ))
+    storage.create_tables(layout_config)
+    return storage
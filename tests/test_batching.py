@@ -0,0 +1,105 @@
+"""Adaptive batch sizing from measured throughput."""
+
+import sys
+import tracemalloc
+
+from app.services.batching import AdaptiveBatcher, estimate_row_bytes
+
+
+ROW = ("R", 12345, "123 MAIN ST", None)
+
+
+def batch(rows):
+    return [ROW] * rows
+
+
+def test_estimate_row_bytes():
+    # The tuple, each non-NULL value and the row's slot in the batch list
+    expected = sys.getsizeof(ROW) + sum(sys.getsizeof(value) for value in ROW[:3]) + 8
+    assert estimate_row_bytes(ROW) == expected
+
+
+def test_estimate_matches_memory_held_by_a_batch():
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        pending = [
+            (f"R{i}", 100000 + i, f"{i} MAIN ST KAUFMAN", None, float(i)) for i in range(5000)
+        ]
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    estimated = sum(estimate_row_bytes(row) for row in pending)
+    assert 0.8 * held <= estimated <= 1.25 * held
+
+
+def test_first_batch_learns_row_size():
+    batcher = AdaptiveBatcher(initial_bytes=45_000, min_bytes=1_000, max_bytes=1_000_000)
+    assert batcher.next_batch_rows() == 100
+
+    batcher.record(batch(100), 0.01)
+
+    assert batcher.row_bytes == estimate_row_bytes(ROW)
+    # The first measurement grows the target by one step
+    assert batcher.target_bytes == 67_500
+    assert batcher.next_batch_rows() == 67_500 // estimate_row_bytes(ROW)
+
+
+def test_grows_while_throughput_improves_and_reverses_when_it_drops():
+    batcher = AdaptiveBatcher(initial_bytes=10_000, min_bytes=1_000, max_bytes=1_000_000, step=2)
+    batcher.record(batch(100), 1.0)
+    grown = batcher.target_bytes
+    batcher.record(batch(200), 1.0)
+    assert batcher.target_bytes == grown * 2
+
+    batcher.record(batch(200), 4.0)
+
+    assert batcher.direction == -1
+    assert batcher.target_bytes == grown
+
+
+def test_plateau_holds_the_target():
+    batcher = AdaptiveBatcher(initial_bytes=10_000, min_bytes=1_000, max_bytes=1_000_000)
+    batcher.record(batch(100), 1.0)
+    target = batcher.target_bytes
+
+    batcher.record(batch(100), 1.01)
+
+    assert batcher.target_bytes == target
+
+
+def test_target_stays_within_bounds():
+    batcher = AdaptiveBatcher(initial_bytes=50_000, min_bytes=10_000, max_bytes=100_000, step=4)
+    for _ in range(5):
+        rows = batcher.next_batch_rows()
+        batcher.record(batch(rows), rows / 1e6)
+        assert 10_000 <= batcher.target_bytes <= 100_000
+    assert batcher.target_bytes == 100_000
+
+    batcher = AdaptiveBatcher(initial_bytes=1, min_bytes=10_000, max_bytes=100_000)
+    assert batcher.target_bytes == 10_000
+
+
+def test_commit_cost_counts_against_small_batches():
+    batcher = AdaptiveBatcher(initial_bytes=10_000, min_bytes=1_000, max_bytes=1_000_000)
+    batcher.record_commit(2.0, batches=4)
+    batcher.record_commit(1.0, batches=1)
+
+    assert batcher.commit_seconds == 0.8 * 0.5 + 0.2 * 1.0
+
+
+def test_metrics():
+    batcher = AdaptiveBatcher(initial_bytes=10_000, min_bytes=1_000, max_bytes=1_000_000)
+    batcher.record(batch(100), 0.5)
+    batcher.record(batch(300), 0.5)
+    batcher.record([], 1.0)
+
+    metrics = batcher.metrics()
+
+    assert metrics["batches"] == 2
+    assert metrics["min_batch_rows"] == 100
+    assert metrics["max_batch_rows"] == 300
+    assert metrics["avg_batch_rows"] == 200
+    assert metrics["write_seconds"] == 1.0
+    assert metrics["bytes_per_second"] == 400 * estimate_row_bytes(ROW)
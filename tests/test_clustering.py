@@ -0,0 +1,43 @@
+"""External sort of export files by their cluster key."""
+
+from collections import Counter
+
+from app.services.clustering import cluster_key_func, external_sort, find_unsorted_line
+
+
+def test_external_sort_orders_unsorted_file(export, layout_config, shuffled, tmp_path):
+    file_config = layout_config.get_file_config("IMPROVEMENT_DETAIL")
+    source = shuffled(export["IMPROVEMENT_DETAIL"])
+    output = tmp_path / "sorted.TXT"
+    assert find_unsorted_line(source, file_config) is not None
+
+    runs = external_sort(source, file_config, output, memory_bytes=16 * 1024)
+
+    assert runs > 1
+    assert find_unsorted_line(output, file_config) is None
+    source_lines = source.read_bytes().splitlines(keepends=True)
+    assert Counter(output.read_bytes().splitlines(keepends=True)) == Counter(source_lines)
+    # Only the output is left in the work directory
+    assert sorted(path.name for path in tmp_path.iterdir()) == [source.name, output.name]
+
+
+def test_external_sort_is_stable(export, layout_config, shuffled, tmp_path):
+    file_config = layout_config.get_file_config("IMPROVEMENT_DETAIL")
+    key = cluster_key_func(file_config)
+    source = shuffled(export["IMPROVEMENT_DETAIL"])
+    output = tmp_path / "sorted.TXT"
+
+    external_sort(source, file_config, output, memory_bytes=16 * 1024)
+
+    source_lines = source.read_bytes().splitlines(keepends=True)
+    assert output.read_bytes().splitlines(keepends=True) == sorted(source_lines, key=key)
+
+
+def test_external_sort_in_one_run(export, layout_config, tmp_path):
+    file_config = layout_config.get_file_config("LAND_DETAIL")
+    output = tmp_path / "sorted.TXT"
+
+    runs = external_sort(export["LAND_DETAIL"], file_config, output, memory_bytes=1 << 30)
+
+    assert runs == 1
+    assert output.read_bytes() == export["LAND_DETAIL"].read_bytes()
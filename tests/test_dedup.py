@@ -0,0 +1,66 @@
+"""Windowed primary key deduplication."""
+
+import pytest
+
+from app.services.dedup import KeyDeduplicator
+
+
+@pytest.fixture
+def file_config(layout_config):
+    return layout_config.get_file_config("LAND_DETAIL")
+
+
+def record(file_config, prop_id, land_seg_id, tax_year=2025):
+    values = [None] * len(file_config.active_columns)
+    values[file_config.column_index("prop_id")] = prop_id
+    values[file_config.column_index("tax_year")] = tax_year
+    values[file_config.column_index("land_seg_id")] = land_seg_id
+    return tuple(values)
+
+
+def test_first_policy_drops_repeats(file_config):
+    deduplicator = KeyDeduplicator(file_config, "first", window=100)
+    records = [record(file_config, 1, 1), record(file_config, 1, 2), record(file_config, 1, 1)]
+
+    kept = [deduplicator("", r) for r in records]
+
+    assert kept == [True, True, False]
+    assert deduplicator.duplicates == 1
+    assert deduplicator.samples == [(1, 2025, 1)]
+
+
+def test_last_policy_passes_repeats_through(file_config):
+    deduplicator = KeyDeduplicator(file_config, "last", window=100)
+
+    kept = [deduplicator("", record(file_config, 1, 1)) for _ in range(3)]
+
+    assert kept == [True, True, True]
+    assert deduplicator.duplicates == 2
+
+
+def test_generation_rollover_forgets_old_keys(file_config):
+    deduplicator = KeyDeduplicator(file_config, "first", window=4)
+    for prop_id in range(1, 4):
+        deduplicator("", record(file_config, prop_id, 1))
+
+    # Keys 1-2 rolled into the previous generation and are still seen
+    assert not deduplicator("", record(file_config, 1, 1))
+    for prop_id in range(4, 6):
+        deduplicator("", record(file_config, prop_id, 1))
+
+    # Two rollovers later key 1 is forgotten, key 5 is current
+    assert deduplicator("", record(file_config, 1, 1))
+    assert not deduplicator("", record(file_config, 5, 1))
+    assert deduplicator.duplicates == 2
+    assert len(deduplicator.current) <= deduplicator.generation_size
+    assert len(deduplicator.previous) <= deduplicator.generation_size
+
+
+def test_rejects_unknown_policy(file_config):
+    with pytest.raises(ValueError):
+        KeyDeduplicator(file_config, "newest", window=10)
+
+
+def test_rejects_file_without_primary_key(layout_config):
+    with pytest.raises(ValueError):
+        KeyDeduplicator(layout_config.get_file_config("LAWSUIT"), "first", window=10)
@@ -0,0 +1,104 @@
+"""Pivot of improvement attributes into one feature row per property."""
+
+from collections import defaultdict
+
+import pytest
+
+from app.services.features import FeaturePivot, convert_feature
+from app.services.file_reader import read_fixed_width_file
+from app.services.loader import DataLoader
+
+
+def attr_line(prop_id, code, value, tax_year=2025, impr_id=1, detail_id=1):
+    return f"{prop_id:012d}{tax_year:4d}{impr_id:012d}{detail_id:012d}{code:<20}{value:<50}\n"
+
+
+@pytest.fixture
+def pivot(layout_config):
+    return FeaturePivot(layout_config)
+
+
+def feature_rows(pivot, rows):
+    names = ["prop_id", "tax_year"] + [column.name for column, _ in pivot.columns]
+    return {row[0]: dict(zip(names, row)) for row in rows}
+
+
+def test_convert_feature(pivot):
+    columns = {column.name: column for column, _ in pivot.columns}
+
+    assert convert_feature(" 3 ", columns["bedrooms"]) == 3
+    assert convert_feature("2.5", columns["bathrooms"]) == 2.5
+    assert convert_feature("1,850", columns["living_area"]) == 1850
+    assert convert_feature("  brick   veneer ", columns["construction_type"]) == "brick veneer"
+    assert convert_feature("   ", columns["bedrooms"]) is None
+    for bad in ("2.5", "many", "12345"):
+        with pytest.raises(ValueError):
+            convert_feature(bad, columns["bedrooms"])
+
+
+def test_pivot_of_attribute_rows(pivot, tmp_path):
+    path = tmp_path / "IMPROVEMENT_DETAIL_ATTR.TXT"
+    # Property 3 comes first: the file is sorted before the pivot
+    path.write_text("".join([
+        attr_line(3, "BEDROOMS", "99999"),
+        attr_line(3, "STORY", "2"),
+        attr_line(1, "BEDROOMS", "3"),
+        attr_line(1, "bdrm", "4"),
+        attr_line(1, "Full  Bath", "2.5"),
+        attr_line(1, "QUALITY", "Good"),
+        attr_line(1, "CLASS", "Average"),
+        attr_line(1, "FIREPLACE", "yes"),
+        attr_line(1, "GARAGE", "2 car"),
+        attr_line(2, "DECK", "wood"),
+    ]), encoding="latin1")
+
+    rows = feature_rows(pivot, pivot.rows(
+        {"IMPROVEMENT_DETAIL_ATTR": path}, tmp_path, memory_bytes=1 << 20
+    ))
+
+    assert list(rows) == [1, 3]
+    first = rows[1]
+    assert (first["tax_year"], first["bedrooms"], first["bathrooms"]) == (2025, 4, 2.5)
+    assert first["quality"] == "Good"
+    assert first["fireplaces"] is None
+    assert first["living_area"] is None and first["year_built"] is None
+    assert rows[3]["bedrooms"] is None
+    assert rows[3]["stories"] == 2.0
+    assert pivot.properties == 2
+    assert pivot.unparsed == {"fireplaces": 1, "bedrooms": 1}
+    assert pivot.unmapped == {"GARAGE": 1, "DECK": 1}
+
+
+def test_source_columns_are_aggregated(pivot, export, layout_config, tmp_path):
+    detail = layout_config.get_file_config("IMPROVEMENT_DETAIL")
+    info = layout_config.get_file_config("IMPROVEMENT_INFO")
+    living_area = defaultdict(list)
+    for record in read_fixed_width_file(export["IMPROVEMENT_DETAIL"], detail, layout_config.encoding):
+        if record["living_area"] is not None:
+            living_area[record["prop_id"]].append(record["living_area"])
+    year_built = defaultdict(list)
+    for record in read_fixed_width_file(export["IMPROVEMENT_INFO"], info, layout_config.encoding):
+        if record["year_built"]:
+            year_built[record["prop_id"]].append(record["year_built"])
+
+    rows = feature_rows(pivot, pivot.rows(export, tmp_path, memory_bytes=1 << 20))
+
+    assert rows
+    for prop_id, row in rows.items():
+        total = sum(living_area[prop_id]) if living_area[prop_id] else None
+        # Sums wider than the 9-digit column are left NULL and counted
+        assert row["living_area"] == (total if total is None or total < 10 ** 9 else None)
+        assert row["year_built"] == min(year_built[prop_id], default=None)
+    assert any(row["living_area"] is not None for row in rows.values())
+    overflows = sum(1 for values in living_area.values() if sum(values) >= 10 ** 9)
+    assert pivot.unparsed["living_area"] >= overflows
+
+
+def test_build_features_table(export, sqlite_storage):
+    loader = DataLoader(data_dir=export["INFO"].parent, db_service=sqlite_storage)
+
+    result = loader.build_features()
+
+    assert result["status"] == "SUCCESS"
+    assert result["records_loaded"] == sqlite_storage.get_table_count("property_features")
+    assert result["records_loaded"] > 0
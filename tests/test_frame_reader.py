@@ -0,0 +1,74 @@
+"""Typed DataFrames read straight from fixed-width files."""
+
+import pandas as pd
+
+from app.services.file_reader import read_fixed_width_file
+from app.services.frame_reader import layout_dtypes, read_fixed_width_frame
+
+
+def blank_field(path, file_config, name, line_num, out_dir):
+    """Copy a data file with one field of one line blanked."""
+    spans = {column.name: (start, end) for column, start, end in file_config.column_spans}
+    start, end = spans[name]
+    lines = path.read_text(encoding="latin1").splitlines(keepends=True)
+    line = lines[line_num]
+    lines[line_num] = line[:start] + " " * (end - start) + line[end:]
+    out_path = out_dir / path.name
+    out_path.write_text("".join(lines), encoding="latin1")
+    return out_path
+
+
+def test_frame_matches_parsed_records(export, layout_config):
+    file_config = layout_config.get_file_config("LAND_DETAIL")
+    columns = ["prop_id", "tax_year", "land_type_cd", "ag_flag", "land_acres", "mkt_val"]
+
+    frame = read_fixed_width_frame(
+        export["LAND_DETAIL"], file_config, layout_config.encoding, columns, chunk_size=128
+    )
+
+    records = list(read_fixed_width_file(export["LAND_DETAIL"], file_config, layout_config.encoding))
+    assert len(frame) == len(records)
+    for name in columns:
+        values = [None if pd.isna(value) else value for value in frame[name]]
+        assert values == [record[name] for record in records], name
+
+
+def test_dtypes_follow_the_layout(export, layout_config):
+    file_config = layout_config.get_file_config("INFO")
+
+    frame = read_fixed_width_frame(export["INFO"], file_config, layout_config.encoding, chunk_size=100)
+
+    dtypes = layout_dtypes(file_config)
+    assert dtypes["prop_id"] == "Int64"
+    assert dtypes["prop_type_cd"] == "category"
+    assert dtypes["legal_desc"] == "str"
+    assert isinstance(frame["prop_type_cd"].dtype, pd.CategoricalDtype)
+    # Code mappings are applied to categoricals
+    assert set(frame["prop_type_cd"].dropna()) <= {"Real", "Personal", "Mineral", "Automobile"}
+
+
+def test_blank_text_field_is_missing(export, layout_config, tmp_path):
+    file_config = layout_config.get_file_config("INFO")
+    path = blank_field(export["INFO"], file_config, "mail_addr_line2", 5, tmp_path)
+    path = blank_field(path, file_config, "prop_type_cd", 6, tmp_path)
+
+    frame = read_fixed_width_frame(path, file_config, layout_config.encoding)
+
+    assert pd.isna(frame.loc[5, "mail_addr_line2"])
+    assert pd.isna(frame.loc[6, "prop_type_cd"])
+    assert "None" not in set(frame["mail_addr_line2"].dropna())
+    assert frame["mail_addr_line2"].isna().sum() == sum(
+        record["mail_addr_line2"] is None
+        for record in read_fixed_width_file(path, file_config, layout_config.encoding)
+    )
+
+
+def test_max_records_and_empty_result(export, layout_config):
+    file_config = layout_config.get_file_config("INFO")
+
+    assert len(read_fixed_width_frame(
+        export["INFO"], file_config, layout_config.encoding, max_records=42, chunk_size=10
+    )) == 42
+    empty = read_fixed_width_frame(export["INFO"], file_config, layout_config.encoding, max_records=0)
+    assert empty.empty
+    assert list(empty.columns) == list(layout_dtypes(file_config))
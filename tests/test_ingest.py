@@ -0,0 +1,165 @@
+"""Drop-folder detection and loading of new exports."""
+
+import os
+import shutil
+
+import pytest
+
+import app.services.ingest as ingest_module
+from app.config import DATABASE_CONFIG
+from app.services.ingest import DROP_LOG_TABLE, DropIngester, scan_drops, split_file_name
+
+
+OLD = "2025-07-25_001000_APPRAISAL_"
+NEW = "2025-10-27_002174_APPRAISAL_"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_drop(export, layout_config, directory, prefix, file_types=("INFO", "LAND_DETAIL")):
+    """Copy some files of the synthetic export under another prefix."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for file_type in file_types:
+        shutil.copy(export[file_type], directory / f"{prefix}{file_type}.TXT")
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def ingester(tmp_path, layout_config, clock):
+    watch_dir = tmp_path / "drops"
+    watch_dir.mkdir()
+    db_config = dict(DATABASE_CONFIG, backend="sqlite", sqlite_path=str(tmp_path / "cad.db"))
+    ingester = DropIngester(watch_dir, db_config, layout_config, settle_seconds=60, clock=clock)
+    ingester.db_service.create_tables(layout_config)
+    return ingester
+
+
+def test_split_file_name(layout_config):
+    file_types = sorted(layout_config.file_names, key=len, reverse=True)
+
+    assert split_file_name(f"{NEW}ENTITY_INFO.TXT", file_types) == (NEW, "ENTITY_INFO")
+    assert split_file_name(f"{NEW}INFO.TXT", file_types) == (NEW, "INFO")
+    assert split_file_name(f"{NEW}INFO.csv", file_types) is None
+    assert split_file_name("INFO.TXT", file_types) is None
+    assert split_file_name(f"{NEW}README.TXT", file_types) is None
+
+
+def test_scan_drops_finds_exports_in_subdirectories(export, layout_config, tmp_path):
+    make_drop(export, layout_config, tmp_path, NEW)
+    make_drop(export, layout_config, tmp_path / "july", OLD, ("INFO",))
+
+    drops = scan_drops(tmp_path, layout_config)
+
+    assert set(drops) == {(tmp_path, NEW), (tmp_path / "july", OLD)}
+    assert set(drops[(tmp_path, NEW)].files) == {"INFO", "LAND_DETAIL"}
+    july = drops[(tmp_path / "july", OLD)]
+    assert [name for name, _, _ in july.fingerprint] == [f"{OLD}INFO.TXT"]
+
+
+def test_drop_is_ready_once_settled_and_complete(export, layout_config, ingester, clock):
+    make_drop(export, layout_config, ingester.watch_dir, NEW)
+    make_drop(export, layout_config, ingester.watch_dir / "partial", OLD, ("LAND_DETAIL",))
+
+    assert ingester.ready_drops() == []
+    clock.now += 30
+    assert ingester.ready_drops() == []
+
+    # A growing file restarts the settle time
+    with open(ingester.watch_dir / f"{NEW}LAND_DETAIL.TXT", "ab") as f:
+        f.write(b"\n")
+    clock.now += 40
+    assert ingester.ready_drops() == []
+    clock.now += 59
+    assert ingester.ready_drops() == []
+    clock.now += 1
+
+    ready = ingester.ready_drops()
+
+    # The drop without INFO never becomes ready
+    assert [drop.prefix for drop in ready] == [NEW]
+
+
+def test_poll_loads_the_newest_drop_and_skips_older_ones(export, layout_config, ingester, clock):
+    make_drop(export, layout_config, ingester.watch_dir / "old", OLD)
+    make_drop(export, layout_config, ingester.watch_dir / "new", NEW)
+    assert ingester.poll() == []
+    clock.now += 60
+
+    results = ingester.poll()
+
+    assert [(r["drop"], r["status"]) for r in results] == [
+        (f"{OLD}*", "SKIPPED"), (f"{NEW}*", "SUCCESS"),
+    ]
+    assert results[1]["records_loaded"] == 600
+    storage = ingester.db_service
+    assert storage.get_table_count("appraisal_info") == 300
+    assert storage.get_last_load_status(DROP_LOG_TABLE, file_name=f"{NEW}*") == "SUCCESS"
+    assert storage.get_last_load_status(DROP_LOG_TABLE, file_name=f"{OLD}*") == "SKIPPED"
+    clock.now += 60
+    assert ingester.poll() == []
+
+
+def test_restart_recognizes_loaded_drops(export, layout_config, ingester, clock, tmp_path):
+    make_drop(export, layout_config, ingester.watch_dir, NEW)
+    ingester.poll()
+    clock.now += 60
+    assert ingester.poll()[0]["status"] == "SUCCESS"
+
+    restarted = DropIngester(
+        ingester.watch_dir, ingester.db_config, layout_config, settle_seconds=60, clock=clock
+    )
+    restarted.poll()
+    clock.now += 60
+    assert restarted.poll() == []
+    assert restarted.latest == NEW
+
+    # An older export arriving later never overwrites the newer one
+    make_drop(export, layout_config, ingester.watch_dir / "late", OLD)
+    restarted.poll()
+    clock.now += 60
+    results = restarted.poll()
+    assert [(r["drop"], r["status"]) for r in results] == [(f"{OLD}*", "SKIPPED")]
+
+
+def test_partial_drop_is_retried_once_its_files_change(
+    export, layout_config, ingester, clock, monkeypatch
+):
+    load_in_order = ingest_module.load_in_order
+
+    def failing_land(loader, load_options, file_types, workers):
+        results = load_in_order(loader, load_options, file_types, workers)
+        for result in results:
+            if result["file_type"] == "LAND_DETAIL":
+                result["status"] = "FAILED"
+        return results
+
+    monkeypatch.setattr(ingest_module, "load_in_order", failing_land)
+    make_drop(export, layout_config, ingester.watch_dir, NEW)
+    ingester.poll()
+    clock.now += 60
+    assert ingester.poll()[0]["status"] == "PARTIAL"
+    assert ingester.latest is None
+    clock.now += 60
+    assert ingester.poll() == []
+
+    monkeypatch.setattr(ingest_module, "load_in_order", load_in_order)
+    land = ingester.watch_dir / f"{NEW}LAND_DETAIL.TXT"
+    stat = land.stat()
+    os.utime(land, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    ingester.poll()
+    clock.now += 60
+
+    results = ingester.poll()
+
+    assert [(r["drop"], r["status"]) for r in results] == [(f"{NEW}*", "SUCCESS")]
+    assert ingester.latest == NEW
@@ -0,0 +1,106 @@
+"""In-memory referential integrity checks."""
+
+import io
+import shutil
+
+from app.services.integrity import KeyCollector, KeySet, OrphanCheck, referenced_keys, scan_keys
+from app.services.loader import DataLoader
+
+
+def test_key_set_membership():
+    keys = KeySet()
+    for key in (0, 1, 7, 8, 100000, 100000, -5):
+        keys.add(key)
+
+    assert len(keys) == 5
+    assert all(key in keys for key in (0, 1, 7, 8, 100000))
+    assert not any(key in keys for key in (2, 9, 99999, 100001, -5, 10 ** 9))
+
+
+def test_key_set_keeps_huge_keys_out_of_the_bitset():
+    keys = KeySet()
+    for prop_id in range(1, 300000, 3):
+        keys.add(prop_id)
+
+    keys.add(999999999999)
+
+    assert 999999999999 in keys
+    assert 999999999998 not in keys
+    assert len(keys) == 100001
+    assert keys.nbytes < 2 * 1024 * 1024
+
+
+def test_key_set_moves_overflow_keys_into_a_grown_bitset():
+    keys = KeySet()
+    keys.add(20_000_000)
+    assert keys.overflow == {20_000_000}
+
+    for prop_id in range(0, 21_000_000, 100):
+        keys.add(prop_id)
+
+    assert not keys.overflow
+    assert 20_000_000 in keys
+    assert 20_000_001 not in keys
+    assert len(keys) == 210_000
+
+
+def test_referenced_keys(layout_config):
+    assert referenced_keys(layout_config) == {"INFO": ["prop_id"]}
+
+
+def test_scan_and_collect_agree(export, layout_config):
+    info = layout_config.get_file_config("INFO")
+    scanned = scan_keys(export["INFO"], info, "prop_id")
+    collector = KeyCollector(info, ["prop_id"])
+    values = [None] * len(info.active_columns)
+    values[info.column_index("prop_id")] = 100000
+    collector("", tuple(values))
+
+    assert len(scanned) == 300
+    assert 100000 in scanned and 100299 in scanned and 100300 not in scanned
+    assert 100000 in collector.keys["prop_id"]
+
+
+def test_orphan_check_quarantines_orphans(layout_config):
+    file_config = layout_config.get_file_config("UDI")
+    parents = KeySet()
+    parents.add(100)
+    quarantine = io.StringIO()
+    check = OrphanCheck(file_config, {"prop_id": parents, "parent_prop_id": parents}, quarantine)
+
+    def record(prop_id, parent_prop_id):
+        values = [None] * len(file_config.active_columns)
+        values[file_config.column_index("prop_id")] = prop_id
+        values[file_config.column_index("parent_prop_id")] = parent_prop_id
+        return tuple(values)
+
+    assert check("ok", record(100, None))
+    assert check("no parent", record(100, 0))
+    assert not check("orphan", record(200, 100))
+    assert not check("both\n", record(200, 300))
+
+    assert check.rejected == 2
+    assert check.orphans == {"prop_id": 2, "parent_prop_id": 1}
+    assert quarantine.getvalue() == "orphan\nboth\n"
+
+
+def test_integrity_load_with_garbage_keys(export, layout_config, sqlite_storage, tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(export["INFO"].parent, data_dir)
+    info = data_dir / export["INFO"].name
+    land = data_dir / export["LAND_DETAIL"].name
+    info_line = info.read_text(encoding="latin1").splitlines(keepends=True)[0]
+    land_line = land.read_text(encoding="latin1").splitlines(keepends=True)[0]
+    with open(info, "a", encoding="latin1") as f:
+        f.write("999999999999" + info_line[12:])
+    with open(land, "a", encoding="latin1") as f:
+        f.write("999999999999" + land_line[12:])
+        f.write("999999999998" + land_line[12:])
+
+    loader = DataLoader(data_dir=data_dir, db_service=sqlite_storage)
+    result = loader.load_file("LAND_DETAIL", check_integrity=True)
+
+    assert result["status"] == "SUCCESS"
+    assert result["orphans"] == {"prop_id": 1}
+    quarantined = (data_dir / result["quarantine_file"]).read_text(encoding="latin1")
+    assert quarantined.startswith("999999999998")
@@ -0,0 +1,58 @@
+"""Streaming group-by and merge-join of sorted record streams."""
+
+import pytest
+
+from app.services.merge import group_by_key, merge_groups
+
+
+def test_group_by_key_groups_consecutive_records():
+    records = [(1, "a"), (1, "b"), (2, "c"), (4, "d"), (4, "e")]
+
+    groups = list(group_by_key(records, key=lambda record: record[0]))
+
+    assert groups == [
+        (1, [(1, "a"), (1, "b")]),
+        (2, [(2, "c")]),
+        (4, [(4, "d"), (4, "e")]),
+    ]
+
+
+def test_group_by_key_rejects_unsorted_stream():
+    records = [(1, "a"), (3, "b"), (2, "c")]
+
+    with pytest.raises(ValueError, match="land is not sorted"):
+        list(group_by_key(records, key=lambda record: record[0], name="land"))
+
+
+def test_merge_groups_is_a_full_outer_join():
+    left = [(1, "l1"), (3, "l3"), (5, "l5")]
+    right = [(2, "r2"), (3, "r3"), (6, "r6")]
+    third = [(5, "t5")]
+
+    joined = list(merge_groups(left, right, third))
+
+    assert joined == [
+        (1, ["l1", None, None]),
+        (2, [None, "r2", None]),
+        (3, ["l3", "r3", None]),
+        (5, ["l5", None, "t5"]),
+        (6, [None, "r6", None]),
+    ]
+
+
+def test_merge_groups_of_grouped_streams():
+    land = group_by_key([(1, 10), (1, 20), (2, 5)], key=lambda record: record[0])
+    improvements = group_by_key([(2, 7), (3, 1)], key=lambda record: record[0])
+
+    joined = list(merge_groups(land, improvements))
+
+    assert joined == [
+        (1, [[(1, 10), (1, 20)], None]),
+        (2, [[(2, 5)], [(2, 7)]]),
+        (3, [None, [(3, 1)]]),
+    ]
+
+
+def test_merge_groups_of_empty_streams():
+    assert list(merge_groups([], [])) == []
+    assert list(merge_groups([(1, "a")], [])) == [(1, ["a", None])]
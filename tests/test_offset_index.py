@@ -0,0 +1,71 @@
+"""Sidecar prop_id byte offset indexes."""
+
+import pytest
+
+from app.services.file_reader import read_fixed_width_file
+from app.services.offset_index import (
+    FULL,
+    SPARSE,
+    StaleIndexError,
+    build_offset_index,
+    index_path_for,
+    lookup_records,
+    open_offset_index
+)
+
+
+def records_by_scan(path, file_config, encoding, prop_id):
+    return [
+        record for record in read_fixed_width_file(path, file_config, encoding)
+        if record["prop_id"] == prop_id
+    ]
+
+
+@pytest.fixture
+def file_config(layout_config):
+    return layout_config.get_file_config("IMPROVEMENT_DETAIL")
+
+
+def test_sparse_index_of_sorted_file(export, layout_config, file_config):
+    path = export["IMPROVEMENT_DETAIL"]
+    index = build_offset_index(path, file_config, every=16)
+
+    assert index.mode == SPARSE
+    for prop_id in (100000, 100001, 100150, 100299):
+        found = list(lookup_records(path, file_config, index, prop_id, layout_config.encoding))
+        assert found
+        assert found == records_by_scan(path, file_config, layout_config.encoding, prop_id)
+    assert list(lookup_records(path, file_config, index, 99999, layout_config.encoding)) == []
+    assert list(lookup_records(path, file_config, index, 100300, layout_config.encoding)) == []
+
+
+def test_full_index_of_unsorted_file(export, layout_config, file_config, shuffled):
+    path = shuffled(export["IMPROVEMENT_DETAIL"])
+    index = build_offset_index(path, file_config)
+
+    assert index.mode == FULL
+    for prop_id in (100000, 100123, 100299):
+        found = list(lookup_records(path, file_config, index, prop_id, layout_config.encoding))
+        assert len(found) == 3
+        assert found == records_by_scan(path, file_config, layout_config.encoding, prop_id)
+
+
+def test_saved_index_is_reused_until_the_file_changes(
+    export, layout_config, file_config, shuffled, tmp_path
+):
+    path = shuffled(export["IMPROVEMENT_DETAIL"])
+    index_dir = tmp_path / "indexes"
+    index = open_offset_index(path, file_config, index_dir)
+    assert index_path_for(path, index_dir).exists()
+    assert open_offset_index(path, file_config, index_dir, rebuild=False) == index
+
+    with open(path, "ab") as f:
+        f.write(path.read_bytes().splitlines(keepends=True)[0])
+
+    with pytest.raises(StaleIndexError):
+        list(lookup_records(path, file_config, index, 100000, layout_config.encoding))
+    with pytest.raises(StaleIndexError):
+        open_offset_index(path, file_config, index_dir, rebuild=False)
+    rebuilt = open_offset_index(path, file_config, index_dir)
+    found = list(lookup_records(path, file_config, rebuilt, 100000, layout_config.encoding))
+    assert found == records_by_scan(path, file_config, layout_config.encoding, 100000)
@@ -0,0 +1,95 @@
+"""Typed query frames and bounded-memory group-bys over DataFrame chunks."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.query_frames import aggregate_frames, query_dtypes
+
+
+AGGREGATIONS = {
+    "total": ("value", "sum"),
+    "rows": ("value", "count"),
+    "records": ("value", "size"),
+    "lowest": ("value", "min"),
+    "highest": ("value", "max"),
+    "average": ("value", "mean"),
+    "first_area": ("area", "min"),
+}
+
+
+def make_frames(chunks=8, rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(chunks):
+        value = pd.Series(rng.integers(0, 100_000, rows), dtype="Int64")
+        value[rng.random(rows) < 0.1] = pd.NA
+        frames.append(pd.DataFrame({
+            "year": pd.Series(rng.integers(2020, 2026, rows), dtype="Int64"),
+            "city": pd.Series(rng.choice(["FORNEY", "TERRELL", "KAUFMAN", None], rows), dtype="str"),
+            "value": value,
+            "area": pd.Series(rng.random(rows) * 1000, dtype="Float64"),
+        }))
+    return frames
+
+
+def expected_aggregate(frames, by):
+    expected = pd.concat(frames).groupby(by).agg(**AGGREGATIONS)
+    return expected.convert_dtypes()
+
+
+@pytest.mark.parametrize("by", [["year"], ["city", "year"]])
+def test_aggregate_frames_matches_pandas_groupby(by, tmp_path):
+    frames = make_frames()
+
+    result = aggregate_frames(frames, by, AGGREGATIONS, memory_bytes=1 << 30, work_dir=tmp_path)
+
+    pd.testing.assert_frame_equal(
+        result, expected_aggregate(frames, by), check_dtype=False, check_index_type=False
+    )
+
+
+def test_aggregate_frames_matches_pandas_groupby_when_spilling(tmp_path):
+    frames = make_frames(chunks=20, rows=2000, seed=1)
+    for frame in frames:
+        frame["year"] = frame["year"] * 1000 + pd.Series(range(len(frame))) % 100
+
+    result = aggregate_frames(frames, ["year"], AGGREGATIONS, memory_bytes=4096, work_dir=tmp_path)
+
+    pd.testing.assert_frame_equal(result, expected_aggregate(frames, ["year"]), check_dtype=False)
+    assert not list(tmp_path.iterdir())
+
+
+def test_aggregate_frames_rejects_unknown_aggregation():
+    with pytest.raises(ValueError, match="median"):
+        aggregate_frames(make_frames(chunks=1), ["year"], {"mid": ("value", "median")})
+
+
+def test_query_dtypes_from_postgres_types():
+    description = [
+        ("prop_id", 23, None, 4),
+        ("market", 1700, None, -1),
+        ("prop_type_cd", 1043, None, 5),
+        ("legal_desc", 1043, None, 255),
+        ("situs_city", 25, None, -1),
+        ("sale_dt", 1082, None, 4),
+    ]
+
+    assert query_dtypes(description) == {
+        "prop_id": "Int32",
+        "market": "Float64",
+        "prop_type_cd": "category",
+        "legal_desc": "str",
+        "situs_city": "category",
+        "sale_dt": "datetime64[us]",
+    }
+    assert query_dtypes(description, categories=["legal_desc"])["prop_type_cd"] == "str"
+
+
+def test_query_dtypes_fall_back_to_the_layout(layout_config):
+    description = [("prop_id", None, None, None), ("unknown", None, None, None)]
+
+    dtypes = query_dtypes(description, layout_config)
+
+    assert dtypes["prop_id"] == "Int64"
+    assert dtypes["unknown"] is None
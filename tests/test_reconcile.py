@@ -0,0 +1,83 @@
+"""In-stream reconciliation of ENTITY_INFO against expected totals."""
+
+import json
+import shutil
+
+from app.services.loader import DataLoader
+from app.services.reconcile import GroupTotals, find_discrepancies, read_export_totals
+
+
+def record(file_config, entity_cd, taxable_val, assessed_val=0):
+    values = [None] * len(file_config.active_columns)
+    values[file_config.column_index("entity_cd")] = entity_cd
+    values[file_config.column_index("taxable_val")] = taxable_val
+    values[file_config.column_index("assessed_val")] = assessed_val
+    return tuple(values)
+
+
+def test_group_totals_accumulate_and_remove(layout_config):
+    file_config = layout_config.get_file_config("ENTITY_INFO")
+    totals = GroupTotals(file_config)
+    for r in (record(file_config, "CKA", 100, 10), record(file_config, "CKA", None),
+              record(file_config, "SKA", 50, 5)):
+        assert totals("", r)
+
+    totals.remove(record(file_config, "SKA", 50, 5))
+    totals.remove(record(file_config, "XYZ", 1))
+
+    assert totals.totals() == {
+        "CKA": {"rows": 2, "taxable_val": 100, "assessed_val": 10},
+        "SKA": {"rows": 0, "taxable_val": 0, "assessed_val": 0},
+    }
+
+
+def test_find_discrepancies():
+    actual = {"CKA": {"rows": 2, "taxable_val": 100}, "SKA": {"rows": 1, "taxable_val": 5}}
+    expected = {"CKA": {"rows": 2, "taxable_val": 90}, "RKA": {"rows": 3, "taxable_val": 7}}
+
+    found = find_discrepancies(actual, expected, "ENTITY_TOTALS")
+
+    assert [(d["group"], d["measure"], d["difference"]) for d in found] == [
+        ("CKA", "taxable_val", 10),
+        ("RKA", "rows", -3),
+        ("RKA", "taxable_val", -7),
+        ("SKA", "rows", 1),
+        ("SKA", "taxable_val", 5),
+    ]
+    # A partial source only checks the groups it lists
+    partial = find_discrepancies(actual, expected, "report", partial=True)
+    assert {d["group"] for d in partial} == {"CKA", "RKA"}
+    assert find_discrepancies(actual, actual, "same") == []
+
+
+def test_rejected_rows_are_not_counted(export, layout_config, sqlite_storage, tmp_path):
+    data_dir = tmp_path / "data"
+    shutil.copytree(export["INFO"].parent, data_dir)
+    entity_info = data_dir / export["ENTITY_INFO"].name
+    lines = entity_info.read_bytes().splitlines(keepends=True)
+    # Repeated primary keys fail their batch; the row fallback skips the repeats
+    entity_info.write_bytes(b"".join(lines + lines[:40]))
+
+    loader = DataLoader(data_dir=data_dir, db_service=sqlite_storage)
+    table = layout_config.get_file_config("ENTITY_INFO").tableName
+    result = loader.load_file("ENTITY_INFO", reconcile=True)
+    assert result["status"] == "SUCCESS"
+    assert result["records_loaded"] == sqlite_storage.get_table_count(table)
+    assert result["records_loaded"] <= len(lines)
+
+    # The export report lists exactly what the table holds
+    loaded = {
+        entity_cd: {"rows": rows, "taxable_val": taxable_val}
+        for entity_cd, rows, taxable_val in sqlite_storage.iter_query(
+            f"SELECT entity_cd, COUNT(*), SUM(COALESCE(taxable_val, 0)) "
+            f"FROM cad.{table} GROUP BY entity_cd"
+        )
+    }
+    report = tmp_path / "export_totals.json"
+    report.write_text(json.dumps(loaded))
+    assert read_export_totals(report) == loaded
+
+    result = loader.load_file("ENTITY_INFO", reconcile=True, export_totals=report)
+
+    discrepancies = result["reconciliation"]["discrepancies"]
+    assert not [d for d in discrepancies if d["source"] == report.name]
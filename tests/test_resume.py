@@ -0,0 +1,77 @@
+"""Checkpointed loads and --resume."""
+
+import pytest
+
+import app.services.loader as loader_module
+from app.services.loader import DataLoader
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def loader(export, sqlite_storage, monkeypatch):
+    # Batches of 10 rows, committed with a checkpoint every 10 batches
+    monkeypatch.setattr("app.services.storage.ADAPTIVE_BATCHING", False)
+    sqlite_storage.batch_size = 10
+    return DataLoader(data_dir=export["INFO"].parent, db_service=sqlite_storage)
+
+
+def interrupt_after(monkeypatch, records):
+    """Make the next file read fail after a number of records."""
+    read = loader_module.read_fixed_width_file
+
+    def failing_read(*args, **kwargs):
+        for i, record in enumerate(read(*args, **kwargs)):
+            if i == records:
+                monkeypatch.setattr(loader_module, "read_fixed_width_file", read)
+                raise Interrupted("connection lost")
+            yield record
+
+    monkeypatch.setattr(loader_module, "read_fixed_width_file", failing_read)
+
+
+def prop_ids(storage, table):
+    rows = storage.iter_query(f"SELECT prop_id FROM cad.{table} ORDER BY prop_id")
+    return [row[0] for row in rows]
+
+
+def test_resume_continues_from_the_last_checkpoint(loader, sqlite_storage, monkeypatch):
+    table = loader.layout_config.get_file_config("INFO").tableName
+    interrupt_after(monkeypatch, 250)
+
+    failed = loader.load_file("INFO")
+
+    assert failed["status"] == "FAILED"
+    assert sqlite_storage.get_table_count(table) == 200
+    assert sqlite_storage.get_checkpoint(table)["records_loaded"] == 200
+
+    resumed = loader.load_file("INFO", resume=True)
+
+    assert resumed["status"] == "SUCCESS"
+    assert resumed["resumed_from_line"] == 200
+    assert resumed["records_loaded"] == 300
+    assert prop_ids(sqlite_storage, table) == list(range(100000, 100300))
+    assert sqlite_storage.get_checkpoint(table) is None
+    assert loader.load_file("INFO", resume=True)["status"] == "SKIPPED"
+
+
+def test_checkpoint_of_a_changed_file_is_ignored(loader, sqlite_storage, monkeypatch, tmp_path):
+    table = loader.layout_config.get_file_config("INFO").tableName
+    interrupt_after(monkeypatch, 150)
+    loader.load_file("INFO")
+    assert sqlite_storage.get_checkpoint(table)["records_loaded"] == 100
+
+    data_dir = tmp_path / "changed"
+    data_dir.mkdir()
+    source = loader.data_dir / f"{loader.file_prefix}INFO.TXT"
+    lines = source.read_bytes().splitlines(keepends=True)
+    (data_dir / source.name).write_bytes(b"".join(lines[:-1]))
+    changed = DataLoader(data_dir=data_dir, db_service=sqlite_storage)
+
+    result = changed.load_file("INFO", resume=True)
+
+    assert result["status"] == "SUCCESS"
+    assert "resumed_from_line" not in result
+    assert prop_ids(sqlite_storage, table) == list(range(100000, 100299))
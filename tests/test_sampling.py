@@ -0,0 +1,81 @@
+"""Consistent prop_id sampling."""
+
+import pytest
+
+from app.services.file_reader import read_fixed_width_file
+from app.services.sampling import PropertySample, property_hash
+
+
+def prop_ids(path, file_config, encoding, line_filter=None, column="prop_id"):
+    return {
+        record[column]
+        for record in read_fixed_width_file(path, file_config, encoding, line_filter=line_filter)
+    }
+
+
+def test_property_hash_is_deterministic_and_seeded():
+    assert property_hash(123456) == property_hash(123456)
+    assert property_hash(123456, seed=1) != property_hash(123456)
+    assert property_hash(123456) != property_hash(123457)
+    assert all(0 <= property_hash(prop_id, 3) < 2 ** 64 for prop_id in range(1000))
+
+
+def test_sample_size_and_nesting():
+    ids = range(1, 20001)
+    small = {prop_id for prop_id in ids if prop_id in PropertySample(0.1, seed=5)}
+    large = {prop_id for prop_id in ids if prop_id in PropertySample(0.3, seed=5)}
+
+    assert small <= large
+    assert abs(len(small) - 2000) < 200
+    assert abs(len(large) - 6000) < 300
+    assert all(prop_id in PropertySample(1.0) for prop_id in ids)
+
+
+@pytest.mark.parametrize("fraction", [0, -0.5, 1.5])
+def test_rejects_fraction_out_of_range(fraction):
+    with pytest.raises(ValueError):
+        PropertySample(fraction)
+
+
+def test_line_filter_keeps_children_of_sampled_properties(export, layout_config):
+    sample = PropertySample(0.25, seed=9)
+    encoding = layout_config.encoding
+    info = layout_config.get_file_config("INFO")
+    land = layout_config.get_file_config("LAND_DETAIL")
+
+    info_ids = prop_ids(export["INFO"], info, encoding, sample.line_filter(info))
+    land_ids = prop_ids(export["LAND_DETAIL"], land, encoding, sample.line_filter(land))
+
+    everyone = prop_ids(export["INFO"], info, encoding)
+    assert info_ids == {prop_id for prop_id in everyone if prop_id in sample}
+    assert 0 < len(info_ids) < 300
+    assert land_ids == info_ids
+
+
+def test_reference_tables_are_not_sampled(layout_config):
+    sample = PropertySample(0.25)
+
+    assert sample.line_filter(layout_config.get_file_config("STATE_CODE")) is None
+    assert sample.key_columns(layout_config.get_file_config("UDI")) == ["prop_id", "parent_prop_id"]
+
+
+def test_stratified_sample_covers_every_stratum(export, layout_config):
+    info = layout_config.get_file_config("INFO")
+    records = list(read_fixed_width_file(export["INFO"], info, layout_config.encoding))
+    strata = {(record["prop_type_cd"] or "").upper() for record in records}
+
+    sample = PropertySample.stratified(
+        export["INFO"], layout_config, "prop_type_cd", fraction=0.01, seed=2
+    )
+
+    kept = {
+        (record["prop_type_cd"] or "").upper() for record in records if record["prop_id"] in sample
+    }
+    assert kept == strata
+    assert len(sample.selected) < len(records)
+    assert sample.stratify == "prop_type_cd"
+
+
+def test_stratified_sample_rejects_unknown_column(export, layout_config):
+    with pytest.raises(ValueError):
+        PropertySample.stratified(export["INFO"], layout_config, "no_such_column", 0.1)